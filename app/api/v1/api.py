@@ -2,7 +2,7 @@
 API router aggregation
 """
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, initiatives, search, recommendations, engagement
+from app.api.v1.endpoints import auth, users, initiatives, search, recommendations, engagement, admin, analytics
 
 api_router = APIRouter()
 
@@ -12,3 +12,5 @@ api_router.include_router(initiatives.router, prefix="/initiatives", tags=["Init
 api_router.include_router(search.router, prefix="/search", tags=["Search"])
 api_router.include_router(recommendations.router, prefix="/recommendations", tags=["Recommendations"])
 api_router.include_router(engagement.router, prefix="/engagement", tags=["Engagement"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
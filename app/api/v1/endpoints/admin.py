@@ -0,0 +1,210 @@
+"""
+Administrative and operational endpoints
+"""
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+import io
+from app.core.admission import controller as admission
+from app.core.cache import cache, cached
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
+from app.core.dependencies import get_current_admin
+from app.core.jobs import queue_stats
+from app.models.job import Job, JobStatus
+from app.models.user import User
+from app.schemas.initiative import DuplicateClusterList, ImportReport
+from app.schemas.job import JobResponse
+from app.services import catalog_io, dedup, recommendations
+
+router = APIRouter()
+
+@router.get("/cache/stats", summary="Application cache statistics")
+async def get_cache_stats(
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Per-namespace hit/miss/stale counters for this worker plus backend details.
+    
+    Requires admin role.
+    """
+    return cache.stats()
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT, summary="Clear application cache")
+async def clear_cache(
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Drop every cached entry.
+    
+    Requires admin role.
+    """
+    cache.clear()
+    return None
+
+@router.get("/admission/stats", summary="Admission control statistics")
+async def get_admission_stats(
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Current concurrency limit, in-flight and queued requests, and
+    admitted/shed counters per route class for this worker.
+    
+    Requires admin role.
+    """
+    return admission.stats()
+
+@router.get("/recommendations/stats", summary="Recommendation fallback statistics")
+async def get_recommendation_stats(
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Requests served by personalized scoring vs. the popularity fallback
+    after a missed deadline, and the fallback rate, for this worker.
+    
+    Requires admin role.
+    """
+    return recommendations.stats()
+
+@router.get("/jobs/stats", summary="Background job queue metrics")
+async def get_job_stats(
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue depth by job type and status, number of due jobs, age of the
+    oldest pending job, and wait/run latency percentiles for this worker.
+    
+    Requires admin role.
+    """
+    return queue_stats(db)
+
+@router.get("/jobs", response_model=List[JobResponse], summary="List background jobs")
+async def list_jobs(
+    job_status: Optional[JobStatus] = Query(None, alias="status"),
+    job_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Most recent jobs, optionally filtered by status, type and entity.
+    
+    Requires admin role.
+    """
+    query = db.query(Job)
+    if job_status:
+        query = query.filter(Job.status == job_status)
+    if job_type:
+        query = query.filter(Job.job_type == job_type)
+    if entity_id is not None:
+        query = query.filter(Job.entity_id == entity_id)
+    jobs = query.order_by(Job.id.desc()).limit(limit).all()
+    return [JobResponse.model_validate(j) for j in jobs]
+
+@router.get("/jobs/{job_id}", response_model=JobResponse, summary="Get background job status")
+async def get_job(
+    job_id: int,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Status, attempts and last error of a single job.
+    
+    Requires admin role.
+    """
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return JobResponse.model_validate(job)
+
+@cached("duplicates", tags=["initiatives"])
+def _duplicate_clusters(db: Session, threshold: float, limit: int) -> dict:
+    return dedup.duplicate_clusters(db, threshold, limit)
+
+@router.get("/duplicates", response_model=DuplicateClusterList, summary="Near-duplicate initiative clusters")
+async def list_duplicate_clusters(
+    min_similarity: Optional[float] = Query(None, ge=0.1, le=1.0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Groups of initiatives whose titles and descriptions are near-identical,
+    largest first, across the whole catalog.
+    
+    `min_similarity` defaults to `DEDUP_THRESHOLD`. Only pairs that share an
+    LSH band are considered, so thresholds well below the band threshold
+    (about 0.7 with the default 16 bands) will miss pairs.
+    
+    Requires admin role.
+    """
+    threshold = min_similarity if min_similarity is not None else settings.DEDUP_THRESHOLD
+    return _duplicate_clusters(db, threshold, limit)
+
+@router.post("/initiatives/import", response_model=ImportReport, summary="Bulk import initiatives")
+def import_initiatives(
+    file: UploadFile = File(..., description="JSONL or CSV file"),
+    format: Optional[Literal["jsonl", "csv"]] = Query(None, description="Defaults to the file extension"),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Create initiatives from an uploaded JSONL or CSV file.
+    
+    Rows use the fields of `POST /initiatives/` plus optional `status` and
+    `owner_email` or `owner_id` (defaults to the caller); CSV list cells hold
+    a JSON array or `;`-separated values. The upload is read as a stream and
+    inserted in transactions of `IMPORT_BATCH_SIZE` rows; invalid rows are
+    skipped and reported by line number.
+    
+    Requires admin role.
+    """
+    fmt = format or catalog_io.detect_format(file.filename)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot tell the format from the file name; pass format=jsonl or format=csv"
+        )
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return catalog_io.import_initiatives(db, catalog_io.read_records(stream, fmt), current_user.id)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8 encoded"
+        )
+    finally:
+        stream.detach()
+
+@router.get("/initiatives/export", summary="Bulk export initiatives")
+async def export_initiatives(
+    format: Literal["jsonl", "csv"] = "jsonl",
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Stream every initiative as JSONL or CSV, in id order.
+    
+    Rows are read through a server-side cursor, so memory use does not grow
+    with the catalog. The output can be imported again as is.
+    
+    Requires admin role.
+    """
+    def rows():
+        # The request's session is closed before the body is streamed
+        db = SessionLocal()
+        try:
+            yield from catalog_io.export_initiatives(db, format)
+        finally:
+            db.close()
+    
+    media_type = "application/x-ndjson" if format == "jsonl" else "text/csv"
+    return StreamingResponse(
+        rows(), media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="initiatives.{format}"'}
+    )
@@ -0,0 +1,107 @@
+"""
+Engagement analytics endpoints (served from the rollup tables)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+from datetime import datetime, timedelta, timezone
+from app.core.database import get_db
+from app.core.dependencies import get_current_leader
+from app.models.initiative import Initiative
+from app.models.user import User
+from app.schemas.analytics import InitiativeEngagementSeries, OwnerEngagementSummary
+from app.services import analytics
+
+router = APIRouter()
+
+# Widest range a single series request may cover, per granularity
+MAX_RANGE = {"hour": timedelta(days=14), "day": timedelta(days=730)}
+
+def _is_admin(user: User) -> bool:
+    return user.role.value == "admin"
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC; convert offset-aware query values to match"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+@router.get("/initiatives/{initiative_id}", response_model=InitiativeEngagementSeries,
+            summary="Engagement time series of an initiative")
+async def get_initiative_series(
+    initiative_id: int,
+    granularity: Literal["hour", "day"] = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    current_user: User = Depends(get_current_leader),
+    db: Session = Depends(get_db)
+):
+    """
+    Views, saves and applications per hour or day between ``start``
+    (inclusive) and ``end`` (exclusive), UTC. Defaults to the last 48 hours
+    or 30 days. Buckets without activity are omitted.
+    
+    Requires being the initiative's owner or an admin.
+    """
+    initiative = db.query(Initiative).filter(Initiative.id == initiative_id).first()
+    if not initiative:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Initiative not found"
+        )
+    if initiative.owner_id != current_user.id and not _is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view analytics for this initiative"
+        )
+    
+    end = _naive_utc(end) or datetime.utcnow()
+    start = _naive_utc(start) or end - (timedelta(hours=48) if granularity == "hour" else timedelta(days=30))
+    if start >= end or end - start > MAX_RANGE[granularity]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"start must precede end by at most {MAX_RANGE[granularity].days} days for granularity '{granularity}'"
+        )
+    
+    buckets = analytics.series(db, initiative_id, granularity, start, end)
+    return {
+        "initiative_id": initiative_id,
+        "granularity": granularity,
+        "start": start,
+        "end": end,
+        "rolled_up_until": analytics.rolled_up_until(db),
+        "buckets": buckets,
+        "totals": analytics.totals(buckets),
+    }
+
+@router.get("/owners/{owner_id}", response_model=OwnerEngagementSummary,
+            summary="Engagement totals across an owner's initiatives")
+async def get_owner_summary(
+    owner_id: int,
+    days: int = Query(30, ge=1, le=730),
+    current_user: User = Depends(get_current_leader),
+    db: Session = Depends(get_db)
+):
+    """
+    Views, saves and applications over the last ``days`` UTC days (today
+    included) for every initiative owned by ``owner_id``, plus the sum.
+    
+    Leaders may only request their own summary; admins any.
+    """
+    if owner_id != current_user.id and not _is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view analytics for this owner"
+        )
+    
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    since = today - timedelta(days=days - 1)
+    items = analytics.owner_totals(db, owner_id, since)
+    return {
+        "owner_id": owner_id,
+        "days": days,
+        "since": since,
+        "rolled_up_until": analytics.rolled_up_until(db),
+        "initiatives": items,
+        "totals": analytics.totals(items),
+    }
@@ -1,19 +1,35 @@
 """
 User engagement endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import case, delete, select, update
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from typing import List, Literal, Optional
+from datetime import datetime
+from app.core.cache import invalidate_after_commit
+from app.core.database import get_db, upsert_insert
+from app.core.dependencies import get_current_user, get_current_leader
+from app.core.fields import parse_fields, load_columns, project, projected_response
+from app.core.http_cache import make_etag, is_not_modified, not_modified, apply_cache_headers, PRIVATE_CACHE_CONTROL
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset, fetch_page
 from app.models.user import User
 from app.models.initiative import Initiative
 from app.models.engagement import SavedInitiative, InitiativeApplication, InitiativeView
-from app.schemas.engagement import SaveInitiativeRequest, ApplicationRequest, ApplicationResponse
+from app.schemas.engagement import (
+    SaveInitiativeRequest, BulkSaveRequest, BulkSaveResult, BulkUnsaveResult,
+    ApplicationRequest, ApplicationResponse,
+    ApplicationReviewRequest, ApplicationReviewResult
+)
 from app.schemas.initiative import InitiativeResponse
+from app.services import applications, dashboard
+from app.services.trending import tracker
 
 router = APIRouter()
 
+def _invalidate(db: Session, initiative_ids) -> None:
+    """Drop cached listings and bodies of initiatives whose counters change in this transaction"""
+    invalidate_after_commit(db, "initiatives", *(f"initiative:{i}" for i in initiative_ids))
+
 @router.post("/save", status_code=status.HTTP_201_CREATED, summary="Save/bookmark initiative")
 async def save_initiative(
     request: SaveInitiativeRequest,
@@ -55,10 +71,106 @@ async def save_initiative(
     initiative.save_count += 1
     
     db.add(saved)
+    dashboard.record(db, request.initiative_id, "save", saves=1)
+    _invalidate(db, [request.initiative_id])
     db.commit()
+    tracker.record(request.initiative_id, "save")
     
     return {"message": "Initiative saved successfully"}
 
+@router.post("/save/bulk", response_model=BulkSaveResult, summary="Save several initiatives")
+async def bulk_save_initiatives(
+    request: BulkSaveRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Save up to 500 initiatives in one call.
+    
+    Ids are validated with one query, saved with one multi-row insert that
+    skips initiatives already saved, and counters are updated set-wise.
+    """
+    ids = list(dict.fromkeys(request.initiative_ids))
+    existing = set(db.execute(select(Initiative.id).where(Initiative.id.in_(ids))).scalars().all())
+    wanted = [i for i in ids if i in existing]
+    
+    saved = set()
+    if wanted:
+        now = datetime.utcnow()
+        rows = [{"user_id": current_user.id, "initiative_id": i, "saved_at": now} for i in wanted]
+        insert = upsert_insert(db)
+        if insert is None:
+            already = set(db.execute(
+                select(SavedInitiative.initiative_id)
+                .where(SavedInitiative.user_id == current_user.id, SavedInitiative.initiative_id.in_(wanted))
+            ).scalars().all())
+            rows = [row for row in rows if row["initiative_id"] not in already]
+            if rows:
+                db.execute(SavedInitiative.__table__.insert().values(rows))
+            saved = {row["initiative_id"] for row in rows}
+        else:
+            saved = set(db.execute(
+                insert(SavedInitiative).values(rows)
+                .on_conflict_do_nothing(index_elements=[SavedInitiative.user_id, SavedInitiative.initiative_id])
+                .returning(SavedInitiative.initiative_id)
+            ).scalars().all())
+    
+    if saved:
+        db.execute(
+            update(Initiative).where(Initiative.id.in_(saved))
+            .values(save_count=Initiative.save_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        dashboard.record_many(db, saved, "save", saves=1)
+        _invalidate(db, saved)
+    db.commit()
+    for initiative_id in saved:
+        tracker.record(initiative_id, "save")
+    
+    return {
+        "saved": [i for i in wanted if i in saved],
+        "already_saved": [i for i in wanted if i not in saved],
+        "not_found": [i for i in ids if i not in existing],
+    }
+
+@router.delete("/save/bulk", response_model=BulkUnsaveResult, summary="Remove several saved initiatives")
+async def bulk_unsave_initiatives(
+    request: BulkSaveRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Remove up to 500 initiatives from the saved list in one call
+    (ids in the JSON request body, like saving in bulk).
+    """
+    ids = list(dict.fromkeys(request.initiative_ids))
+    matching = (SavedInitiative.user_id == current_user.id, SavedInitiative.initiative_id.in_(ids))
+    if db.get_bind().dialect.delete_returning:
+        removed = set(db.execute(
+            delete(SavedInitiative).where(*matching)
+            .returning(SavedInitiative.initiative_id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all())
+    else:
+        removed = set(db.execute(select(SavedInitiative.initiative_id).where(*matching)).scalars().all())
+        if removed:
+            db.execute(delete(SavedInitiative).where(*matching).execution_options(synchronize_session=False))
+    
+    if removed:
+        db.execute(
+            update(Initiative).where(Initiative.id.in_(removed))
+            .values(save_count=case((Initiative.save_count > 0, Initiative.save_count - 1), else_=0))
+            .execution_options(synchronize_session=False)
+        )
+        dashboard.record_many(db, removed, saves=-1)
+        _invalidate(db, removed)
+    db.commit()
+    
+    return {
+        "removed": [i for i in ids if i in removed],
+        "not_saved": [i for i in ids if i not in removed],
+    }
+
 @router.delete("/save/{initiative_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Remove saved initiative")
 async def unsave_initiative(
     initiative_id: int,
@@ -85,25 +197,61 @@ async def unsave_initiative(
         initiative.save_count = max(0, initiative.save_count - 1)
     
     db.delete(saved)
+    dashboard.record(db, initiative_id, saves=-1)
+    _invalidate(db, [initiative_id])
     db.commit()
     
     return None
 
 @router.get("/saved", response_model=List[InitiativeResponse], summary="Get saved initiatives")
 async def get_saved_initiatives(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all initiatives saved/bookmarked by the current user.
+    Get the initiatives saved/bookmarked by the current user, most
+    recently saved first.
+    
+    Paginated with `cursor` and `limit`: the next page's cursor is returned
+    in the `X-Next-Cursor` header (absent on the last page). `fields`
+    restricts the columns loaded and returned.
+    
+    Supports conditional GET; the validator covers the page's saves, the
+    version and updated_at of their initiatives and the next-page cursor.
     """
-    saved_records = db.query(SavedInitiative).filter(
+    selected = parse_fields(fields, InitiativeResponse)
+    
+    # One join, newest save first
+    query = db.query(
+        Initiative, SavedInitiative.saved_at, SavedInitiative.id, Initiative.version, Initiative.updated_at
+    ).join(
+        SavedInitiative, SavedInitiative.initiative_id == Initiative.id
+    ).filter(
         SavedInitiative.user_id == current_user.id
-    ).all()
+    )
+    if selected:
+        query = query.options(load_columns(Initiative, selected))
+    query = keyset(query, SavedInitiative.saved_at, SavedInitiative.id, cursor)
+    rows = fetch_page(query, limit, lambda row: (row.saved_at, row.id), response)
+    initiatives = [row.Initiative for row in rows]
     
-    initiative_ids = [s.initiative_id for s in saved_records]
-    initiatives = db.query(Initiative).filter(Initiative.id.in_(initiative_ids)).all()
+    # Validate the page itself rather than aggregating over every save
+    last_modified = max((d for row in rows for d in (row.saved_at, row.updated_at) if d is not None), default=None)
+    etag = make_etag(
+        "saved", current_user.id, [(row.id, row.version, row.updated_at) for row in rows],
+        response.headers.get(NEXT_CURSOR_HEADER), cursor, limit, selected
+    )
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified, PRIVATE_CACHE_CONTROL, vary="Authorization")
     
+    apply_cache_headers(response, etag, last_modified, PRIVATE_CACHE_CONTROL, vary="Authorization")
+    if selected:
+        return projected_response(project(InitiativeResponse, selected, initiatives), response)
     return [InitiativeResponse.model_validate(i) for i in initiatives]
 
 @router.post("/apply", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED, summary="Apply to initiative")
@@ -148,36 +296,62 @@ async def apply_to_initiative(
     initiative.application_count += 1
     
     db.add(application)
+    dashboard.record(db, request.initiative_id, "application", pending_applications=1)
+    _invalidate(db, [request.initiative_id])
     db.commit()
     db.refresh(application)
+    tracker.record(request.initiative_id, "apply")
     
     return ApplicationResponse.model_validate(application)
 
 @router.get("/applications", response_model=List[ApplicationResponse], summary="Get my applications")
 async def get_my_applications(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,initiative_id,status"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all applications submitted by the current user.
+    Get the applications submitted by the current user, newest first.
+    
+    Paginated with `cursor` and `limit` (next cursor in `X-Next-Cursor`).
     """
-    applications = db.query(InitiativeApplication).filter(
+    selected = parse_fields(fields, ApplicationResponse)
+    query = db.query(InitiativeApplication).filter(
         InitiativeApplication.user_id == current_user.id
-    ).all()
+    )
+    if selected:
+        query = query.options(load_columns(InitiativeApplication, selected + ("applied_at",)))
+    query = keyset(query, InitiativeApplication.applied_at, InitiativeApplication.id, cursor)
+    applications_page = fetch_page(query, limit, lambda a: (a.applied_at, a.id), response)
     
-    return [ApplicationResponse.model_validate(a) for a in applications]
+    if selected:
+        return projected_response(project(ApplicationResponse, selected, applications_page), response)
+    return [ApplicationResponse.model_validate(a) for a in applications_page]
 
 @router.get("/initiative/{initiative_id}/applications", response_model=List[ApplicationResponse], summary="Get initiative applications")
 async def get_initiative_applications(
     initiative_id: int,
+    response: Response,
+    application_status: Optional[Literal["pending", "accepted", "rejected"]] = Query(None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,user_id,status"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all applications for a specific initiative.
+    Get applications for a specific initiative, oldest first.
+    
+    Optional filter by `status`; paginated with `cursor` and `limit` (next
+    cursor in `X-Next-Cursor`). Per-status totals are on the leader
+    dashboard.
     
     Only accessible by the initiative owner or admin.
     """
+    selected = parse_fields(fields, ApplicationResponse)
     # Check if initiative exists and user owns it
     initiative = db.query(Initiative).filter(Initiative.id == initiative_id).first()
     if not initiative:
@@ -192,8 +366,52 @@ async def get_initiative_applications(
             detail="Not authorized to view applications for this initiative"
         )
     
-    applications = db.query(InitiativeApplication).filter(
-        InitiativeApplication.initiative_id == initiative_id
-    ).all()
+    query = db.query(InitiativeApplication).filter(InitiativeApplication.initiative_id == initiative_id)
+    if application_status:
+        query = query.filter(InitiativeApplication.status == application_status)
+    if selected:
+        query = query.options(load_columns(InitiativeApplication, selected + ("applied_at",)))
+    query = keyset(query, InitiativeApplication.applied_at, InitiativeApplication.id, cursor, descending=False)
+    applications_page = fetch_page(query, limit, lambda a: (a.applied_at, a.id), response)
+    
+    if selected:
+        return projected_response(project(ApplicationResponse, selected, applications_page), response)
+    return [ApplicationResponse.model_validate(a) for a in applications_page]
+
+def _review(db: Session, current_user: User, application_ids: List[int], new_status: str) -> dict:
+    owner_id = None if current_user.role.value == "admin" else current_user.id
+    result = applications.review(db, application_ids, new_status, owner_id)
+    changed = result.pop("affected_initiatives")
+    if changed:
+        _invalidate(db, changed)
+    db.commit()
+    return result
+
+@router.post("/applications/accept", response_model=ApplicationReviewResult, summary="Accept applications in bulk")
+async def accept_applications(
+    request: ApplicationReviewRequest,
+    current_user: User = Depends(get_current_leader),
+    db: Session = Depends(get_db)
+):
+    """
+    Accept up to 1000 applications in one call.
+    
+    Only applications to initiatives owned by the caller (any, for admins)
+    are changed; other ids are reported in `not_found`. Initiatives whose
+    accepted applications reach their `capacity` are marked full.
+    """
+    return _review(db, current_user, request.application_ids, "accepted")
+
+@router.post("/applications/reject", response_model=ApplicationReviewResult, summary="Reject applications in bulk")
+async def reject_applications(
+    request: ApplicationReviewRequest,
+    current_user: User = Depends(get_current_leader),
+    db: Session = Depends(get_db)
+):
+    """
+    Reject up to 1000 applications in one call.
     
-    return [ApplicationResponse.model_validate(a) for a in applications]
+    Same ownership rules as accepting. Rejecting accepted applications
+    reopens initiatives that were full and drop below their `capacity`.
+    """
+    return _review(db, current_user, request.application_ids, "rejected")
@@ -1,18 +1,96 @@
 """
 Initiative management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from datetime import datetime
+from app.core.cache import cache, cached
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
+from app.core.jobs import enqueue
 from app.core.dependencies import get_current_user, get_current_leader
+from app.core.fields import parse_fields, load_columns, project, projected_response
+from app.core.pagination import keyset, fetch_page
+from app.core.warmup import register_warmer
+from app.core.http_cache import (
+    make_etag, is_not_modified, not_modified, apply_cache_headers,
+    public_cache_control, PRIVATE_CACHE_CONTROL
+)
 from app.models.user import User
 from app.models.initiative import Initiative, InitiativeStatus
-from app.schemas.initiative import InitiativeCreate, InitiativeUpdate, InitiativeResponse, InitiativeList
+from app.models.similarity import InitiativeNeighbor
+from app.models.trending import TrendingScore
+from app.models.engagement import InitiativeView
+from app.schemas.initiative import (
+    InitiativeCreate, InitiativeUpdate, InitiativeResponse, InitiativeList, InitiativeCreateResponse,
+    DuplicateCandidate, SimilarInitiative, TrendingInitiative, InitiativeBatch, LeaderDashboard
+)
+from app.services import applications, dashboard, dedup, trending, vector_index
 
 router = APIRouter()
 
-@router.post("/", response_model=InitiativeResponse, status_code=status.HTTP_201_CREATED, summary="Create initiative")
+def _filter_initiatives(query, status: Optional[InitiativeStatus], practice_area: Optional[str]):
+    """Apply the list filters shared by the count and page queries"""
+    if status:
+        query = query.filter(Initiative.status == status)
+    if practice_area:
+        query = query.filter(Initiative.practice_area == practice_area)
+    return query
+
+@cached("initiative_lists", tags=["initiatives"])
+def _list_validators(db: Session, status: Optional[InitiativeStatus], practice_area: Optional[str]) -> dict:
+    """Matching row count and max(updated_at) for a filter combination"""
+    total, last_modified = _filter_initiatives(
+        db.query(func.count(Initiative.id), func.max(Initiative.updated_at)), status, practice_area
+    ).one()
+    return {"total": total, "last_modified": last_modified.isoformat() if last_modified else None}
+
+def _list_etag(validators: dict, skip: int, limit: int,
+               status: Optional[InitiativeStatus], practice_area: Optional[str],
+               fields: Optional[tuple] = None):
+    """ETag and Last-Modified for one page of a filtered listing"""
+    last_modified = datetime.fromisoformat(validators["last_modified"]) if validators["last_modified"] else None
+    etag = make_etag("initiatives", validators["total"], last_modified, skip, limit, status, practice_area, fields)
+    return etag, last_modified
+
+@cached("initiative_lists", tags=["initiatives"])
+def _initiative_page(db: Session, etag: str, total: int, skip: int, limit: int,
+                     status: Optional[InitiativeStatus], practice_area: Optional[str],
+                     fields: Optional[tuple] = None) -> dict:
+    """Serialized page of initiatives for a given list validator"""
+    query = _filter_initiatives(db.query(Initiative), status, practice_area)
+    if fields:
+        query = query.options(load_columns(Initiative, fields))
+    initiatives = query.offset(skip).limit(limit).all()
+    if fields:
+        items = project(InitiativeResponse, fields, initiatives)
+    else:
+        items = [InitiativeResponse.model_validate(i).model_dump(mode="json") for i in initiatives]
+    return {"total": total, "items": items, "page": skip // limit + 1, "page_size": limit}
+
+@register_warmer
+def _warm_initiative_lists():
+    """Prime the default listing page and per-status validators"""
+    db = SessionLocal()
+    try:
+        for list_status in [None, *InitiativeStatus]:
+            validators = _list_validators(db, list_status, None)
+            if list_status in (None, InitiativeStatus.OPEN):
+                etag, _ = _list_etag(validators, 0, 20, list_status, None)
+                _initiative_page(db, etag, validators["total"], 0, 20, list_status, None)
+    finally:
+        db.close()
+
+@cached("initiatives", tags=lambda initiative_id, **_: [f"initiative:{initiative_id}"])
+def _initiative_body(db: Session, initiative_id: int, version: int, updated_at: datetime) -> dict:
+    """Serialized initiative at a given version"""
+    initiative = db.query(Initiative).filter(Initiative.id == initiative_id).first()
+    return InitiativeResponse.model_validate(initiative).model_dump(mode="json")
+
+@router.post("/", response_model=InitiativeCreateResponse, status_code=status.HTTP_201_CREATED, summary="Create initiative")
 async def create_initiative(
     initiative_data: InitiativeCreate,
     current_user: User = Depends(get_current_leader),
@@ -23,9 +101,13 @@ async def create_initiative(
     
     Requires leader role.
     
-    The initiative will automatically:
-    - Generate AI tags based on description (future enhancement)
-    - Create vector embeddings for semantic search (future enhancement)
+    The initiative will automatically (background jobs):
+    - Receive generated tags from its title and description, added to any
+      tags supplied here
+    - Get a vector embedding for semantic search
+    
+    The response lists existing initiatives that look like near-duplicates
+    (MinHash LSH over title and description) in `possible_duplicates`.
     """
     import json
     
@@ -42,21 +124,37 @@ async def create_initiative(
         owner_id=current_user.id
     )
     
-    # TODO: Generate AI tags from description
-    # TODO: Create vector embeddings for semantic search
+    signature, duplicates = dedup.find_duplicates(db, initiative.title, initiative.description)
     
     db.add(initiative)
+    db.flush()
+    
+    dedup.store_signature(db, initiative.id, signature, initiative.title, initiative.description)
+    dashboard.sync_initiative(db, initiative)
+    # Tags and embedding are computed in the background, committed with the initiative
+    enqueue(db, "tag_initiative", initiative.id)
+    enqueue(db, "embed_initiative", initiative.id)
+    
     db.commit()
     db.refresh(initiative)
     
-    return InitiativeResponse.model_validate(initiative)
+    if signature is not None:
+        dedup.lsh.add(initiative.id, signature)
+    cache.invalidate_tags("initiatives")
+    
+    response = InitiativeCreateResponse.model_validate(initiative)
+    response.possible_duplicates = [DuplicateCandidate(**d) for d in dedup.describe(db, duplicates)]
+    return response
 
 @router.get("/", response_model=InitiativeList, summary="List initiatives")
 async def list_initiatives(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     status: Optional[InitiativeStatus] = None,
     practice_area: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
     db: Session = Depends(get_db)
 ):
     """
@@ -66,32 +164,103 @@ async def list_initiatives(
     - Status (open, active, full, closed)
     - Practice area
     
-    Pagination via skip and limit parameters.
+    Pagination via skip and limit parameters. `fields` returns only the
+    listed item fields (and only loads those columns).
+    
+    Responses carry an ETag derived from the matching row count and
+    max(updated_at); a matching If-None-Match returns 304 without loading rows.
+    Both the validator aggregate and the serialized page are cached and
+    invalidated by initiative writes; concurrent identical requests that miss
+    the cache share one query.
     """
-    query = db.query(Initiative)
+    # Total count and last modification in one aggregate (also the validator)
+    selected = parse_fields(fields, InitiativeResponse)
+    # Off the event loop, so identical concurrent requests can share one query
+    validators = await run_in_threadpool(_list_validators, db, status, practice_area)
+    etag, last_modified = _list_etag(validators, skip, limit, status, practice_area, selected)
+    cache_control = public_cache_control()
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified, cache_control)
     
-    # Apply filters
-    if status:
-        query = query.filter(Initiative.status == status)
-    if practice_area:
-        query = query.filter(Initiative.practice_area == practice_area)
+    apply_cache_headers(response, etag, last_modified, cache_control)
+    page = await run_in_threadpool(
+        _initiative_page, db, etag, validators["total"], skip, limit, status, practice_area, selected
+    )
+    if selected:
+        return projected_response(page, response)
+    return page
+
+@cached("trending", ttl=settings.TRENDING_FLUSH_INTERVAL, tags=["initiatives"])
+def _trending_initiatives(db: Session, limit: int, status: Optional[InitiativeStatus],
+                          practice_area: Optional[str]) -> list:
+    """Best persisted scores joined with their (filtered) initiatives"""
+    rows = _filter_initiatives(
+        db.query(Initiative, TrendingScore.score).join(TrendingScore, TrendingScore.initiative_id == Initiative.id),
+        status, practice_area
+    ).order_by(TrendingScore.score.desc()).limit(limit).all()
+    factor = trending.current_factor(db)
+    return [
+        TrendingInitiative(initiative=InitiativeResponse.model_validate(i), score=round(score * factor, 4)).model_dump(mode="json")
+        for i, score in rows
+    ]
+
+@router.get("/trending", response_model=List[TrendingInitiative], summary="Get trending initiatives")
+async def get_trending_initiatives(
+    limit: int = Query(10, ge=1, le=100),
+    status: Optional[InitiativeStatus] = None,
+    practice_area: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Initiatives with the most recent engagement.
     
-    # Get total count
-    total = query.count()
+    Views, saves and applications add to an exponentially decaying score
+    (half-life `TRENDING_HALF_LIFE_HOURS`). Scores are buffered per worker
+    and persisted every few seconds, so new activity shows up with a short
+    delay. Optional filters by status and practice area.
+    """
+    return _trending_initiatives(db, limit, status, practice_area)
+
+@router.get("/batch", response_model=InitiativeBatch, summary="Get several initiatives by ID")
+async def get_initiatives_batch(
+    ids: str = Query(..., description="Comma-separated initiative IDs (at most 100)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Fetch many initiatives in one query.
     
-    # Apply pagination
-    initiatives = query.offset(skip).limit(limit).all()
+    `items` follows the order of `ids` (duplicates included) with `null`
+    where an initiative does not exist; those ids are also listed in
+    `not_found`. Unlike the single-item endpoint, no views are recorded.
+    """
+    try:
+        requested = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+    if not requested or len(requested) > 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Between 1 and 100 ids are required"
+        )
     
-    return InitiativeList(
-        total=total,
-        items=[InitiativeResponse.model_validate(i) for i in initiatives],
-        page=skip // limit + 1,
-        page_size=limit
-    )
+    found = {
+        initiative.id: InitiativeResponse.model_validate(initiative)
+        for initiative in db.query(Initiative).filter(Initiative.id.in_(set(requested))).all()
+    }
+    return {
+        "items": [found.get(i) for i in requested],
+        "not_found": [i for i in dict.fromkeys(requested) if i not in found],
+    }
 
 @router.get("/{initiative_id}", response_model=InitiativeResponse, summary="Get initiative by ID")
 async def get_initiative(
     initiative_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user)
 ):
@@ -99,21 +268,78 @@ async def get_initiative(
     Get a specific initiative by ID.
     
     Increments view count if user is authenticated.
+    
+    The ETag is built from the row version and updated_at. View counting does
+    not touch either, so a matching If-None-Match returns 304 (the weak
+    validator tolerates a slightly stale view_count).
     """
-    initiative = db.query(Initiative).filter(Initiative.id == initiative_id).first()
+    validators = db.query(Initiative.version, Initiative.updated_at).filter(
+        Initiative.id == initiative_id
+    ).first()
     
-    if not initiative:
+    if not validators:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Initiative not found"
         )
     
-    # Increment view count
-    initiative.view_count += 1
+    # Increment view count atomically, keeping updated_at (and the ETag) stable
+    db.execute(
+        update(Initiative)
+        .where(Initiative.id == initiative_id)
+        .values(view_count=Initiative.view_count + 1, updated_at=Initiative.updated_at)
+    )
+    if current_user:
+        db.add(InitiativeView(user_id=current_user.id, initiative_id=initiative_id))
+    dashboard.record(db, initiative_id, "view", views=1)
     db.commit()
-    db.refresh(initiative)
+    trending.tracker.record(initiative_id, "view")
     
-    return InitiativeResponse.model_validate(initiative)
+    etag = make_etag("initiative", initiative_id, validators.version, validators.updated_at)
+    if is_not_modified(request, etag, validators.updated_at):
+        return not_modified(etag, validators.updated_at, PRIVATE_CACHE_CONTROL)
+    
+    apply_cache_headers(response, etag, validators.updated_at, PRIVATE_CACHE_CONTROL)
+    return _initiative_body(db, initiative_id, validators.version, validators.updated_at)
+
+@cached("similar", tags=["initiatives", "similar"])
+def _similar_initiatives(db: Session, initiative_id: int, limit: int) -> list:
+    """Precomputed neighbors joined with their initiatives in one indexed lookup"""
+    rows = (
+        db.query(Initiative, InitiativeNeighbor.score)
+        .join(InitiativeNeighbor, InitiativeNeighbor.neighbor_id == Initiative.id)
+        .filter(InitiativeNeighbor.initiative_id == initiative_id)
+        .order_by(InitiativeNeighbor.rank)
+        .limit(limit)
+        .all()
+    )
+    return [
+        SimilarInitiative(initiative=InitiativeResponse.model_validate(i), score=round(score, 4)).model_dump(mode="json")
+        for i, score in rows
+    ]
+
+@router.get("/{initiative_id}/similar", response_model=List[SimilarInitiative], summary="Get similar initiatives")
+async def get_similar_initiatives(
+    initiative_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user)
+):
+    """
+    Initiatives most similar to this one ("more like this").
+    
+    Similarity blends description embeddings with skill, tag and industry
+    overlap. Neighbor lists are precomputed (see `app.services.similar`) and
+    refreshed in the background shortly after an initiative changes, so a
+    brand-new initiative may briefly return an empty list.
+    """
+    similar = _similar_initiatives(db, initiative_id, min(limit, settings.SIMILAR_TOP_K))
+    if not similar and not db.query(Initiative.id).filter(Initiative.id == initiative_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Initiative not found"
+        )
+    return similar
 
 @router.put("/{initiative_id}", response_model=InitiativeResponse, summary="Update initiative")
 async def update_initiative(
@@ -154,11 +380,31 @@ async def update_initiative(
         else:
             setattr(initiative, field, value)
     
-    # TODO: Regenerate embeddings if description changed
+    initiative.version = (initiative.version or 0) + 1
+    dashboard.sync_initiative(db, initiative)
+    if "capacity" in update_data or "status" in update_data:
+        db.flush()
+        applications.apply_capacity(db, [initiative_id])
+    
+    # Re-tag and re-embed in the background; rapid successive edits coalesce into one job
+    text_changed = "title" in update_data or "description" in update_data
+    signature = None
+    if text_changed:
+        signature = dedup.signature(dedup.shingles(initiative.title, initiative.description))
+        dedup.store_signature(db, initiative_id, signature, initiative.title, initiative.description)
+        enqueue(db, "tag_initiative", initiative_id)
+    enqueue(db, "embed_initiative", initiative_id)
     
     db.commit()
     db.refresh(initiative)
     
+    if text_changed:
+        if signature is not None:
+            dedup.lsh.add(initiative_id, signature)
+        else:
+            dedup.lsh.remove(initiative_id)
+    cache.invalidate_tags("initiatives", f"initiative:{initiative_id}")
+    
     return InitiativeResponse.model_validate(initiative)
 
 @router.delete("/{initiative_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete initiative")
@@ -170,7 +416,8 @@ async def delete_initiative(
     """
     Delete an initiative.
     
-    Only the initiative owner or admin can delete.
+    Only the initiative owner or admin can delete. The initiative disappears
+    immediately; its engagement rows are purged in the background.
     """
     initiative = db.query(Initiative).filter(Initiative.id == initiative_id).first()
     
@@ -187,18 +434,72 @@ async def delete_initiative(
             detail="Not authorized to delete this initiative"
         )
     
-    db.delete(initiative)
+    # Soft delete: the row is hidden at once, the purge job removes it and its dependents
+    initiative.deleted_at = datetime.utcnow()
+    dedup.forget(db, initiative_id)
+    dashboard.forget(db, initiative_id)
+    # The jobs drop the stored tags and vector once the initiative is gone
+    enqueue(db, "tag_initiative", initiative_id)
+    enqueue(db, "embed_initiative", initiative_id)
+    enqueue(db, "purge_initiative", initiative_id)
     db.commit()
     
+    dedup.lsh.remove(initiative_id)
+    vector_index.semantic.remove(initiative_id)
+    cache.invalidate_tags("initiatives", f"initiative:{initiative_id}")
+    
     return None
 
 @router.get("/my/initiatives", response_model=List[InitiativeResponse], summary="Get my initiatives")
 async def get_my_initiatives(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all initiatives created by the current user.
+    Get the initiatives created by the current user, newest first.
+    
+    Paginated with `cursor` and `limit` (next cursor in `X-Next-Cursor`);
+    `fields` restricts the columns loaded and returned.
     """
-    initiatives = db.query(Initiative).filter(Initiative.owner_id == current_user.id).all()
+    selected = parse_fields(fields, InitiativeResponse)
+    query = db.query(Initiative).filter(Initiative.owner_id == current_user.id)
+    if selected:
+        query = query.options(load_columns(Initiative, selected + ("created_at",)))
+    query = keyset(query, Initiative.created_at, Initiative.id, cursor)
+    initiatives = fetch_page(query, limit, lambda i: (i.created_at, i.id), response)
+    
+    if selected:
+        return projected_response(project(InitiativeResponse, selected, initiatives), response)
     return [InitiativeResponse.model_validate(i) for i in initiatives]
+
+@router.get("/my/dashboard", response_model=LeaderDashboard, summary="Get my initiatives dashboard")
+async def get_my_dashboard(
+    current_user: User = Depends(get_current_leader),
+    db: Session = Depends(get_db)
+):
+    """
+    Engagement overview of every initiative owned by the current leader:
+    views, saves and applications by review status per initiative (most
+    recently active first) plus totals.
+    
+    Served from summaries maintained by the write paths, so the cost is one
+    indexed read however many initiatives the leader owns.
+    """
+    summaries = dashboard.owner_summaries(db, current_user.id)
+    counters = ["views", "saves", "pending_applications", "accepted_applications", "rejected_applications"]
+    by_status = {}
+    for summary in summaries:
+        by_status[summary.status.value] = by_status.get(summary.status.value, 0) + 1
+    return {
+        "owner_id": current_user.id,
+        "totals": {
+            "initiatives": len(summaries),
+            "by_status": by_status,
+            **{c: sum(getattr(s, c) for s in summaries) for c in counters},
+        },
+        "initiatives": summaries,
+    }
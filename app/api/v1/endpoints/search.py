@@ -1,18 +1,170 @@
 """
 Search and filtering endpoints
 """
-from fastapi import APIRouter, Depends, Query
+import asyncio
+import json
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status as http_status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
-from typing import List, Optional
-from app.core.database import get_db
-from app.models.initiative import Initiative
+from typing import List, Literal, Optional
+from app.core.cache import cached
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.fields import parse_fields, load_columns, project, projected_response
+from app.core.singleflight import coalesced
+from app.models.initiative import Initiative, InitiativeStatus
 from app.schemas.initiative import InitiativeResponse, InitiativeList
+from app.services import hybrid_search, vector_filters, vector_index
 
 router = APIRouter()
 
+def _json_item_pattern(value: str) -> str:
+    """LIKE pattern (escape character ``\\``) matching a JSON-encoded list item literally"""
+    encoded = json.dumps(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{encoded}%"
+
+def _apply_filters(query, skills: Optional[List[str]], practice_area: Optional[str],
+                   industries: Optional[List[str]], time_commitment: Optional[str],
+                   status: Optional[InitiativeStatus] = None):
+    """Attribute filters shared by text and semantic search"""
+    # Skills filter (every requested skill is needed; lists are stored as JSON text)
+    if skills:
+        for skill in skills:
+            query = query.filter(Initiative.skills_needed.like(_json_item_pattern(skill), escape="\\"))
+    
+    # Practice area filter
+    if practice_area:
+        query = query.filter(Initiative.practice_area == practice_area)
+    
+    # Industries filter
+    if industries:
+        for industry in industries:
+            query = query.filter(Initiative.industries.like(_json_item_pattern(industry), escape="\\"))
+    
+    # Time commitment filter
+    if time_commitment:
+        query = query.filter(Initiative.time_commitment == time_commitment)
+    
+    if status:
+        query = query.filter(Initiative.status == status)
+    return query
+
+def _serialize(initiatives, fields: Optional[tuple]) -> list:
+    if fields:
+        return project(InitiativeResponse, fields, initiatives)
+    return [InitiativeResponse.model_validate(i).model_dump(mode="json") for i in initiatives]
+
+@cached("search", tags=["initiatives"])
+def _search_page(db: Session, q: Optional[str], skills: Optional[List[str]], practice_area: Optional[str],
+                 industries: Optional[List[str]], time_commitment: Optional[str], skip: int, limit: int,
+                 fields: Optional[tuple] = None) -> dict:
+    """Serialized page of search results for one parameter combination"""
+    query = db.query(Initiative)
+    
+    # Text search (basic implementation - will be replaced with vector search)
+    if q:
+        search_filter = or_(
+            Initiative.title.ilike(f"%{q}%"),
+            Initiative.description.ilike(f"%{q}%")
+        )
+        query = query.filter(search_filter)
+    
+    query = _apply_filters(query, skills, practice_area, industries, time_commitment)
+    
+    # Get total count
+    total = query.count()
+    
+    # Apply pagination
+    if fields:
+        query = query.options(load_columns(Initiative, fields))
+    initiatives = query.offset(skip).limit(limit).all()
+    
+    items = _serialize(initiatives, fields)
+    return {"total": total, "items": items, "page": skip // limit + 1, "page_size": limit}
+
+def _timed(func, *args) -> tuple:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+def _lexical_hits(q: str, skills: Optional[List[str]], practice_area: Optional[str],
+                  industries: Optional[List[str]], time_commitment: Optional[str], depth: int) -> list:
+    """Field-boosted keyword hits, best first (own session: runs beside the vector retriever)"""
+    db = SessionLocal()
+    try:
+        score = hybrid_search.lexical_score(q)
+        query = _apply_filters(db.query(Initiative.id, score.label("score")), skills, practice_area,
+                               industries, time_commitment)
+        rows = query.filter(score > 0).order_by(score.desc(), Initiative.id).limit(depth).all()
+        return [(initiative_id, float(value)) for initiative_id, value in rows]
+    finally:
+        db.close()
+
+def _semantic_hits(q: str, criteria: list, depth: int) -> Optional[list]:
+    """Vector index hits, best first, or None when nothing is indexed (own session)"""
+    db = SessionLocal()
+    try:
+        return vector_index.search(db, q, depth, criteria)
+    finally:
+        db.close()
+
+def _hydrate(db: Session, ids: List[int], fields: Optional[tuple]) -> list:
+    """Serialized initiatives in the order of ``ids``"""
+    query = db.query(Initiative).filter(Initiative.id.in_(ids))
+    if fields:
+        query = query.options(load_columns(Initiative, fields))
+    found = {i.id: i for i in query.all()}
+    return _serialize([found[i] for i in ids if i in found], fields)
+
+def _matching_ids(db: Session, ids: List[int], skills: Optional[List[str]], practice_area: Optional[str],
+                  industries: Optional[List[str]], time_commitment: Optional[str]) -> List[int]:
+    """``ids`` (in order) that still exist and pass the filters; the vector index lags the database"""
+    query = _apply_filters(db.query(Initiative.id).filter(Initiative.id.in_(ids)), skills, practice_area,
+                           industries, time_commitment)
+    found = {initiative_id for initiative_id, in query.all()}
+    return [i for i in ids if i in found]
+
+def _fused_page(db: Session, ids: List[int], skills: Optional[List[str]], practice_area: Optional[str],
+                industries: Optional[List[str]], time_commitment: Optional[str], skip: int, limit: int,
+                fields: Optional[tuple]) -> tuple:
+    """(matching count, serialized page) of fused ids"""
+    matching = _matching_ids(db, ids, skills, practice_area, industries, time_commitment)
+    return len(matching), _hydrate(db, matching[skip:skip + limit], fields)
+
+@coalesced("hybrid_search")
+async def _hybrid_page(db: Session, q: str, skills: Optional[List[str]], practice_area: Optional[str],
+                       industries: Optional[List[str]], time_commitment: Optional[str], skip: int, limit: int,
+                       fusion: Optional[str], fields: Optional[tuple] = None) -> tuple:
+    """Fused page of lexical and semantic results, with per-stage timings in milliseconds"""
+    started = time.perf_counter()
+    depth = max(settings.SEARCH_HYBRID_CANDIDATES, skip + limit)
+    criteria = vector_filters.criteria(None, practice_area, time_commitment, skills, industries)
+    # Both retrievers run at once, so retrieval costs as much as the slower one
+    (lexical, lexical_ms), (semantic, semantic_ms) = await asyncio.gather(
+        run_in_threadpool(_timed, _lexical_hits, q, skills, practice_area, industries, time_commitment, depth),
+        run_in_threadpool(_timed, _semantic_hits, q, criteria, depth),
+    )
+    retrieved = time.perf_counter()
+    fused = hybrid_search.fuse(lexical, semantic, fusion)
+    fused_at = time.perf_counter()
+    total, items = await run_in_threadpool(
+        _fused_page, db, [i for i, _ in fused], skills, practice_area, industries, time_commitment, skip, limit, fields
+    )
+    finished = time.perf_counter()
+    
+    timings = {
+        "lexical": lexical_ms, "semantic": semantic_ms, "retrieval": (retrieved - started) * 1000,
+        "fusion": (fused_at - retrieved) * 1000, "hydrate": (finished - fused_at) * 1000,
+        "total": (finished - started) * 1000,
+    }
+    page = {"total": total, "items": items, "page": skip // limit + 1, "page_size": limit}
+    return page, timings
+
 @router.get("/", response_model=InitiativeList, summary="Search initiatives")
 async def search_initiatives(
+    response: Response,
     q: Optional[str] = Query(None, description="Search query (searches title and description)"),
     skills: Optional[List[str]] = Query(None, description="Filter by required skills"),
     practice_area: Optional[str] = Query(None, description="Filter by practice area"),
@@ -20,6 +172,10 @@ async def search_initiatives(
     time_commitment: Optional[str] = Query(None, description="Filter by time commitment"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
+    mode: Literal["lexical", "hybrid"] = Query("lexical", description="hybrid fuses keyword and semantic ranking"),
+    fusion: Optional[Literal["rrf", "weighted"]] = Query(None, description="Hybrid fusion method (default SEARCH_HYBRID_FUSION)"),
+    debug: bool = Query(False, description="Return per-stage timings in a Server-Timing header (hybrid mode)"),
     db: Session = Depends(get_db)
 ):
     """
@@ -36,54 +192,77 @@ async def search_initiatives(
     - `/search?q=AI healthcare` - Search for AI healthcare initiatives
     - `/search?skills=Python&skills=Machine Learning` - Find initiatives needing Python and ML
     - `/search?practice_area=Technology&time_commitment=5 hours/week` - Technology initiatives with specific commitment
+    - `/search?q=AI&fields=title,status,save_count` - Card view without descriptions
+    - `/search?q=Python healthcare&mode=hybrid` - Keyword and semantic matches fused
     
-    Future enhancement: This will use vector embeddings for semantic search.
-    """
-    query = db.query(Initiative)
+    **Hybrid mode** ranks by both field-boosted keyword hits (title, tags and skills
+    weigh most) and semantic similarity, fused with reciprocal rank fusion (`fusion=rrf`)
+    or normalized scores (`fusion=weighted`). The two retrievers run concurrently;
+    `debug=true` adds their timings and those of fusion and loading in `Server-Timing`.
     
-    # Text search (basic implementation - will be replaced with vector search)
-    if q:
+    Lexical results are cached per parameter combination and invalidated by initiative
+    writes; concurrent identical searches share one query.
+    """
+    selected = parse_fields(fields, InitiativeResponse)
+    if mode == "hybrid":
+        if not q:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="Hybrid search needs a query (q)"
+            )
+        page, timings = await _hybrid_page(
+            db, q, skills, practice_area, industries, time_commitment, skip, limit, fusion, selected
+        )
+        if debug:
+            response.headers["Server-Timing"] = ", ".join(f"{stage};dur={ms:.1f}" for stage, ms in timings.items())
+    else:
+        page = await run_in_threadpool(
+            _search_page, db, q, skills, practice_area, industries, time_commitment, skip, limit, selected
+        )
+    if selected:
+        return projected_response(page, response)
+    return page
+
+@coalesced("semantic_search")
+def _semantic_page(db: Session, query: str, limit: int, skills: Optional[List[str]] = None,
+                   practice_area: Optional[str] = None, industries: Optional[List[str]] = None,
+                   time_commitment: Optional[str] = None, status: Optional[InitiativeStatus] = None) -> dict:
+    """Serialized semantic search results, shared by concurrent identical queries"""
+    criteria = vector_filters.criteria(status, practice_area, time_commitment, skills, industries)
+    hits = vector_index.search(db, query, limit, criteria)
+    if hits is None:
+        # No embeddings indexed yet: fall back to basic text search
         search_filter = or_(
-            Initiative.title.ilike(f"%{q}%"),
-            Initiative.description.ilike(f"%{q}%")
+            Initiative.title.ilike(f"%{query}%"),
+            Initiative.description.ilike(f"%{query}%")
         )
-        query = query.filter(search_filter)
-    
-    # Skills filter (match any of the requested skills)
-    if skills:
-        for skill in skills:
-            query = query.filter(Initiative.skills_needed.any(skill))
-    
-    # Practice area filter
-    if practice_area:
-        query = query.filter(Initiative.practice_area == practice_area)
-    
-    # Industries filter
-    if industries:
-        for industry in industries:
-            query = query.filter(Initiative.industries.any(industry))
-    
-    # Time commitment filter
-    if time_commitment:
-        query = query.filter(Initiative.time_commitment == time_commitment)
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    initiatives = query.offset(skip).limit(limit).all()
+        filtered = _apply_filters(db.query(Initiative).filter(search_filter), skills, practice_area,
+                                  industries, time_commitment, status)
+        initiatives = filtered.limit(limit).all()
+    else:
+        ids = [initiative_id for initiative_id, _ in hits]
+        # The index's attribute bitmaps trail the database by up to one sync interval
+        matching = _apply_filters(db.query(Initiative).filter(Initiative.id.in_(ids)), skills, practice_area,
+                                  industries, time_commitment, status)
+        found = {i.id: i for i in matching.all()}
+        initiatives = [found[i] for i in ids if i in found]
     
     return InitiativeList(
-        total=total,
+        total=len(initiatives),
         items=[InitiativeResponse.model_validate(i) for i in initiatives],
-        page=skip // limit + 1,
+        page=1,
         page_size=limit
-    )
+    ).model_dump(mode="json")
 
 @router.get("/semantic", response_model=InitiativeList, summary="Semantic search (AI-powered)")
 async def semantic_search(
     query: str = Query(..., description="Natural language search query"),
     limit: int = Query(10, ge=1, le=50),
+    skills: Optional[List[str]] = Query(None, description="Filter by required skills"),
+    practice_area: Optional[str] = Query(None, description="Filter by practice area"),
+    industries: Optional[List[str]] = Query(None, description="Filter by industries"),
+    time_commitment: Optional[str] = Query(None, description="Filter by time commitment"),
+    status: Optional[InitiativeStatus] = Query(None, description="Filter by initiative status"),
     db: Session = Depends(get_db)
 ):
     """
@@ -95,30 +274,16 @@ async def semantic_search(
     - "Innovation opportunities in financial services"
     
     This endpoint uses vector embeddings to understand the semantic meaning
-    of your query and find the most relevant initiatives.
-    
-    **Note**: This is a placeholder. Full implementation requires:
-    1. Embedding generation for initiatives
-    2. Vector database integration (Qdrant)
-    3. Cosine similarity matching
-    """
-    # TODO: Implement vector search
-    # 1. Generate embedding for query
-    # 2. Search vector database
-    # 3. Retrieve matching initiative IDs
-    # 4. Return ranked results
-    
-    # For now, fall back to basic text search
-    search_filter = or_(
-        Initiative.title.ilike(f"%{query}%"),
-        Initiative.description.ilike(f"%{query}%")
-    )
+    of your query and find the most relevant initiatives, ranked by cosine
+    similarity through the in-process HNSW index (`VECTOR_INDEX_BACKEND`).
+    Until initiatives have been embedded it falls back to text search.
     
-    initiatives = db.query(Initiative).filter(search_filter).limit(limit).all()
+    Takes the same filters as `/search` plus `status`, e.g.
+    `/search/semantic?query=AI&status=open&practice_area=Technology`. Filters are
+    applied inside the index, so a filtered search still returns up to `limit` hits.
     
-    return InitiativeList(
-        total=len(initiatives),
-        items=[InitiativeResponse.model_validate(i) for i in initiatives],
-        page=1,
-        page_size=limit
+    Concurrent identical queries share one execution.
+    """
+    return await run_in_threadpool(
+        _semantic_page, db, query, limit, skills, practice_area, industries, time_commitment, status
     )
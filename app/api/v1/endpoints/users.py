@@ -1,23 +1,42 @@
 """
 User management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import delete, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
+from app.core.cache import cache
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_current_admin
+from app.core.fields import parse_fields, load_columns, project, projected_response
+from app.core.jobs import enqueue, enqueue_many
+from app.models.dashboard import InitiativeSummary
+from app.models.initiative import Initiative
+from app.models.similarity import InitiativeMinHash
+from app.core.http_cache import make_etag, is_not_modified, not_modified, apply_cache_headers, PRIVATE_CACHE_CONTROL
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
+from app.services import dedup, vector_index
 
 router = APIRouter()
 
 @router.get("/me", response_model=UserResponse, summary="Get current user profile")
 async def get_current_user_profile(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ):
     """
     Get the current authenticated user's profile.
+    
+    Supports conditional GET via If-None-Match / If-Modified-Since.
     """
+    etag = make_etag("user", current_user.id, current_user.version, current_user.updated_at)
+    if is_not_modified(request, etag, current_user.updated_at):
+        return not_modified(etag, current_user.updated_at, PRIVATE_CACHE_CONTROL, vary="Authorization")
+    
+    apply_cache_headers(response, etag, current_user.updated_at, PRIVATE_CACHE_CONTROL, vary="Authorization")
     return UserResponse.model_validate(current_user)
 
 @router.put("/me", response_model=UserResponse, summary="Update current user profile")
@@ -47,6 +66,8 @@ async def update_current_user_profile(
         else:
             setattr(current_user, field, value)
     
+    current_user.version = (current_user.version or 0) + 1
+    
     db.commit()
     db.refresh(current_user)
     
@@ -75,15 +96,76 @@ async def get_user_by_id(
 
 @router.get("/", response_model=List[UserResponse], summary="List all users")
 async def list_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,full_name,practice"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     List all users (paginated).
     
+    `fields` returns only the listed fields (and only loads those columns).
+    
     Requires authentication.
     """
-    users = db.query(User).offset(skip).limit(limit).all()
+    selected = parse_fields(fields, UserResponse)
+    query = db.query(User)
+    if selected:
+        query = query.options(load_columns(User, selected))
+    users = query.offset(skip).limit(limit).all()
+    if selected:
+        return projected_response(project(UserResponse, selected, users), response)
     return [UserResponse.model_validate(user) for user in users]
+
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete user")
+async def delete_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Delete a user and the initiatives they own.
+    
+    Admin only. The user can no longer sign in and their initiatives
+    disappear immediately; saves, applications and views are purged in
+    the background.
+    """
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete your own account"
+        )
+    
+    user = db.query(User).filter(User.id == user_id).first()
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    now = datetime.utcnow()
+    user.deleted_at = now
+    owned = db.execute(
+        update(Initiative)
+        .where(Initiative.owner_id == user_id, Initiative.deleted_at.is_(None))
+        .values(deleted_at=now)
+        .returning(Initiative.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    if owned:
+        db.execute(delete(InitiativeMinHash).where(InitiativeMinHash.initiative_id.in_(owned)))
+        db.execute(delete(InitiativeSummary).where(InitiativeSummary.initiative_id.in_(owned)))
+        enqueue_many(db, "tag_initiative", owned)
+        enqueue_many(db, "embed_initiative", owned)
+    enqueue(db, "purge_user", user_id)
+    db.commit()
+    
+    for initiative_id in owned:
+        dedup.lsh.remove(initiative_id)
+        vector_index.semantic.remove(initiative_id)
+    cache.invalidate_tags("initiatives", *(f"initiative:{initiative_id}" for initiative_id in owned))
+    
+    return None
@@ -0,0 +1,182 @@
+"""
+Admission control: per-route-class concurrency limits with load shedding
+
+Every HTTP request is assigned a route class by path prefix
+(``ADMISSION_ROUTE_CLASSES``, e.g. recommendations, search; anything else
+is ``default``). Each class admits up to its concurrency limit; further
+requests wait in a bounded FIFO queue for at most ``ADMISSION_QUEUE_TIMEOUT``
+seconds. When the queue is full, or the wait runs out, the request is shed
+at once with ``503`` and ``Retry-After`` instead of piling up behind slow
+work and dragging the whole worker down.
+
+Limits adapt with AIMD on observed latency: a class whose requests finish
+above its ``ADMISSION_TARGET_LATENCY_MS`` (or fail with 5xx) has its limit
+cut by ``ADMISSION_BACKOFF`` (at most once per latency period), and a class
+that uses its full limit while staying under target grows by about one
+slot per limit's worth of completions. Classes without a target keep a
+fixed limit - the ``priority`` class (``/health``, authentication) is one
+of them, a reserved lane that slow routes can never occupy.
+
+State is per worker process and lives on its event loop.
+"""
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, Optional
+from starlette.responses import JSONResponse
+from app.core.config import settings
+
+DEFAULT_CLASS = "default"
+
+class Lane:
+    """Concurrency limit and wait queue of one route class"""
+
+    def __init__(self, name: str, limit: int, target_ms: Optional[float]):
+        self.name = name
+        self.limit = float(limit)
+        self.target_ms = target_ms
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.counters = Counter()
+        self._last_decrease = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return max(1, int(self.limit))
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed; False when shed"""
+        if self.in_flight < self.capacity and not self.waiters:
+            self.in_flight += 1
+            self.counters["admitted"] += 1
+            return True
+        if len(self.waiters) >= settings.ADMISSION_QUEUE_SIZE:
+            self.counters["shed_queue_full"] += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.counters["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), settings.ADMISSION_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                waiter.cancel()
+                self.counters["shed_timeout"] += 1
+                return False
+        except asyncio.CancelledError:
+            # Client went away while queued; hand a granted slot back
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+            raise
+        # Granted by release(), which already counted the slot
+        self.counters["admitted"] += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self.waiters and self.in_flight < self.capacity:
+            waiter = self.waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(True)
+
+    def record(self, latency_ms: float, failed: bool, in_flight_at_start: int) -> None:
+        """Adjust the limit from one completed request (AIMD)"""
+        if self.target_ms is None:
+            return
+        now = time.monotonic()
+        if failed or latency_ms > self.target_ms:
+            # Multiplicative decrease, once per latency period
+            if now - self._last_decrease >= latency_ms / 1000:
+                self.limit = max(settings.ADMISSION_MIN_LIMIT, self.limit * settings.ADMISSION_BACKOFF)
+                self._last_decrease = now
+                self.counters["decreases"] += 1
+        elif in_flight_at_start >= self.capacity - 1:
+            # Additive increase while the limit is actually the bottleneck
+            self.limit = min(settings.ADMISSION_MAX_LIMIT, self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "target_latency_ms": self.target_ms,
+            "in_flight": self.in_flight,
+            "queued_now": sum(1 for w in self.waiters if not w.done()),
+            **dict(self.counters),
+        }
+
+class AdmissionController:
+    """Route classification and the lanes of this worker"""
+
+    def __init__(self):
+        self.lanes: Dict[str, Lane] = {}
+
+    def classify(self, path: str) -> str:
+        best, best_length = DEFAULT_CLASS, -1
+        for prefix, name in settings.ADMISSION_ROUTE_CLASSES.items():
+            if path.startswith(prefix) and len(prefix) > best_length:
+                best, best_length = name, len(prefix)
+        return best
+
+    def lane(self, name: str) -> Lane:
+        lane = self.lanes.get(name)
+        if lane is None:
+            limits = settings.ADMISSION_LIMITS
+            limit = limits.get(name, limits.get(DEFAULT_CLASS, 32))
+            lane = self.lanes[name] = Lane(name, limit, settings.ADMISSION_TARGET_LATENCY_MS.get(name))
+        return lane
+
+    def stats(self) -> dict:
+        return {"enabled": settings.ADMISSION_ENABLED, "classes": {n: l.stats() for n, l in self.lanes.items()}}
+
+    def reset(self) -> None:
+        self.lanes.clear()
+
+controller = AdmissionController()
+
+def _shed_response(lane: Lane) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Server busy ({lane.name}), retry later"},
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+    )
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying the controller's lanes to HTTP requests"""
+
+    def __init__(self, app, admission: Optional[AdmissionController] = None):
+        self.app = app
+        self.admission = admission or controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.admission.lane(self.admission.classify(scope["path"]))
+        if not await lane.acquire():
+            await _shed_response(lane)(scope, receive, send)
+            return
+
+        in_flight_at_start = lane.in_flight
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            lane.release()
+            lane.record((time.perf_counter() - started) * 1000, status_code >= 500, in_flight_at_start)
@@ -0,0 +1,557 @@
+"""
+Application cache layer
+
+Two interchangeable backends are provided:
+
+* ``MemoryBackend`` - in-process TTL + LRU store (default)
+* ``RedisBackend`` - speaks the Redis wire protocol (RESP) over a plain
+  socket, so it works against Redis, KeyDB, Dragonfly or a local fake server
+  without adding a client library dependency
+
+Invalidation is tag based. Every entry records the version of each tag it
+depends on; ``invalidate_tags`` bumps those versions so dependent entries
+become stale on their next read, without having to track which keys exist.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import socket
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+from urllib.parse import urlparse
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.singleflight import flights
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+class CacheError(Exception):
+    """Raised by backends when the store cannot be reached"""
+
+class CacheBackend:
+    """Interface implemented by cache stores"""
+    name = "base"
+
+    def get(self, key: str) -> Any:
+        """Return the stored value or MISSING"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    # Counters back the tag versions; they must never be evicted by LRU
+    def get_counters(self, names: Sequence[str]) -> List[Optional[int]]:
+        raise NotImplementedError
+
+    def init_counter(self, name: str, value: int) -> None:
+        """Set a counter only if it does not exist yet"""
+        raise NotImplementedError
+
+    def incr_counter(self, name: str) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+    def reset_after_fork(self) -> None:
+        """Drop resources that must not be shared with a forked child"""
+
+class MemoryBackend(CacheBackend):
+    """Thread-safe in-process store with per-entry TTL and LRU eviction"""
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: dict = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_counters(self, names: Sequence[str]) -> List[Optional[int]]:
+        with self._lock:
+            return [self._counters.get(name) for name in names]
+
+    def init_counter(self, name: str, value: int) -> None:
+        with self._lock:
+            self._counters.setdefault(name, value)
+
+    def incr_counter(self, name: str) -> int:
+        with self._lock:
+            value = self._counters.get(name, 0) + 1
+            self._counters[name] = value
+            return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+class RedisBackend(CacheBackend):
+    """
+    Minimal RESP2 client covering the handful of commands the cache needs.
+
+    Values are stored as JSON, so cached results must be JSON serializable
+    (Pydantic models are converted with ``jsonable_encoder``).
+    """
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "cache:", timeout: float = 0.5):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    # -- wire protocol --------------------------------------------------
+
+    def _connect(self) -> None:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+        if self.password:
+            self._roundtrip("AUTH", self.password)
+        if self.db:
+            self._roundtrip("SELECT", self.db)
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise CacheError("connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            raise CacheError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise CacheError(f"unexpected reply type {kind!r}")
+
+    def _roundtrip(self, *args):
+        self._sock.sendall(self._encode(args))
+        return self._read_reply()
+
+    def execute(self, *args):
+        """Run one command, reconnecting once on a broken connection"""
+        with self._lock:
+            for attempt in (1, 2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._roundtrip(*args)
+                except (OSError, CacheError) as exc:
+                    self._disconnect()
+                    if attempt == 2 or not isinstance(exc, OSError):
+                        raise CacheError(str(exc)) from exc
+
+    # -- backend interface ----------------------------------------------
+
+    def get(self, key: str) -> Any:
+        raw = self.execute("GET", self.prefix + key)
+        if raw is None:
+            return MISSING
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        payload = json.dumps(jsonable_encoder(value), separators=(",", ":"))
+        if ttl:
+            self.execute("SET", self.prefix + key, payload, "PX", int(ttl * 1000))
+        else:
+            self.execute("SET", self.prefix + key, payload)
+
+    def delete(self, key: str) -> None:
+        self.execute("DEL", self.prefix + key)
+
+    def clear(self) -> None:
+        # Only remove our own keys; the database may be shared
+        cursor = "0"
+        while True:
+            cursor, keys = self.execute("SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 500)
+            if keys:
+                self.execute("DEL", *keys)
+            cursor = cursor.decode("utf-8") if isinstance(cursor, bytes) else str(cursor)
+            if cursor == "0":
+                break
+
+    def get_counters(self, names: Sequence[str]) -> List[Optional[int]]:
+        if not names:
+            return []
+        values = self.execute("MGET", *[self.prefix + "tag:" + n for n in names])
+        return [int(v) if v is not None else None for v in values]
+
+    def init_counter(self, name: str, value: int) -> None:
+        self.execute("SET", self.prefix + "tag:" + name, value, "NX")
+
+    def incr_counter(self, name: str) -> int:
+        return self.execute("INCR", self.prefix + "tag:" + name)
+
+    def stats(self) -> dict:
+        return {"host": self.host, "port": self.port, "db": self.db}
+
+    def reset_after_fork(self) -> None:
+        # The parent's socket must not be shared; reconnect lazily
+        self._lock = threading.Lock()
+        self._sock = None
+        self._reader = None
+
+class Cache:
+    """Namespaced cache front-end with tag invalidation and hit/miss stats"""
+
+    def __init__(self, backend: CacheBackend, default_ttl: Optional[float] = None):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._stats: dict = {}
+        self._stats_lock = threading.Lock()
+        self._publishers: List[Callable[[List[str]], None]] = []
+
+    def _count(self, namespace: str, event: str) -> None:
+        with self._stats_lock:
+            self._stats.setdefault(namespace, Counter())[event] += 1
+
+    def _tag_versions(self, tags: Sequence[str], create: bool = False) -> List[Optional[int]]:
+        versions = self.backend.get_counters(tags)
+        if create and any(v is None for v in versions):
+            # Seed unseen tags with a unique value so an evicted tag can never
+            # come back at a version an old entry was stored with
+            for tag, version in zip(tags, versions):
+                if version is None:
+                    self.backend.init_counter(tag, time.time_ns())
+            versions = self.backend.get_counters(tags)
+        return versions
+
+    def get(self, namespace: str, key: str) -> Any:
+        """Return a cached value, or MISSING when absent, expired or stale"""
+        try:
+            entry = self.backend.get(f"{namespace}:{key}")
+            if entry is MISSING:
+                self._count(namespace, "misses")
+                return MISSING
+            tags = entry.get("t") or {}
+            if tags:
+                current = self._tag_versions(list(tags))
+                if any(cur is None or cur != ver for cur, ver in zip(current, tags.values())):
+                    self._count(namespace, "stale")
+                    self._count(namespace, "misses")
+                    return MISSING
+        except CacheError as exc:
+            logger.warning("cache get failed: %s", exc)
+            self._count(namespace, "errors")
+            return MISSING
+        self._count(namespace, "hits")
+        return entry["v"]
+
+    def tag_versions(self, namespace: str, tags: Iterable[str]) -> Optional[Dict[str, int]]:
+        """
+        Current versions of ``tags``, read before computing a value and then
+        passed to ``set``: an invalidation committed while the value was
+        being computed then leaves the entry stale. None when unavailable.
+        """
+        tags = list(tags)
+        try:
+            return dict(zip(tags, self._tag_versions(tags, create=True))) if tags else {}
+        except CacheError as exc:
+            logger.warning("cache tag read failed: %s", exc)
+            self._count(namespace, "errors")
+            return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = (),
+            versions: Optional[Dict[str, int]] = None) -> None:
+        """Store a value; ``versions`` from ``tag_versions`` replace reading the tags' current versions"""
+        tags = list(tags)
+        try:
+            if versions is None:
+                versions = dict(zip(tags, self._tag_versions(tags, create=True))) if tags else {}
+            self.backend.set(
+                f"{namespace}:{key}",
+                {"v": value, "t": versions},
+                ttl if ttl is not None else self.default_ttl
+            )
+        except CacheError as exc:
+            logger.warning("cache set failed: %s", exc)
+            self._count(namespace, "errors")
+            return
+        self._count(namespace, "sets")
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            self.backend.delete(f"{namespace}:{key}")
+        except CacheError as exc:
+            logger.warning("cache delete failed: %s", exc)
+
+    def add_publisher(self, publisher: Callable[[List[str]], None]) -> None:
+        """Forward local invalidations elsewhere (e.g. to sibling workers)"""
+        self._publishers.append(publisher)
+
+    def remove_publisher(self, publisher: Callable[[List[str]], None]) -> None:
+        if publisher in self._publishers:
+            self._publishers.remove(publisher)
+
+    def invalidate_tags(self, *tags: str, propagate: bool = True) -> None:
+        """
+        Mark every entry depending on any of the tags as stale.
+
+        ``propagate=False`` applies the invalidation locally only; it is used
+        when replaying invalidations received from another worker.
+        """
+        for tag in tags:
+            try:
+                self.backend.incr_counter(tag)
+            except CacheError as exc:
+                logger.warning("cache invalidation of %s failed: %s", tag, exc)
+                self._count("_tags", "errors")
+                continue
+            self._count("_tags", "invalidations")
+        if propagate and tags:
+            for publisher in self._publishers:
+                try:
+                    publisher(list(tags))
+                except Exception:
+                    logger.exception("cache invalidation publisher failed")
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            namespaces = {}
+            for namespace, counter in self._stats.items():
+                data = dict(counter)
+                lookups = data.get("hits", 0) + data.get("misses", 0)
+                if lookups:
+                    data["hit_ratio"] = round(data.get("hits", 0) / lookups, 4)
+                namespaces[namespace] = data
+        return {
+            "backend": self.backend.name,
+            "backend_stats": self.backend.stats(),
+            "namespaces": namespaces,
+            "singleflight": flights.stats(),
+        }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats.clear()
+        flights.reset_stats()
+
+def build_backend() -> CacheBackend:
+    """Create the backend selected in settings"""
+    if settings.CACHE_BACKEND == "redis":
+        if not settings.CACHE_URL:
+            raise ValueError("CACHE_URL is required when CACHE_BACKEND=redis")
+        return RedisBackend(settings.CACHE_URL)
+    return MemoryBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+cache = Cache(build_backend(), default_ttl=settings.CACHE_DEFAULT_TTL)
+
+_PENDING_TAGS = "cache_pending_tags"
+
+def invalidate_after_commit(db: Session, *tags: str) -> None:
+    """
+    Invalidate ``tags`` once ``db`` commits its current transaction, or
+    drop them if it rolls back. Invalidating earlier would let a reader
+    re-cache the old rows, and on SQLite publishing to sibling workers
+    from inside a write transaction fails on the database lock.
+    """
+    if not db.in_transaction():
+        cache.invalidate_tags(*tags)
+        return
+    db.info.setdefault(_PENDING_TAGS, set()).update(tags)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    tags = session.info.pop(_PENDING_TAGS, None)
+    if tags:
+        cache.invalidate_tags(*sorted(tags))
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back(session):
+    session.info.pop(_PENDING_TAGS, None)
+
+def _key_part(value):
+    """Reduce an argument to a stable key component, or MISSING to skip it"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        parts = [_key_part(v) for v in value]
+        if any(p is MISSING for p in parts):
+            return MISSING
+        return sorted(parts, key=repr) if isinstance(value, (set, frozenset)) else parts
+    # Sessions, requests, ORM objects... are not part of the cache key
+    return MISSING
+
+def make_key(route: str, params: dict, user_id: Optional[int] = None) -> str:
+    """Stable key for a route, its simple parameters and (optionally) the user"""
+    parts = {}
+    for name, value in params.items():
+        part = _key_part(value)
+        if part is not MISSING:
+            parts[name] = part
+    raw = json.dumps([route, parts, user_id], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def cached(
+    namespace: str,
+    ttl: Optional[float] = None,
+    tags: Union[Iterable[str], Callable[..., Iterable[str]], None] = None,
+    vary_on_user: bool = False,
+):
+    """
+    Cache the result of an endpoint, dependency or helper.
+
+    The key is built from the function's qualified name (its route) and
+    all arguments that reduce to simple values; sessions and requests are
+    ignored. ``vary_on_user`` adds ``current_user.id`` to the key. ``tags``
+    may be a list or a callable receiving the bound arguments.
+
+    Works on both sync and async callables and preserves the signature, so
+    FastAPI dependency injection keeps working on decorated endpoints.
+    Concurrent misses on the same key are coalesced into one computation
+    (see ``app.core.singleflight``).
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        route = f"{func.__module__}.{func.__qualname__}"
+
+        def _prepare(args, kwargs):
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            user_id = None
+            if vary_on_user:
+                user_id = getattr(params.get("current_user"), "id", None)
+            key = make_key(route, params, user_id)
+            entry_tags = tags(**params) if callable(tags) else (tags or ())
+            return key, list(entry_tags)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not settings.CACHE_ENABLED:
+                    return await func(*args, **kwargs)
+                key, entry_tags = _prepare(args, kwargs)
+                value = cache.get(namespace, key)
+                if value is not MISSING:
+                    return value
+
+                async def compute():
+                    versions = cache.tag_versions(namespace, entry_tags)
+                    result = await func(*args, **kwargs)
+                    if versions is not None:
+                        cache.set(namespace, key, result, ttl, entry_tags, versions)
+                    return result
+
+                if settings.SINGLEFLIGHT_ENABLED:
+                    return await flights.do_async(namespace, key, compute)
+                return await compute()
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not settings.CACHE_ENABLED:
+                return func(*args, **kwargs)
+            key, entry_tags = _prepare(args, kwargs)
+            value = cache.get(namespace, key)
+            if value is not MISSING:
+                return value
+
+            def compute():
+                versions = cache.tag_versions(namespace, entry_tags)
+                result = func(*args, **kwargs)
+                if versions is not None:
+                    cache.set(namespace, key, result, ttl, entry_tags, versions)
+                return result
+
+            if settings.SINGLEFLIGHT_ENABLED:
+                return flights.do(namespace, key, compute)
+            return compute()
+        return wrapper
+
+    return decorator
@@ -2,13 +2,16 @@
 Application configuration settings
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     # Application
     APP_NAME: str = "Deloitte Initiative Discovery Platform"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = True
+    PRODUCTION: bool = False  # skip DDL/seeding on boot, no auto-reload
+    WARM_CACHES_ON_STARTUP: bool = False
+    WARMUP_DELAY_SECONDS: float = 1.0  # delay after start-up before warmers run
     
     # Database (SQLite for development)
     DATABASE_URL: str = "sqlite:///./deloitte_initiatives.db"
@@ -24,10 +27,122 @@ class Settings(BaseSettings):
     AZURE_AD_CLIENT_SECRET: Optional[str] = None
     AZURE_AD_AUTHORITY: Optional[str] = None
     
+    # HTTP caching
+    HTTP_CACHE_MAX_AGE: int = 15  # seconds a shared proxy may reuse public listings
+    
+    # Application cache
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory"  # "memory" (in-process LRU) or "redis"
+    CACHE_URL: Optional[str] = None  # e.g. redis://localhost:6379/0
+    CACHE_DEFAULT_TTL: int = 60  # seconds
+    CACHE_MAX_ENTRIES: int = 10000  # per process, memory backend only
+    CACHE_SYNC_ENABLED: bool = False  # broadcast invalidations between workers
+    CACHE_SYNC_INTERVAL: float = 0.25  # seconds between invalidation polls
+    SINGLEFLIGHT_ENABLED: bool = True  # coalesce concurrent identical cache misses / coalesced reads
+    SINGLEFLIGHT_WINDOW: float = 0.5  # seconds a finished @coalesced result is shared with identical requests
+    SINGLEFLIGHT_TIMEOUT: float = 10.0  # waiters stop waiting for the leader and compute themselves
+    
+    # Admission control (per route class, per worker)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_ROUTE_CLASSES: Dict[str, str] = {  # path prefix -> route class; other paths are "default"
+        "/health": "priority",
+        "/api/v1/auth/": "priority",
+        "/api/v1/recommendations": "recommendations",
+        "/api/v1/search": "search",
+    }
+    ADMISSION_LIMITS: Dict[str, int] = {"priority": 16, "recommendations": 4, "search": 8, "default": 32}  # initial concurrent requests
+    ADMISSION_TARGET_LATENCY_MS: Dict[str, float] = {"recommendations": 1000.0, "search": 300.0, "default": 500.0}  # classes without a target keep a fixed limit
+    ADMISSION_MIN_LIMIT: int = 1
+    ADMISSION_MAX_LIMIT: int = 256
+    ADMISSION_BACKOFF: float = 0.9  # limit multiplier when latency exceeds the target
+    ADMISSION_QUEUE_SIZE: int = 64  # requests waiting per class before new ones are shed
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0  # seconds a request may wait for a slot before a 503
+    ADMISSION_RETRY_AFTER: int = 1  # Retry-After seconds sent with 503 responses
+    
     # Vector Database (Qdrant)
     QDRANT_URL: str = "http://localhost:6333"
     QDRANT_API_KEY: Optional[str] = None
     
+    # Embeddings (loaded lazily on first use)
+    EMBEDDING_BACKEND: str = "auto"  # "sentence-transformers", "hashing" or "auto"
+    EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_DIM: int = 384  # hashing backend only; transformer models define their own
+    EMBEDDING_STORE_PATH: str = "./embeddings.store"  # memory-mapped matrix shared by the workers
+    EMBEDDING_STORE_DTYPE: str = "float32"  # "float32" or "float16" (half the size; changing it rebuilds the store)
+    
+    # Background jobs
+    JOB_WORKERS: int = 2  # runner threads per process (0 disables the runner)
+    JOB_POLL_INTERVAL: float = 0.5  # seconds
+    JOB_COALESCE_DELAY: float = 2.0  # debounce window for repeated entity jobs
+    JOB_COALESCE_MAX_WAIT: float = 30.0  # seconds after the first enqueue that repeated enqueues stop delaying a job
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_DELAY: float = 2.0  # seconds, doubled per attempt
+    JOB_LOCK_TIMEOUT: int = 300  # seconds before a running job is presumed dead
+    JOB_RETENTION: int = 86400  # seconds finished jobs are kept
+    
+    # Auto-tagging
+    TAGGING_MAX_TAGS: int = 5  # generated tags per initiative
+    TAGGING_MIN_SCORE: float = 0.2  # minimum normalized TF-IDF weight
+    TAGGING_BATCH_SIZE: int = 1000  # initiatives per write transaction
+    
+    # Semantic search (in-process vector index)
+    VECTOR_INDEX_BACKEND: str = "hnsw"  # "hnsw" (approximate graph search) or "exact" (brute force)
+    VECTOR_INDEX_PATH: str = "./vector_index.npz"  # snapshot loaded at start-up
+    VECTOR_INDEX_SAVE_INTERVAL: float = 600.0  # seconds between snapshots
+    VECTOR_INDEX_SYNC_INTERVAL: float = 1.0  # seconds between background store syncs and graph linking (0 disables the thread)
+    VECTOR_INDEX_MAX_DELETED_RATIO: float = 0.2  # tombstone share that triggers compaction on save
+    HNSW_M: int = 16  # links per node and layer (2 * M on the base layer)
+    HNSW_EF_CONSTRUCTION: int = 100  # candidate list size while inserting
+    HNSW_EF_SEARCH: int = 64  # candidate list size while searching; raise for recall
+    VECTOR_QUANTIZATION: str = "int8"  # "int8", "float16" or "none": precision semantic search scores candidates in
+    VECTOR_RERANK_FACTOR: int = 4  # quantized candidates re-scored in full precision per requested result
+    VECTOR_FILTER_EXACT_ROWS: int = 20000  # filtered searches matching at most this many rows scan them exactly
+    VECTOR_FILTER_EXACT_RATIO: float = 0.05  # ... or at most this share of the live rows
+    SEARCH_HYBRID_FUSION: str = "rrf"  # "rrf" (reciprocal rank fusion) or "weighted" (normalized scores)
+    SEARCH_HYBRID_SEMANTIC_WEIGHT: float = 0.5  # share of the fused score from the semantic list
+    SEARCH_HYBRID_RRF_K: int = 60  # rank offset; larger flattens the advantage of top ranks
+    SEARCH_HYBRID_CANDIDATES: int = 100  # hits taken from each retriever before fusion
+    SEARCH_FIELD_BOOSTS: Dict[str, float] = {"title": 3.0, "tags": 2.0, "skills_needed": 2.0, "practice_area": 1.5, "industries": 1.0, "description": 1.0}  # lexical weight of a query term found in each field
+    
+    # Near-duplicate detection (MinHash LSH)
+    DEDUP_NUM_PERM: int = 128  # signature length; changing it requires a rebuild
+    DEDUP_BANDS: int = 16  # LSH bands; must divide DEDUP_NUM_PERM
+    DEDUP_SHINGLE_SIZE: int = 3  # words per shingle
+    DEDUP_THRESHOLD: float = 0.7  # estimated Jaccard similarity reported as a duplicate
+    
+    # Similar initiatives (precomputed neighbors)
+    SIMILAR_TOP_K: int = 20  # neighbors stored per initiative
+    SIMILAR_TEXT_WEIGHT: float = 0.6  # embedding cosine vs. skill/tag/industry overlap
+    SIMILAR_ATTR_DIM: int = 256  # hashed attribute vector size
+    SIMILAR_REVERSE_FANOUT: int = 100  # nearest initiatives re-ranked after an incremental update
+    SIMILAR_BLOCK_SIZE: int = 512  # rows per matrix block in a full rebuild
+    
+    # Trending initiatives
+    TRENDING_ENABLED: bool = True
+    TRENDING_HALF_LIFE_HOURS: float = 24.0  # an event loses half its weight after this long
+    TRENDING_FLUSH_INTERVAL: float = 10.0  # seconds between persisting buffered scores
+    TRENDING_BUFFER_SIZE: int = 10000  # initiatives buffered per worker between flushes
+    TRENDING_MAX_ROWS: int = 5000  # persisted scores kept (top rows)
+    
+    # Recommendations
+    RECOMMENDATION_DEADLINE_MS: int = 1500  # default time budget for personalized scoring
+    RECOMMENDATION_MAX_DEADLINE_MS: int = 10000  # upper bound for the deadline_ms parameter
+    RECOMMENDATION_FALLBACK_SIZE: int = 50  # popular initiatives precomputed per practice
+    RECOMMENDATION_FALLBACK_REFRESH: float = 300.0  # seconds between popularity refreshes
+    
+    # Bulk import / export
+    IMPORT_BATCH_SIZE: int = 500  # rows validated and inserted per transaction
+    EXPORT_YIELD_PER: int = 1000  # rows fetched per server-side cursor round trip
+    
+    # Deletion
+    PURGE_BATCH_SIZE: int = 1000  # dependent rows deleted per transaction by the purge jobs
+    
+    # Engagement analytics rollups
+    ANALYTICS_ROLLUP_INTERVAL: float = 60.0  # seconds between incremental rollup runs
+    ANALYTICS_LAG_SECONDS: float = 30.0  # events younger than this wait for the next run
+    ANALYTICS_RAW_RETENTION_DAYS: int = 30  # raw view rows older than this are compacted away
+    ANALYTICS_HOURLY_RETENTION_DAYS: int = 90  # hourly buckets kept; daily buckets are kept forever
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,9 +1,10 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import Column, DateTime, create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, with_loader_criteria
 from app.core.config import settings
 
 # SQLite-specific configuration
@@ -16,10 +17,38 @@ engine = create_engine(
     connect_args=connect_args
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, connection_record):
+        # SQLite ignores foreign keys (and ON DELETE CASCADE) unless asked per connection
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+class SoftDeleteMixin:
+    """
+    ``deleted_at`` marks a row as deleted until a background purge removes
+    it; ORM queries skip such rows unless run with
+    ``execution_options(include_deleted=True)``.
+    """
+    deleted_at = Column(DateTime, nullable=True, index=True)
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_soft_deleted(execute_state):
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
+
 def get_db():
     """Dependency for database session"""
     db = SessionLocal()
@@ -27,3 +56,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def upsert_insert(db):
+    """Dialect ``insert`` supporting ``on_conflict_do_update``, or None if unsupported"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    return None
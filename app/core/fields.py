@@ -0,0 +1,59 @@
+"""
+Sparse fieldsets for list endpoints (``?fields=id,title,status``)
+
+The requested fields become a ``load_only()`` projection, so unrequested
+columns (long ``description`` / ``bio`` text) are never read from the
+database, and a response model derived from the full one, so only those
+fields are serialized. Derived models are built once per field set.
+"""
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple, Type
+from fastapi import HTTPException, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel],
+                 always: Tuple[str, ...] = ("id",)) -> Optional[Tuple[str, ...]]:
+    """Validated field names in request order (``always`` first), or None for every field"""
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in model.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(model.model_fields)}"
+        )
+    return tuple(dict.fromkeys([*always, *requested]))
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    ``model`` restricted to ``fields``: the other fields become optional and
+    are left out of the output, while the model's validators still apply.
+    """
+    dropped = {
+        name: (Optional[Any], Field(None, exclude=True))
+        for name in model.model_fields if name not in fields
+    }
+    return create_model(f"{model.__name__}Partial", __base__=model, **dropped)
+
+def load_columns(entity, fields: Iterable[str]):
+    """``load_only()`` option for the mapped columns among ``fields`` (primary key always loaded)"""
+    mapper = inspect(entity)
+    columns = {attr.key for attr in mapper.column_attrs}
+    return load_only(*(getattr(entity, name) for name in fields if name in columns))
+
+def project(model: Type[BaseModel], fields: Tuple[str, ...], objects: Iterable[Any]) -> List[dict]:
+    """Serialize only ``fields`` of each object (JSON-compatible dicts)"""
+    partial = partial_model(model, fields)
+    return [
+        partial.model_validate({name: getattr(obj, name) for name in fields}).model_dump(mode="json")
+        for obj in objects
+    ]
+
+def projected_response(content: Any, response: Response) -> JSONResponse:
+    """JSON response for projected content, keeping headers already set on ``response``"""
+    return JSONResponse(content=content, headers=dict(response.headers))
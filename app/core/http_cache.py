@@ -0,0 +1,89 @@
+"""
+HTTP conditional request helpers (ETag / Last-Modified / Cache-Control)
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response, status
+from app.core.config import settings
+
+def make_etag(*parts) -> str:
+    """Build a weak ETag from the given version parts"""
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+def format_http_date(value: Optional[datetime]) -> Optional[str]:
+    """Format a naive UTC datetime as an HTTP date"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against the current validators.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted
+    when the client did not send an entity tag (RFC 9110 section 13.2.2).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _strip_weak(etag)
+        return any(_strip_weak(tag) == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        since = _parse_http_date(if_modified_since)
+        if since is None:
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates only carry whole seconds
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+def cache_headers(etag: str, last_modified: Optional[datetime], cache_control: str, vary: Optional[str] = None) -> dict:
+    """Build the validator and caching headers for a response"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    http_date = format_http_date(last_modified)
+    if http_date:
+        headers["Last-Modified"] = http_date
+    if vary:
+        headers["Vary"] = vary
+    return headers
+
+def apply_cache_headers(response: Response, etag: str, last_modified: Optional[datetime], cache_control: str, vary: Optional[str] = None) -> None:
+    """Set validator and caching headers on an outgoing response"""
+    response.headers.update(cache_headers(etag, last_modified, cache_control, vary))
+
+def not_modified(etag: str, last_modified: Optional[datetime], cache_control: str, vary: Optional[str] = None) -> Response:
+    """Empty 304 response carrying the same validators as a 200 would"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=cache_headers(etag, last_modified, cache_control, vary)
+    )
+
+def public_cache_control() -> str:
+    """Cache-Control for unauthenticated listings a shared proxy may store"""
+    return f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate"
+
+PRIVATE_CACHE_CONTROL = "private, no-cache"
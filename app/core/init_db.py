@@ -6,6 +6,7 @@ from app.core.database import engine, Base, SessionLocal
 from app.core.security import get_password_hash
 from app.models.user import User, UserRole
 from app.models.initiative import Initiative, InitiativeStatus, InitiativeDuration
+from app.services import dashboard
 
 def init_db():
     """Initialize database with tables"""
@@ -139,6 +140,7 @@ def seed_sample_data():
         
         db.add_all([initiative1, initiative2, initiative3, initiative4])
         db.commit()
+        dashboard.rebuild(db)
         
         print("✓ Sample data seeded successfully!")
         print(f"  - Created {db.query(User).count()} users")
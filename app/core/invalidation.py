@@ -0,0 +1,114 @@
+"""
+Cross-worker cache invalidation channel
+
+Each worker keeps its own in-process cache, so an invalidation made by one
+worker has to reach its siblings. Invalidations are appended to the
+``cache_invalidations`` table and every worker tails that table from a
+background thread. No external broker is required.
+
+On SQLite the poll first checks ``PRAGMA data_version``, which only changes
+when another connection commits, so an idle database costs one pragma per
+interval and no table reads. Other databases poll the table by primary key.
+"""
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+from sqlalchemy import delete, func, insert, select
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import engine
+from app.models.system import CacheInvalidation
+
+logger = logging.getLogger(__name__)
+
+# Published rows are kept long enough for a slow worker to catch up
+RETENTION = timedelta(minutes=10)
+PRUNE_EVERY = 200
+
+class InvalidationChannel:
+    """Publishes local tag invalidations and replays those of other workers"""
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.origin = None
+        self.subscribers: List[Callable[[List[str]], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._published = 0
+        self.received = 0
+
+    def subscribe(self, callback: Callable[[List[str]], None]) -> None:
+        """Call ``callback(tags)`` for invalidations made by other workers"""
+        self.subscribers.append(callback)
+
+    def publish(self, tags: List[str]) -> None:
+        with engine.begin() as conn:
+            conn.execute(insert(CacheInvalidation).values(
+                origin=self.origin, tags=json.dumps(tags), created_at=datetime.utcnow()
+            ))
+            self._published += 1
+            if self._published % PRUNE_EVERY == 0:
+                conn.execute(delete(CacheInvalidation).where(
+                    CacheInvalidation.created_at < datetime.utcnow() - RETENTION
+                ))
+
+    def _deliver(self, tags: List[str]) -> None:
+        self.received += 1
+        cache.invalidate_tags(*tags, propagate=False)
+        for callback in self.subscribers:
+            try:
+                callback(tags)
+            except Exception:
+                logger.exception("invalidation subscriber failed")
+
+    def _run(self) -> None:
+        is_sqlite = engine.dialect.name == "sqlite"
+        with engine.connect() as conn:
+            last_id = conn.execute(select(func.coalesce(func.max(CacheInvalidation.id), 0))).scalar()
+            data_version = None
+            conn.rollback()
+            while not self._stop.wait(self.interval):
+                try:
+                    if is_sqlite:
+                        current = conn.exec_driver_sql("PRAGMA data_version").scalar()
+                        if current == data_version:
+                            conn.rollback()
+                            continue
+                        data_version = current
+                    rows = conn.execute(
+                        select(CacheInvalidation.id, CacheInvalidation.origin, CacheInvalidation.tags)
+                        .where(CacheInvalidation.id > last_id)
+                        .order_by(CacheInvalidation.id)
+                    ).all()
+                    conn.rollback()
+                except Exception:
+                    logger.exception("invalidation poll failed")
+                    conn.rollback()
+                    continue
+                for row in rows:
+                    last_id = row.id
+                    if row.origin != self.origin:
+                        self._deliver(json.loads(row.tags))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        # Assigned here, not at import, so forked workers get distinct origins
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        cache.add_publisher(self.publish)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        cache.remove_publisher(self.publish)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 4)
+        self._thread = None
+
+channel = InvalidationChannel(interval=settings.CACHE_SYNC_INTERVAL)
@@ -0,0 +1,418 @@
+"""
+Durable background job queue
+
+Jobs live in the ``jobs`` table, so they survive restarts and are shared by
+every worker process. Endpoints only ``enqueue`` (inside their own
+transaction); a pool of runner threads claims and executes them.
+
+* **De-duplication / coalescing** - a partial unique index allows a single
+  *pending* job per ``(job_type, entity_id)``. Enqueuing again upserts into
+  that row: the payload is replaced and ``run_at`` is pushed back by the
+  coalesce delay, so a burst of edits produces one execution. The push-back
+  stops ``JOB_COALESCE_MAX_WAIT`` seconds after the first enqueue, so an
+  entity that is edited continuously is still processed.
+* **Retries** - failures are retried with exponential backoff and jitter
+  until ``max_attempts`` is reached.
+* **Crash safety** - jobs left ``running`` by a dead worker are returned to
+  the queue after ``JOB_LOCK_TIMEOUT`` seconds (or dropped when a newer
+  pending job for the same entity supersedes them).
+* **Retention** - finished jobs are deleted ``JOB_RETENTION`` seconds after
+  they finish.
+
+Handlers are registered with ``@job_handler("type")`` and receive
+``(db, entity_id, payload)``. Passing ``every=<seconds>`` makes the type
+periodic: the runner queues it on start-up and re-queues it after each run,
+and the pending-job uniqueness keeps one schedule across all workers.
+"""
+import importlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import traceback
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Sequence
+from sqlalchemy import and_, case, delete, exists, func, select, update
+from sqlalchemy.orm import Session, aliased
+from app.core.config import settings
+from app.core.database import SessionLocal, upsert_insert
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Modules whose import registers job handlers
+HANDLER_MODULES = [
+    "app.services.embeddings",
+    "app.services.tagging",
+    "app.services.similar",
+    "app.services.analytics",
+    "app.services.purge",
+    "app.services.recommendations",
+    "app.services.vector_index",
+]
+
+_handlers: Dict[str, Callable] = {}
+_periodic: Dict[str, float] = {}
+
+# entity_id of periodic jobs, so the pending-job unique index applies to them
+PERIODIC_ENTITY = 0
+
+def job_handler(job_type: str, every: Optional[float] = None):
+    """Register ``func(db, entity_id, payload)`` as the handler for a job type"""
+    def decorator(func):
+        _handlers[job_type] = func
+        if every:
+            _periodic[job_type] = every
+        return func
+    return decorator
+
+def load_handlers() -> None:
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+def enqueue(
+    db: Session,
+    job_type: str,
+    entity_id: Optional[int] = None,
+    payload: Optional[dict] = None,
+    delay: Optional[float] = None,
+    max_attempts: Optional[int] = None,
+) -> None:
+    """
+    Queue a job as part of the caller's transaction (committed with it).
+
+    ``delay`` defaults to ``JOB_COALESCE_DELAY`` for entity jobs, which is
+    the debounce window during which further enqueues are merged.
+    """
+    if entity_id is None:
+        db.add(Job(**_job_values(job_type, None, payload, delay or 0, max_attempts)))
+        return
+    enqueue_many(db, job_type, [entity_id], payload, delay, max_attempts)
+
+def enqueue_many(
+    db: Session,
+    job_type: str,
+    entity_ids: Sequence[int],
+    payload: Optional[dict] = None,
+    delay: Optional[float] = None,
+    max_attempts: Optional[int] = None,
+) -> None:
+    """Queue one entity job per id with a single executemany upsert"""
+    if not entity_ids:
+        return
+    if delay is None:
+        delay = settings.JOB_COALESCE_DELAY
+    rows = [_job_values(job_type, entity_id, payload, delay, max_attempts) for entity_id in dict.fromkeys(entity_ids)]
+
+    insert = upsert_insert(db)
+    if insert is None:
+        db.add_all(Job(**values) for values in rows)
+        return
+
+    # Push the pending run back by ``delay``, but never past first enqueue + max wait
+    latest_push = rows[0]["created_at"] - timedelta(seconds=max(settings.JOB_COALESCE_MAX_WAIT - delay, 0))
+    stmt = insert(Job)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Job.job_type, Job.entity_id],
+        index_where=(Job.status == JobStatus.PENDING.name),
+        set_={
+            "payload": stmt.excluded.payload,
+            "run_at": case(
+                (Job.created_at >= latest_push, stmt.excluded.run_at),
+                (stmt.excluded.run_at < Job.run_at, stmt.excluded.run_at),
+                else_=Job.run_at,
+            ),
+            "coalesced": Job.coalesced + 1,
+        },
+    )
+    db.execute(stmt, rows)
+
+def _job_values(job_type: str, entity_id: Optional[int], payload: Optional[dict],
+                delay: float, max_attempts: Optional[int]) -> dict:
+    now = datetime.utcnow()
+    return {
+        "job_type": job_type,
+        "entity_id": entity_id,
+        "payload": json.dumps(payload) if payload is not None else None,
+        "status": JobStatus.PENDING,
+        "run_at": now + timedelta(seconds=delay),
+        "attempts": 0,
+        "max_attempts": max_attempts or settings.JOB_MAX_ATTEMPTS,
+        "coalesced": 0,
+        "created_at": now,
+    }
+
+def _percentile(ordered, q: float) -> float:
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+class JobRunner:
+    """Thread pool that claims and executes due jobs"""
+
+    def __init__(self, workers: int, poll_interval: float):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.name = f"{os.getpid()}"
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._latency = defaultdict(lambda: deque(maxlen=1000))  # type -> (wait_ms, run_ms)
+        self._outcomes = defaultdict(Counter)
+
+    # -- claiming ---------------------------------------------------------
+
+    def _claim(self, db: Session, worker: str) -> Optional[Job]:
+        now = datetime.utcnow()
+        running = aliased(Job)
+        candidates = db.execute(
+            select(Job.id)
+            .where(Job.status == JobStatus.PENDING, Job.run_at <= now)
+            # Never run two jobs for the same entity at once
+            .where(~exists().where(
+                running.status == JobStatus.RUNNING,
+                running.job_type == Job.job_type,
+                running.entity_id == Job.entity_id,
+            ))
+            .order_by(Job.run_at)
+            .limit(5)
+        ).scalars().all()
+        for job_id in candidates:
+            claimed = db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JobStatus.PENDING)
+                .values(
+                    status=JobStatus.RUNNING, locked_by=worker, locked_at=now,
+                    started_at=now, attempts=Job.attempts + 1
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            if claimed:
+                return db.get(Job, job_id)
+        db.rollback()
+        return None
+
+    def _reap(self, db: Session) -> None:
+        """Requeue jobs of dead workers and delete finished jobs past retention"""
+        now = datetime.utcnow()
+        stale = and_(Job.status == JobStatus.RUNNING, Job.locked_at < now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT))
+        pending = aliased(Job)
+        # A newer pending job for the entity will do the same work (and holds its unique slot)
+        superseded = db.execute(
+            update(Job)
+            .where(stale, exists().where(
+                pending.status == JobStatus.PENDING,
+                pending.job_type == Job.job_type,
+                pending.entity_id == Job.entity_id,
+            ))
+            .values(status=JobStatus.FAILED, finished_at=now, locked_by=None, locked_at=None,
+                    last_error="worker died; superseded by a pending job")
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        requeued = db.execute(
+            update(Job)
+            .where(stale)
+            .values(status=JobStatus.PENDING, locked_by=None, locked_at=None, run_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        expired = db.execute(
+            delete(Job)
+            .where(Job.status.in_([JobStatus.SUCCEEDED, JobStatus.FAILED]),
+                   Job.finished_at < now - timedelta(seconds=settings.JOB_RETENTION))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        if superseded or requeued:
+            logger.warning("requeued %d stale running jobs, dropped %d superseded", requeued, superseded)
+        if expired:
+            logger.info("deleted %d finished jobs", expired)
+
+    # -- execution --------------------------------------------------------
+
+    def _execute(self, db: Session, job: Job) -> None:
+        job_id, job_type = job.id, job.job_type
+        handler = _handlers.get(job_type)
+        started = time.perf_counter()
+        wait_ms = (job.started_at - job.created_at).total_seconds() * 1000 if job.created_at else 0.0
+        try:
+            if handler is None:
+                raise LookupError(f"no handler registered for job type {job_type!r}")
+            payload = json.loads(job.payload) if job.payload else {}
+            handler(db, job.entity_id, payload)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            self._fail(db, job, exc)
+            return
+        finally:
+            run_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._latency[job_type].append((wait_ms, run_ms))
+
+        db.execute(
+            update(Job).where(Job.id == job_id)
+            .values(status=JobStatus.SUCCEEDED, finished_at=datetime.utcnow(), locked_by=None, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        with self._lock:
+            self._outcomes[job_type]["succeeded"] += 1
+        self._reschedule(db, job_type)
+
+    def _reschedule(self, db: Session, job_type: str) -> None:
+        every = _periodic.get(job_type)
+        if every is None:
+            return
+        try:
+            enqueue(db, job_type, PERIODIC_ENTITY, delay=every)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("could not reschedule periodic job %s", job_type)
+
+    def _fail(self, db: Session, job: Job, exc: Exception) -> None:
+        error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+        job_id, job_type, attempts, max_attempts = job.id, job.job_type, job.attempts, job.max_attempts
+        if attempts < max_attempts:
+            backoff = settings.JOB_RETRY_BASE_DELAY * (2 ** (attempts - 1))
+            backoff *= random.uniform(0.8, 1.2)
+            values = dict(status=JobStatus.PENDING, run_at=datetime.utcnow() + timedelta(seconds=backoff))
+            outcome = "retried"
+            logger.warning("job %s (%s) failed, retry %d/%d in %.1fs: %s",
+                           job_id, job_type, attempts, max_attempts, backoff, error)
+        else:
+            values = dict(status=JobStatus.FAILED, finished_at=datetime.utcnow())
+            outcome = "failed"
+            logger.error("job %s (%s) failed permanently: %s", job_id, job_type, error)
+        try:
+            db.execute(
+                update(Job).where(Job.id == job_id)
+                .values(locked_by=None, locked_at=None, last_error=error, **values)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception:
+            # A newer pending job for the same entity already exists; this
+            # retry is redundant because that job will do the same work
+            db.rollback()
+            db.execute(
+                update(Job).where(Job.id == job_id)
+                .values(status=JobStatus.FAILED, finished_at=datetime.utcnow(), locked_by=None, last_error=error)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        with self._lock:
+            self._outcomes[job_type][outcome] += 1
+        if outcome == "failed":
+            self._reschedule(db, job_type)
+
+    def _loop(self, worker: str) -> None:
+        last_reap = 0.0
+        while not self._stop.is_set():
+            db = SessionLocal()
+            try:
+                if time.monotonic() - last_reap > settings.JOB_LOCK_TIMEOUT / 2:
+                    try:
+                        self._reap(db)
+                    except Exception:
+                        db.rollback()
+                        logger.exception("could not reap jobs")
+                    finally:
+                        last_reap = time.monotonic()
+                job = self._claim(db, worker)
+                if job is not None:
+                    self._execute(db, job)
+                    continue
+            except Exception:
+                logger.exception("job runner iteration failed")
+            finally:
+                db.close()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    # -- lifecycle --------------------------------------------------------
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        load_handlers()
+        self._schedule_periodic()
+        self.name = f"{os.getpid()}"
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._loop, args=(f"{self.name}-{index}",), name=f"job-runner-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _schedule_periodic(self) -> None:
+        if not _periodic:
+            return
+        db = SessionLocal()
+        try:
+            for job_type in _periodic:
+                enqueue(db, job_type, PERIODIC_ENTITY, delay=0)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("could not schedule periodic jobs")
+        finally:
+            db.close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    # -- metrics ----------------------------------------------------------
+
+    def latency_stats(self) -> dict:
+        with self._lock:
+            snapshot = {t: list(samples) for t, samples in self._latency.items()}
+            outcomes = {t: dict(c) for t, c in self._outcomes.items()}
+        stats = {}
+        for job_type in set(snapshot) | set(outcomes):
+            samples = snapshot.get(job_type, [])
+            entry = dict(outcomes.get(job_type, {}))
+            if samples:
+                waits = sorted(s[0] for s in samples)
+                runs = sorted(s[1] for s in samples)
+                entry.update({
+                    "samples": len(samples),
+                    "wait_ms_p50": _percentile(waits, 0.50),
+                    "wait_ms_p95": _percentile(waits, 0.95),
+                    "run_ms_p50": _percentile(runs, 0.50),
+                    "run_ms_p95": _percentile(runs, 0.95),
+                })
+            stats[job_type] = entry
+        return stats
+
+runner = JobRunner(workers=settings.JOB_WORKERS, poll_interval=settings.JOB_POLL_INTERVAL)
+
+def queue_stats(db: Session) -> dict:
+    """Queue depth by type and status plus this process's latency figures"""
+    now = datetime.utcnow()
+    depth = defaultdict(dict)
+    for job_type, job_status, count in db.execute(
+        select(Job.job_type, Job.status, func.count(Job.id)).group_by(Job.job_type, Job.status)
+    ).all():
+        depth[job_type][job_status.value] = count
+    due = db.execute(
+        select(func.count(Job.id)).where(Job.status == JobStatus.PENDING, Job.run_at <= now)
+    ).scalar()
+    oldest = db.execute(
+        select(func.min(Job.created_at)).where(Job.status == JobStatus.PENDING)
+    ).scalar()
+    return {
+        "depth": dict(depth),
+        "due": due,
+        "oldest_pending_age_s": round((now - oldest).total_seconds(), 1) if oldest else None,
+        "latency": runner.latency_stats(),
+        "runner_threads": len(runner._threads),
+    }
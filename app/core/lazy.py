@@ -0,0 +1,37 @@
+"""
+Deferred imports for heavy optional dependencies
+
+sentence-transformers (torch), qdrant-client and msal together add seconds
+to interpreter start-up. Modules that need them hold a ``LazyModule``
+handle instead, so the import cost is paid on first use rather than when
+the application boots.
+"""
+import importlib
+import types
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a handle to ``name`` that is imported on first attribute access"""
+    return LazyModule(name)
+
+# Dependencies that must never be imported at application start-up
+HEAVY_MODULES = ("sentence_transformers", "torch", "qdrant_client", "msal")
@@ -0,0 +1,56 @@
+"""
+Keyset (cursor) pagination helpers
+
+A page is ordered by ``(timestamp, id)`` and the cursor is the sort key of
+its last row, so the next page is an indexed range scan starting after it:
+no ``OFFSET`` and no ``COUNT`` query, and rows inserted meanwhile neither
+shift nor duplicate entries. Cursors are opaque base64url strings; the next
+one is returned in the ``X-Next-Cursor`` header and is absent on the last page.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def keyset(query, time_column, id_column, cursor: Optional[str], descending: bool = True):
+    """Order ``query`` by ``(time_column, id_column)`` and start after ``cursor``"""
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(or_(time_column < timestamp, and_(time_column == timestamp, id_column < row_id)))
+        else:
+            query = query.filter(or_(time_column > timestamp, and_(time_column == timestamp, id_column > row_id)))
+    if descending:
+        return query.order_by(time_column.desc(), id_column.desc())
+    return query.order_by(time_column, id_column)
+
+def fetch_page(query, limit: int, key, response: Response) -> List[Any]:
+    """
+    Run ``query`` for one page of ``limit`` rows and set the next-page
+    header; ``key(row)`` returns the row's ``(timestamp, id)`` sort key.
+    """
+    rows: Sequence[Any] = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return list(rows)
@@ -0,0 +1,212 @@
+"""
+Single-flight request coalescing
+
+When identical expensive reads arrive together (a listing or search that
+every client refreshes at the top of the hour), only the first caller - the
+leader - runs the computation; callers with the same key that arrive while
+it is in flight wait for it and share its result (or its exception).
+
+Keys are the normalized route and parameters built by ``make_key``, so the
+layer composes with ``@cached``: a cache miss goes through the flight, and
+only the leader computes and stores the value. ``@coalesced`` applies the
+same to reads that are not cached; a finished result can additionally be
+reused for ``SINGLEFLIGHT_WINDOW`` seconds (a micro-cache) by identical
+requests arriving just after it.
+
+Coalescing is per worker process. Waiters give up after
+``SINGLEFLIGHT_TIMEOUT`` seconds and compute the value themselves, so a
+stuck leader cannot hold a queue of requests hostage.
+"""
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+
+# Micro-cached results kept per process
+MAX_RECENT = 1000
+
+_NONE = object()
+
+class _Call:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Per-key in-flight call registry with coalescing counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._recent: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._stats: Dict[str, Counter] = {}
+
+    def _count(self, namespace: str, event: str) -> None:
+        self._stats.setdefault(namespace, Counter())[event] += 1
+
+    def _recent_value(self, full_key: str) -> Any:
+        entry = self._recent.get(full_key)
+        if entry is None:
+            return _NONE
+        if entry[0] < time.monotonic():
+            del self._recent[full_key]
+            return _NONE
+        return entry[1]
+
+    def _remember(self, full_key: str, value: Any, window: float) -> None:
+        self._recent[full_key] = (time.monotonic() + window, value)
+        self._recent.move_to_end(full_key)
+        while len(self._recent) > MAX_RECENT:
+            self._recent.popitem(last=False)
+
+    def do(self, namespace: str, key: str, func: Callable[[], Any], window: float = 0.0) -> Any:
+        """Run ``func`` once for concurrent callers with the same key (threads)"""
+        full_key = f"{namespace}:{key}"
+        with self._lock:
+            value = self._recent_value(full_key) if window else _NONE
+            if value is not _NONE:
+                self._count(namespace, "window_hits")
+                return value
+            call = self._calls.get(full_key)
+            leader = call is None
+            if leader:
+                call = self._calls[full_key] = _Call()
+                self._count(namespace, "executed")
+            else:
+                self._count(namespace, "coalesced")
+
+        if not leader:
+            if not call.event.wait(settings.SINGLEFLIGHT_TIMEOUT):
+                with self._lock:
+                    self._count(namespace, "timeouts")
+                return func()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(full_key, None)
+                if call.error is None and window:
+                    self._remember(full_key, call.value, window)
+                elif call.error is not None:
+                    self._count(namespace, "errors")
+            call.event.set()
+        return call.value
+
+    async def do_async(self, namespace: str, key: str, func: Callable[[], Awaitable[Any]],
+                       window: float = 0.0) -> Any:
+        """Await ``func()`` once for concurrent coroutines with the same key"""
+        full_key = f"{namespace}:{key}"
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            value = self._recent_value(full_key) if window else _NONE
+            if value is not _NONE:
+                self._count(namespace, "window_hits")
+                return value
+            in_flight = self._async_calls.get(full_key)
+            leader = in_flight is None or in_flight[0] is not loop
+            if leader:
+                future = loop.create_future()
+                self._async_calls[full_key] = (loop, future)
+                self._count(namespace, "executed")
+            else:
+                future = in_flight[1]
+                self._count(namespace, "coalesced")
+
+        if not leader:
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), settings.SINGLEFLIGHT_TIMEOUT)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self._count(namespace, "timeouts")
+                return await func()
+
+        try:
+            value = await func()
+        except BaseException as exc:
+            with self._lock:
+                self._async_calls.pop(full_key, None)
+                self._count(namespace, "errors")
+            future.set_exception(exc)
+            # Retrieved here so an exception nobody waited for is not reported
+            future.exception()
+            raise
+        with self._lock:
+            self._async_calls.pop(full_key, None)
+            if window:
+                self._remember(full_key, value, window)
+        future.set_result(value)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            namespaces = {}
+            for namespace, counter in self._stats.items():
+                data = dict(counter)
+                requests = sum(data.get(k, 0) for k in ("executed", "coalesced", "window_hits"))
+                if requests:
+                    data["coalesced_ratio"] = round(
+                        (data.get("coalesced", 0) + data.get("window_hits", 0)) / requests, 4
+                    )
+                namespaces[namespace] = data
+            return {"in_flight": len(self._calls) + len(self._async_calls), "namespaces": namespaces}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+flights = SingleFlight()
+
+def coalesced(namespace: str, window: Optional[float] = None):
+    """
+    Share one execution of a read among concurrent identical calls.
+
+    The key is built like ``@cached`` keys (qualified name plus simple
+    arguments). ``window`` (default ``SINGLEFLIGHT_WINDOW``) keeps a finished
+    result for that many seconds.
+    """
+    from app.core.cache import make_key
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        route = f"{func.__module__}.{func.__qualname__}"
+
+        def _key(args, kwargs) -> str:
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            return make_key(route, dict(bound.arguments))
+
+        def _window() -> float:
+            return settings.SINGLEFLIGHT_WINDOW if window is None else window
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not settings.SINGLEFLIGHT_ENABLED:
+                    return await func(*args, **kwargs)
+                return await flights.do_async(namespace, _key(args, kwargs),
+                                              lambda: func(*args, **kwargs), _window())
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not settings.SINGLEFLIGHT_ENABLED:
+                return func(*args, **kwargs)
+            return flights.do(namespace, _key(args, kwargs), lambda: func(*args, **kwargs), _window())
+        return wrapper
+
+    return decorator
@@ -0,0 +1,52 @@
+"""
+Background cache warm-up and pre-fork preloading
+
+Warmers are plain functions registered with ``@register_warmer``. They run
+in a worker thread once the application has started, so readiness (the
+first successful ``/health``) is never delayed by them.
+
+Preloaders (``@register_preloader``) load large read-only data such as
+vocabularies or vector matrices. The multi-worker launcher runs them once
+in the master process before forking, so workers share those pages
+copy-on-write instead of each loading a private copy.
+"""
+import logging
+import time
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+_warmers: List[Callable[[], None]] = []
+_preloaders: List[Callable[[], None]] = []
+
+def register_warmer(func: Callable[[], None]) -> Callable[[], None]:
+    """Register a function to run during background warm-up"""
+    _warmers.append(func)
+    return func
+
+def register_preloader(func: Callable[[], None]) -> Callable[[], None]:
+    """Register a function that loads shared read-only data before forking"""
+    _preloaders.append(func)
+    return func
+
+def _run_all(funcs: List[Callable[[], None]], label: str) -> dict:
+    timings = {}
+    for func in funcs:
+        name = f"{func.__module__}.{func.__qualname__}"
+        started = time.perf_counter()
+        try:
+            func()
+        except Exception:
+            logger.exception("%s %s failed", label, name)
+            continue
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    logger.info("%s finished: %s", label, timings)
+    return timings
+
+def run_warmers() -> dict:
+    """Run every registered warmer, isolating failures; returns timings in ms"""
+    return _run_all(_warmers, "cache warm-up")
+
+def run_preloaders() -> dict:
+    """Run every registered preloader, isolating failures; returns timings in ms"""
+    return _run_all(_preloaders, "preload")
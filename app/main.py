@@ -1,19 +1,20 @@
 """
 Main FastAPI application entry point for Deloitte Initiative Discovery Platform
 """
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.admission import AdmissionControlMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
 
-app = FastAPI(
-    title=settings.APP_NAME,
-    version=settings.APP_VERSION,
-    description="""
+DESCRIPTION = """
     ## Deloitte Initiative Discovery Platform API
-    
+
     A unified platform for Deloitte analysts to discover and engage with firm initiatives.
-    
+
     ### Features:
     * **Authentication**: Azure AD B2C SSO integration
     * **User Profiles**: Manage analyst and leader profiles
@@ -21,45 +22,135 @@ app = FastAPI(
     * **Discovery Tools**: Search, filter, and browse initiatives
     * **AI Recommendations**: Personalized initiative matching
     * **Engagement**: Save, bookmark, and track initiatives
-    
+
     ### User Roles:
     * **Analyst**: Browse, search, and receive recommendations
     * **Leader**: Create and manage initiatives
-    """,
-    openapi_tags=[
-        {"name": "Authentication", "description": "User authentication and authorization"},
-        {"name": "Users", "description": "User profile management"},
-        {"name": "Initiatives", "description": "Initiative CRUD operations"},
-        {"name": "Search", "description": "Search and filtering capabilities"},
-        {"name": "Recommendations", "description": "AI-powered personalized recommendations"},
-        {"name": "Engagement", "description": "User engagement tracking"},
-    ]
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include API router
-app.include_router(api_router, prefix="/api/v1")
-
-@app.get("/", tags=["Root"])
-async def root():
-    """Root endpoint - API health check"""
-    return {
-        "message": "Deloitte Initiative Discovery Platform API",
-        "version": settings.APP_VERSION,
-        "status": "running",
-        "docs": "/docs",
-        "redoc": "/redoc"
-    }
-
-@app.get("/health", tags=["Root"])
-async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy"}
+    """
+
+OPENAPI_TAGS = [
+    {"name": "Authentication", "description": "User authentication and authorization"},
+    {"name": "Users", "description": "User profile management"},
+    {"name": "Initiatives", "description": "Initiative CRUD operations"},
+    {"name": "Search", "description": "Search and filtering capabilities"},
+    {"name": "Recommendations", "description": "AI-powered personalized recommendations"},
+    {"name": "Engagement", "description": "User engagement tracking"},
+    {"name": "Analytics", "description": "Engagement time series for initiative owners"},
+    {"name": "Admin", "description": "Operational and administrative endpoints"},
+]
+
+async def _warm_caches_later(delay: float) -> None:
+    """Run cache warmers off the event loop once the server is serving"""
+    from app.core.warmup import run_warmers
+
+    # uvicorn binds its socket right after lifespan start-up returns
+    await asyncio.sleep(delay)
+    await asyncio.get_running_loop().run_in_executor(None, run_warmers)
+
+def _build_lifespan(production: bool):
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if not production:
+            # Development convenience: create tables and sample data on boot.
+            # Production deployments manage the schema out of band.
+            from app.core.init_db import init_db, seed_sample_data
+            init_db()
+            seed_sample_data()
+
+        channel = None
+        if settings.CACHE_SYNC_ENABLED:
+            # Keep this worker's in-process caches coherent with its siblings
+            from app.core.invalidation import channel
+            channel.start()
+
+        runner = None
+        if settings.JOB_WORKERS > 0:
+            from app.core.jobs import runner
+            runner.start()
+
+        tracker = None
+        if settings.TRENDING_ENABLED:
+            from app.services.trending import tracker
+            tracker.start()
+
+        semantic = None
+        if settings.VECTOR_INDEX_SYNC_INTERVAL > 0:
+            # Follow new and edited embeddings from the first request on
+            from app.services.vector_index import semantic
+            semantic.start()
+
+        warmup = None
+        if settings.WARM_CACHES_ON_STARTUP:
+            warmup = asyncio.create_task(_warm_caches_later(settings.WARMUP_DELAY_SECONDS))
+
+        yield
+
+        if warmup is not None and not warmup.done():
+            warmup.cancel()
+        if semantic is not None:
+            semantic.stop()
+        if tracker is not None:
+            tracker.stop()
+        if runner is not None:
+            runner.stop()
+        if channel is not None:
+            channel.stop()
+
+    return lifespan
+
+def create_app(production: Optional[bool] = None) -> FastAPI:
+    """
+    Application factory.
+
+    ``production`` defaults to ``settings.PRODUCTION``. Production mode skips
+    DDL and sample-data seeding at start-up; heavy ML/Azure dependencies are
+    never imported here in either mode (see ``app.core.lazy``).
+
+    Run with ``uvicorn --factory app.main:create_app``.
+    """
+    if production is None:
+        production = settings.PRODUCTION
+
+    application = FastAPI(
+        title=settings.APP_NAME,
+        version=settings.APP_VERSION,
+        description=DESCRIPTION,
+        openapi_tags=OPENAPI_TAGS,
+        lifespan=_build_lifespan(production)
+    )
+    application.state.production = production
+
+    # Admission control; added first so CORS headers also wrap 503 responses
+    application.add_middleware(AdmissionControlMiddleware)
+
+    # CORS middleware
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Configure appropriately for production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Include API router
+    application.include_router(api_router, prefix="/api/v1")
+
+    @application.get("/", tags=["Root"])
+    async def root():
+        """Root endpoint - API health check"""
+        return {
+            "message": "Deloitte Initiative Discovery Platform API",
+            "version": settings.APP_VERSION,
+            "status": "running",
+            "docs": "/docs",
+            "redoc": "/redoc"
+        }
+
+    @application.get("/health", tags=["Root"])
+    async def health_check():
+        """Health check endpoint"""
+        return {"status": "healthy"}
+
+    return application
+
+app = create_app()
@@ -4,5 +4,19 @@ Database models
 from app.models.user import User
 from app.models.initiative import Initiative
 from app.models.engagement import SavedInitiative, InitiativeApplication, InitiativeView
+from app.models.system import CacheInvalidation, SystemState
+from app.models.job import Job, JobStatus
+from app.models.embedding import InitiativeEmbedding
+from app.models.tagging import TagTerm, InitiativeAutoTags
+from app.models.similarity import InitiativeMinHash, InitiativeNeighbor
+from app.models.trending import TrendingScore
+from app.models.analytics import EngagementHourly, EngagementDaily
+from app.models.dashboard import InitiativeSummary
+from app.models.recommendation import PopularInitiative
 
-__all__ = ["User", "Initiative", "SavedInitiative", "InitiativeApplication", "InitiativeView"]
+__all__ = [
+    "User", "Initiative", "SavedInitiative", "InitiativeApplication", "InitiativeView",
+    "CacheInvalidation", "SystemState", "Job", "JobStatus", "InitiativeEmbedding",
+    "TagTerm", "InitiativeAutoTags", "InitiativeMinHash", "InitiativeNeighbor", "TrendingScore",
+    "EngagementHourly", "EngagementDaily", "InitiativeSummary", "PopularInitiative"
+]
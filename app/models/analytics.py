@@ -0,0 +1,28 @@
+"""
+Engagement rollup models
+"""
+from sqlalchemy import Column, Integer, DateTime
+from app.core.database import Base
+
+class EngagementHourly(Base):
+    """
+    Views, saves and applications per initiative and UTC hour. Rollups are
+    history, so they have no foreign key and outlive compacted raw rows.
+    """
+    __tablename__ = "engagement_hourly"
+    
+    initiative_id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True, index=True)
+    views = Column(Integer, default=0, nullable=False)
+    saves = Column(Integer, default=0, nullable=False)
+    applications = Column(Integer, default=0, nullable=False)
+
+class EngagementDaily(Base):
+    """Views, saves and applications per initiative and UTC day"""
+    __tablename__ = "engagement_daily"
+    
+    initiative_id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True, index=True)
+    views = Column(Integer, default=0, nullable=False)
+    saves = Column(Integer, default=0, nullable=False)
+    applications = Column(Integer, default=0, nullable=False)
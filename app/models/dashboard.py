@@ -0,0 +1,27 @@
+"""
+Leader dashboard summary model
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum
+from datetime import datetime
+from app.core.database import Base
+from app.models.initiative import InitiativeStatus
+
+class InitiativeSummary(Base):
+    """
+    Engagement counters of one initiative, kept in step with the engagement
+    write paths so an owner's dashboard is a single read on ``owner_id``.
+    """
+    __tablename__ = "initiative_summaries"
+    
+    initiative_id = Column(Integer, ForeignKey("initiatives.id", ondelete="CASCADE"), primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    title = Column(String, nullable=False)
+    status = Column(SQLEnum(InitiativeStatus), nullable=False)
+    views = Column(Integer, default=0, nullable=False)
+    saves = Column(Integer, default=0, nullable=False)
+    pending_applications = Column(Integer, default=0, nullable=False)
+    accepted_applications = Column(Integer, default=0, nullable=False)
+    rejected_applications = Column(Integer, default=0, nullable=False)
+    last_activity = Column(String, nullable=True)  # view, save, unsave, application, review
+    last_activity_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,16 @@
+"""
+Vector embedding models
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
+from datetime import datetime
+from app.core.database import Base
+
+class InitiativeEmbedding(Base):
+    __tablename__ = "initiative_embeddings"
+    
+    initiative_id = Column(Integer, ForeignKey("initiatives.id", ondelete="CASCADE"), primary_key=True)
+    model = Column(String, nullable=False)  # embedding model that produced the vector
+    dim = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # little-endian float32, L2-normalized
+    content_hash = Column(String, nullable=False)  # hash of the embedded text, skips no-op re-embeds
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
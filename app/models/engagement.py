@@ -1,7 +1,7 @@
 """
 User engagement models
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -10,22 +10,26 @@ class SavedInitiative(Base):
     __tablename__ = "saved_initiatives"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    initiative_id = Column(Integer, ForeignKey("initiatives.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    initiative_id = Column(Integer, ForeignKey("initiatives.id", ondelete="CASCADE"), nullable=False)
     saved_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="saved_initiatives")
     initiative = relationship("Initiative", back_populates="saved_by")
     
-    __table_args__ = (UniqueConstraint('user_id', 'initiative_id', name='unique_user_saved_initiative'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'initiative_id', name='unique_user_saved_initiative'),
+        # Cursor pagination of a user's saves, newest first
+        Index('ix_saved_initiatives_user_saved', 'user_id', 'saved_at', 'id'),
+    )
 
 class InitiativeApplication(Base):
     __tablename__ = "initiative_applications"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    initiative_id = Column(Integer, ForeignKey("initiatives.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    initiative_id = Column(Integer, ForeignKey("initiatives.id", ondelete="CASCADE"), nullable=False)
     message = Column(Text, nullable=True)
     applied_at = Column(DateTime, default=datetime.utcnow)
     status = Column(String, default="pending")  # pending, accepted, rejected
@@ -34,15 +38,21 @@ class InitiativeApplication(Base):
     user = relationship("User", back_populates="applications")
     initiative = relationship("Initiative", back_populates="applications")
     
-    __table_args__ = (UniqueConstraint('user_id', 'initiative_id', name='unique_user_initiative_application'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'initiative_id', name='unique_user_initiative_application'),
+        # Owner listings filtered by status, oldest first
+        Index('ix_initiative_applications_review', 'initiative_id', 'status', 'applied_at'),
+        # Cursor pagination of a user's applications, newest first
+        Index('ix_initiative_applications_user_applied', 'user_id', 'applied_at', 'id'),
+    )
 
 class InitiativeView(Base):
     __tablename__ = "initiative_views"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    initiative_id = Column(Integer, ForeignKey("initiatives.id"), nullable=False)
-    viewed_at = Column(DateTime, default=datetime.utcnow)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    initiative_id = Column(Integer, ForeignKey("initiatives.id", ondelete="CASCADE"), nullable=False)
+    viewed_at = Column(DateTime, default=datetime.utcnow, index=True)
     
     # Relationships
     user = relationship("User", back_populates="views")
@@ -1,12 +1,12 @@
 """
 Initiative model
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 import json
-from app.core.database import Base
+from app.core.database import Base, SoftDeleteMixin
 
 class InitiativeStatus(str, enum.Enum):
     OPEN = "open"
@@ -19,7 +19,7 @@ class InitiativeDuration(str, enum.Enum):
     ONGOING = "ongoing"
     FIXED_DURATION = "fixed_duration"
 
-class Initiative(Base):
+class Initiative(SoftDeleteMixin, Base):
     __tablename__ = "initiatives"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -72,13 +72,15 @@ class Initiative(Base):
     contact_person = Column(String, nullable=True)
     contact_email = Column(String, nullable=True)
     status = Column(SQLEnum(InitiativeStatus), default=InitiativeStatus.OPEN, nullable=False)
+    capacity = Column(Integer, nullable=True)  # accepted applicants before the initiative is FULL; None = unlimited
     
     # Ownership
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = Column(Integer, default=1, nullable=False)  # bumped on content edits, feeds the ETag
     
     # Analytics
     view_count = Column(Integer, default=0)
@@ -87,6 +89,11 @@ class Initiative(Base):
     
     # Relationships
     owner = relationship("User", back_populates="initiatives")
-    saved_by = relationship("SavedInitiative", back_populates="initiative", cascade="all, delete-orphan")
-    applications = relationship("InitiativeApplication", back_populates="initiative", cascade="all, delete-orphan")
-    views = relationship("InitiativeView", back_populates="initiative", cascade="all, delete-orphan")
+    saved_by = relationship("SavedInitiative", back_populates="initiative", cascade="all, delete-orphan", passive_deletes=True)
+    applications = relationship("InitiativeApplication", back_populates="initiative", cascade="all, delete-orphan", passive_deletes=True)
+    views = relationship("InitiativeView", back_populates="initiative", cascade="all, delete-orphan", passive_deletes=True)
+    
+    __table_args__ = (
+        # Cursor pagination of an owner's initiatives, newest first
+        Index('ix_initiatives_owner_created', 'owner_id', 'created_at', 'id'),
+    )
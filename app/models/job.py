@@ -0,0 +1,48 @@
+"""
+Background job model
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, Enum as SQLEnum
+from datetime import datetime
+import enum
+from app.core.database import Base
+
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=True)  # e.g. initiative id; None for global jobs
+    payload = Column(Text, nullable=True)  # JSON object
+    status = Column(SQLEnum(JobStatus), default=JobStatus.PENDING, nullable=False)
+    
+    # Scheduling & retries
+    run_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=5, nullable=False)
+    coalesced = Column(Integer, default=0, nullable=False)  # enqueues merged into this job
+    last_error = Column(Text, nullable=True)
+    
+    # Claiming
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    
+    # Metadata
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # At most one pending job per (type, entity): the basis for de-duplication
+        Index(
+            "uq_jobs_pending_type_entity", "job_type", "entity_id", unique=True,
+            sqlite_where=(status == JobStatus.PENDING.name),
+            postgresql_where=(status == JobStatus.PENDING.name),
+        ),
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
@@ -0,0 +1,20 @@
+"""
+Recommendation fallback model
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+
+class PopularInitiative(Base):
+    """
+    Precomputed popularity ranking served when personalized recommendations
+    miss their deadline, one row per (practice, rank). ``practice`` is the
+    initiative's practice area, or ``""`` for the firm-wide list.
+    """
+    __tablename__ = "popular_initiatives"
+    
+    practice = Column(String, primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 = most popular
+    initiative_id = Column(Integer, ForeignKey("initiatives.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,24 @@
+"""
+Initiative similarity models
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, LargeBinary
+from datetime import datetime
+from app.core.database import Base
+
+class InitiativeMinHash(Base):
+    """MinHash signature of an initiative's title and description"""
+    __tablename__ = "initiative_minhash"
+    
+    initiative_id = Column(Integer, ForeignKey("initiatives.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)  # little-endian uint32 per permutation
+    content_hash = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+class InitiativeNeighbor(Base):
+    """Precomputed top-K most similar initiatives, one row per (initiative, rank)"""
+    __tablename__ = "initiative_neighbors"
+    
+    initiative_id = Column(Integer, ForeignKey("initiatives.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 = most similar
+    neighbor_id = Column(Integer, ForeignKey("initiatives.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)
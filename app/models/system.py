@@ -0,0 +1,23 @@
+"""
+Operational models (cross-worker coordination)
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+from app.core.database import Base
+
+class CacheInvalidation(Base):
+    """Broadcast log of cache tag invalidations, tailed by every worker"""
+    __tablename__ = "cache_invalidations"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    origin = Column(String, nullable=False)  # worker that published it
+    tags = Column(Text, nullable=False)  # JSON array of tag names
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class SystemState(Base):
+    """Small key/value store for batch pipeline bookkeeping (corpus sizes, high-water marks)"""
+    __tablename__ = "system_state"
+    
+    key = Column(String, primary_key=True)
+    value = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,23 @@
+"""
+Auto-tagging models
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+
+class TagTerm(Base):
+    """Tag vocabulary term with its document frequency over the description corpus"""
+    __tablename__ = "tag_terms"
+    
+    term = Column(String, primary_key=True)  # normalized phrase, e.g. "machine learning"
+    label = Column(String, nullable=False)  # display form written to tags, e.g. "Machine Learning"
+    doc_freq = Column(Integer, default=0, nullable=False)
+
+class InitiativeAutoTags(Base):
+    """Tags generated for an initiative by the last tagging run"""
+    __tablename__ = "initiative_auto_tags"
+    
+    initiative_id = Column(Integer, ForeignKey("initiatives.id", ondelete="CASCADE"), primary_key=True)
+    tags = Column(Text, nullable=True)  # JSON array; kept apart so reruns never remove manual tags
+    content_hash = Column(String, nullable=False)  # hash of the tagged text, skips no-op reruns
+    tagged_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,18 @@
+"""
+Trending score model
+"""
+from sqlalchemy import Column, Integer, Float, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+class TrendingScore(Base):
+    """
+    Forward-decayed engagement score, relative to the landmark stored in
+    ``system_state`` under ``trending.landmark``. Pruned to the top rows,
+    so it has no foreign key to initiatives.
+    """
+    __tablename__ = "trending_scores"
+    
+    initiative_id = Column(Integer, primary_key=True)
+    score = Column(Float, nullable=False, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
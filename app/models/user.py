@@ -6,14 +6,14 @@ from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 import json
-from app.core.database import Base
+from app.core.database import Base, SoftDeleteMixin
 
 class UserRole(str, enum.Enum):
     ANALYST = "analyst"
     LEADER = "leader"
     ADMIN = "admin"
 
-class User(Base):
+class User(SoftDeleteMixin, Base):
     __tablename__ = "users"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -75,10 +75,11 @@ class User(Base):
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = Column(Integer, default=1, nullable=False)  # bumped on profile edits, feeds the ETag
     last_login = Column(DateTime, nullable=True)
     
     # Relationships
-    initiatives = relationship("Initiative", back_populates="owner", cascade="all, delete-orphan")
-    saved_initiatives = relationship("SavedInitiative", back_populates="user", cascade="all, delete-orphan")
-    applications = relationship("InitiativeApplication", back_populates="user", cascade="all, delete-orphan")
-    views = relationship("InitiativeView", back_populates="user", cascade="all, delete-orphan")
+    initiatives = relationship("Initiative", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
+    saved_initiatives = relationship("SavedInitiative", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    applications = relationship("InitiativeApplication", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    views = relationship("InitiativeView", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
@@ -5,14 +5,32 @@ from app.schemas.user import (
     UserCreate, UserUpdate, UserResponse, UserProfile, Token, TokenData
 )
 from app.schemas.initiative import (
-    InitiativeCreate, InitiativeUpdate, InitiativeResponse, InitiativeList
+    InitiativeCreate, InitiativeUpdate, InitiativeResponse, InitiativeList,
+    InitiativeCreateResponse, DuplicateCandidate, DuplicateCluster, DuplicateClusterList,
+    SimilarInitiative, TrendingInitiative, InitiativeBatch,
+    InitiativeSummaryResponse, DashboardTotals, LeaderDashboard, ImportRowError, ImportReport
 )
 from app.schemas.engagement import (
-    SaveInitiativeRequest, ApplicationRequest, ApplicationResponse
+    SaveInitiativeRequest, BulkSaveRequest, BulkSaveResult, BulkUnsaveResult,
+    ApplicationRequest, ApplicationResponse,
+    ApplicationReviewRequest, ApplicationReviewResult
+)
+from app.schemas.job import JobResponse
+from app.schemas.analytics import (
+    EngagementCounts, EngagementBucket, InitiativeEngagementSeries,
+    InitiativeEngagementTotals, OwnerEngagementSummary
 )
 
 __all__ = [
     "UserCreate", "UserUpdate", "UserResponse", "UserProfile", "Token", "TokenData",
     "InitiativeCreate", "InitiativeUpdate", "InitiativeResponse", "InitiativeList",
-    "SaveInitiativeRequest", "ApplicationRequest", "ApplicationResponse"
+    "InitiativeCreateResponse", "DuplicateCandidate", "DuplicateCluster", "DuplicateClusterList",
+    "SimilarInitiative", "TrendingInitiative", "InitiativeBatch",
+    "InitiativeSummaryResponse", "DashboardTotals", "LeaderDashboard", "ImportRowError", "ImportReport",
+    "SaveInitiativeRequest", "BulkSaveRequest", "BulkSaveResult", "BulkUnsaveResult",
+    "ApplicationRequest", "ApplicationResponse",
+    "ApplicationReviewRequest", "ApplicationReviewResult",
+    "JobResponse",
+    "EngagementCounts", "EngagementBucket", "InitiativeEngagementSeries",
+    "InitiativeEngagementTotals", "OwnerEngagementSummary"
 ]
@@ -0,0 +1,35 @@
+"""
+Engagement analytics schemas
+"""
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from datetime import datetime
+
+class EngagementCounts(BaseModel):
+    views: int = 0
+    saves: int = 0
+    applications: int = 0
+
+class EngagementBucket(EngagementCounts):
+    bucket_start: datetime
+
+class InitiativeEngagementSeries(BaseModel):
+    initiative_id: int
+    granularity: Literal["hour", "day"]
+    start: datetime
+    end: datetime
+    rolled_up_until: Optional[datetime]  # events after this are not counted yet
+    buckets: List[EngagementBucket]  # empty buckets are omitted
+    totals: EngagementCounts
+
+class InitiativeEngagementTotals(EngagementCounts):
+    initiative_id: int
+    title: str
+
+class OwnerEngagementSummary(BaseModel):
+    owner_id: int
+    days: int
+    since: datetime
+    rolled_up_until: Optional[datetime]
+    initiatives: List[InitiativeEngagementTotals]
+    totals: EngagementCounts
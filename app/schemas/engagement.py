@@ -1,13 +1,25 @@
 """
 Engagement schemas
 """
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 
 class SaveInitiativeRequest(BaseModel):
     initiative_id: int
 
+class BulkSaveRequest(BaseModel):
+    initiative_ids: List[int] = Field(..., min_length=1, max_length=500)
+
+class BulkSaveResult(BaseModel):
+    saved: List[int]
+    already_saved: List[int]
+    not_found: List[int]
+
+class BulkUnsaveResult(BaseModel):
+    removed: List[int]
+    not_saved: List[int]
+
 class ApplicationRequest(BaseModel):
     initiative_id: int
     message: Optional[str] = None
@@ -22,3 +34,14 @@ class ApplicationResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+class ApplicationReviewRequest(BaseModel):
+    application_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+class ApplicationReviewResult(BaseModel):
+    status: str
+    updated: List[int]
+    unchanged: List[int]  # already in the requested status
+    not_found: List[int]  # missing, or of an initiative the caller does not own
+    initiatives_full: List[int]  # reached capacity and were marked FULL
+    initiatives_reopened: List[int]  # dropped below capacity and were reopened
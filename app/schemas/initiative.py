@@ -2,7 +2,7 @@
 Initiative schemas
 """
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from app.models.initiative import InitiativeStatus, InitiativeDuration
 from app.schemas.base import get_list_from_json
@@ -19,9 +19,10 @@ class InitiativeBase(BaseModel):
     role_type: Optional[str] = None
     contact_person: Optional[str] = None
     contact_email: Optional[str] = None
+    capacity: Optional[int] = Field(None, ge=1)  # accepted applicants before the initiative becomes full
 
 class InitiativeCreate(InitiativeBase):
-    pass
+    tags: List[str] = Field(default_factory=list)
 
 class InitiativeUpdate(BaseModel):
     title: Optional[str] = None
@@ -36,6 +37,7 @@ class InitiativeUpdate(BaseModel):
     contact_person: Optional[str] = None
     contact_email: Optional[str] = None
     status: Optional[InitiativeStatus] = None
+    capacity: Optional[int] = Field(None, ge=1)
     tags: Optional[List[str]] = None
 
 class InitiativeResponse(InitiativeBase):
@@ -58,8 +60,79 @@ class InitiativeResponse(InitiativeBase):
     class Config:
         from_attributes = True
 
+class DuplicateCandidate(BaseModel):
+    id: int
+    title: str
+    similarity: float  # estimated Jaccard similarity of title + description shingles
+
+class InitiativeCreateResponse(InitiativeResponse):
+    possible_duplicates: List[DuplicateCandidate] = Field(default_factory=list)
+
+class DuplicateCluster(BaseModel):
+    size: int
+    initiatives: List[DuplicateCandidate]  # similarity relative to the first (oldest) member
+
+class DuplicateClusterList(BaseModel):
+    total_clusters: int
+    indexed: int
+    threshold: float
+    clusters: List[DuplicateCluster]
+
+class SimilarInitiative(BaseModel):
+    initiative: InitiativeResponse
+    score: float  # blended text and skill/tag/industry similarity, 0-1
+
+class TrendingInitiative(BaseModel):
+    initiative: InitiativeResponse
+    score: float  # decayed engagement: views 1, saves 3, applications 5, halved every half-life
+
 class InitiativeList(BaseModel):
     total: int
     items: List[InitiativeResponse]
     page: int
     page_size: int
+
+class InitiativeBatch(BaseModel):
+    items: List[Optional[InitiativeResponse]]  # in requested order; null where the id does not exist
+    not_found: List[int]
+
+class InitiativeSummaryResponse(BaseModel):
+    initiative_id: int
+    title: str
+    status: InitiativeStatus
+    views: int
+    saves: int
+    pending_applications: int
+    accepted_applications: int
+    rejected_applications: int
+    last_activity: Optional[str]  # view, save, application or review
+    last_activity_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+class DashboardTotals(BaseModel):
+    initiatives: int
+    by_status: Dict[str, int]  # initiative status -> count
+    views: int
+    saves: int
+    pending_applications: int
+    accepted_applications: int
+    rejected_applications: int
+
+class LeaderDashboard(BaseModel):
+    owner_id: int
+    totals: DashboardTotals
+    initiatives: List[InitiativeSummaryResponse]  # most recently active first
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+class ImportReport(BaseModel):
+    rows: int
+    imported: int
+    failed: int
+    batches: int
+    errors: List[ImportRowError]  # first 1000
+    errors_truncated: bool
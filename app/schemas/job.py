@@ -0,0 +1,24 @@
+"""
+Background job schemas
+"""
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from app.models.job import JobStatus
+
+class JobResponse(BaseModel):
+    id: int
+    job_type: str
+    entity_id: Optional[int]
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    coalesced: int
+    last_error: Optional[str]
+    run_at: datetime
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
@@ -0,0 +1,3 @@
+"""
+Application services (search, recommendations, background processing)
+"""
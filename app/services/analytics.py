@@ -0,0 +1,203 @@
+"""
+Time-bucketed engagement rollups for leader analytics
+
+Raw ``initiative_views``, ``saved_initiatives`` and ``initiative_applications``
+rows are folded into per-initiative hourly and daily counters so analytics
+queries read a few hundred small rows instead of scanning event tables.
+
+* **Incremental** - each source has a high-water mark in ``system_state``
+  (``analytics.hwm.<source>``). A run counts the events between the mark
+  and ``now - ANALYTICS_LAG_SECONDS`` with one ``GROUP BY`` per source, adds
+  them to both rollup tables with an upsert and moves the marks, all in one
+  transaction. The lag leaves room for transactions that stamped an event
+  but have not committed yet.
+* **Retention** - raw views older than ``ANALYTICS_RAW_RETENTION_DAYS``
+  (and already rolled up) are deleted, as are hourly buckets older than
+  ``ANALYTICS_HOURLY_RETENTION_DAYS``. Daily buckets are kept.
+
+The ``rollup_engagement`` job runs every ``ANALYTICS_ROLLUP_INTERVAL`` seconds.
+
+    python -m app.services.analytics            # one rollup + compaction pass
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal, upsert_insert
+from app.core.jobs import job_handler
+from app.models.analytics import EngagementDaily, EngagementHourly
+from app.models.engagement import InitiativeApplication, InitiativeView, SavedInitiative
+from app.models.initiative import Initiative
+from app.models.system import SystemState
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("views", "saves", "applications")
+
+SOURCES = [
+    ("views", InitiativeView.initiative_id, InitiativeView.viewed_at),
+    ("saves", SavedInitiative.initiative_id, SavedInitiative.saved_at),
+    ("applications", InitiativeApplication.initiative_id, InitiativeApplication.applied_at),
+]
+
+def _mark_key(source: str) -> str:
+    return f"analytics.hwm.{source}"
+
+def _get_mark(db: Session, source: str, lock: bool = False) -> Optional[datetime]:
+    query = select(SystemState.value).where(SystemState.key == _mark_key(source))
+    if lock:
+        query = query.with_for_update()
+    value = db.execute(query).scalar()
+    return datetime.fromisoformat(value) if value else None
+
+def _set_mark(db: Session, source: str, value: datetime) -> None:
+    row = db.get(SystemState, _mark_key(source))
+    if row is None:
+        db.add(SystemState(key=_mark_key(source), value=value.isoformat()))
+    else:
+        row.value = value.isoformat()
+
+def _hour_bucket(db: Session, column):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date_trunc("hour", column)
+    return func.strftime("%Y-%m-%d %H:00:00", column)
+
+def _as_datetime(value) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+def _add_counts(db: Session, model, counts: Dict[Tuple[int, datetime], Dict[str, int]]) -> None:
+    """Add counter deltas to existing buckets, creating missing ones"""
+    if not counts:
+        return
+    rows = [
+        {"initiative_id": initiative_id, "bucket_start": bucket, **{c: delta.get(c, 0) for c in COUNTERS}}
+        for (initiative_id, bucket), delta in counts.items()
+    ]
+    insert = upsert_insert(db)
+    if insert is None:
+        for row in rows:
+            existing = db.get(model, (row["initiative_id"], row["bucket_start"]))
+            if existing is None:
+                db.add(model(**row))
+            else:
+                for counter in COUNTERS:
+                    setattr(existing, counter, getattr(existing, counter) + row[counter])
+        return
+    stmt = insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[model.initiative_id, model.bucket_start],
+        set_={c: getattr(model, c) + getattr(stmt.excluded, c) for c in COUNTERS},
+    )
+    db.execute(stmt, rows)
+
+def rollup(db: Session, now: Optional[datetime] = None) -> dict:
+    """Fold events since the high-water marks into the hourly and daily tables"""
+    upper = (now or datetime.utcnow()) - timedelta(seconds=settings.ANALYTICS_LAG_SECONDS)
+    hourly: Dict[Tuple[int, datetime], Dict[str, int]] = defaultdict(dict)
+    events = {}
+    for source, id_column, time_column in SOURCES:
+        mark = _get_mark(db, source, lock=True)
+        if mark is not None and mark >= upper:
+            events[source] = 0
+            continue
+        bucket = _hour_bucket(db, time_column)
+        query = select(id_column, bucket, func.count()).where(time_column <= upper)
+        if mark is not None:
+            query = query.where(time_column > mark)
+        query = query.group_by(id_column, bucket)
+        events[source] = 0
+        for initiative_id, hour, count in db.execute(query):
+            hourly[(initiative_id, _as_datetime(hour))][source] = count
+            events[source] += count
+        _set_mark(db, source, upper)
+
+    daily: Dict[Tuple[int, datetime], Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for (initiative_id, hour), delta in hourly.items():
+        day = daily[(initiative_id, hour.replace(hour=0))]
+        for counter, count in delta.items():
+            day[counter] += count
+
+    _add_counts(db, EngagementHourly, hourly)
+    _add_counts(db, EngagementDaily, daily)
+    db.commit()
+    return {"until": upper.isoformat(), "events": events, "hourly_buckets": len(hourly)}
+
+def compact(db: Session, now: Optional[datetime] = None) -> dict:
+    """Drop raw views and hourly buckets past their retention window"""
+    now = now or datetime.utcnow()
+    removed = {"views": 0, "hourly_buckets": 0}
+    mark = _get_mark(db, "views")
+    if mark is not None:
+        # Never delete a view that has not been rolled up yet
+        cutoff = min(now - timedelta(days=settings.ANALYTICS_RAW_RETENTION_DAYS), mark)
+        removed["views"] = db.execute(
+            delete(InitiativeView).where(InitiativeView.viewed_at <= cutoff)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    hourly_cutoff = now - timedelta(days=settings.ANALYTICS_HOURLY_RETENTION_DAYS)
+    removed["hourly_buckets"] = db.execute(
+        delete(EngagementHourly).where(EngagementHourly.bucket_start < hourly_cutoff)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return removed
+
+@job_handler("rollup_engagement", every=settings.ANALYTICS_ROLLUP_INTERVAL)
+def rollup_engagement(db: Session, entity_id: int, payload: dict) -> None:
+    """Periodic incremental rollup followed by retention"""
+    report = rollup(db)
+    report["compacted"] = compact(db)
+    logger.debug("engagement rollup: %s", report)
+
+# -- queries ------------------------------------------------------------
+
+def rolled_up_until(db: Session) -> Optional[datetime]:
+    """Time up to which every event source has been rolled up"""
+    marks = [_get_mark(db, source) for source, _, _ in SOURCES]
+    return None if any(m is None for m in marks) else min(marks)
+
+def series(db: Session, initiative_id: int, granularity: str,
+           start: datetime, end: datetime) -> List[dict]:
+    """Non-empty buckets of one initiative in ``[start, end)``, oldest first"""
+    model = EngagementHourly if granularity == "hour" else EngagementDaily
+    rows = db.execute(
+        select(model.bucket_start, *(getattr(model, c) for c in COUNTERS))
+        .where(model.initiative_id == initiative_id, model.bucket_start >= start, model.bucket_start < end)
+        .order_by(model.bucket_start)
+    ).all()
+    return [dict(zip(("bucket_start",) + COUNTERS, row)) for row in rows]
+
+def owner_totals(db: Session, owner_id: int, since: datetime) -> List[dict]:
+    """Per-initiative totals from daily buckets starting at ``since``, for one owner"""
+    sums = [func.coalesce(func.sum(getattr(EngagementDaily, c)), 0).label(c) for c in COUNTERS]
+    rows = db.execute(
+        select(Initiative.id, Initiative.title, *sums)
+        .outerjoin(EngagementDaily, and_(
+            EngagementDaily.initiative_id == Initiative.id, EngagementDaily.bucket_start >= since
+        ))
+        .where(Initiative.owner_id == owner_id)
+        .group_by(Initiative.id, Initiative.title)
+        .order_by(Initiative.id)
+    ).all()
+    return [
+        {"initiative_id": row.id, "title": row.title, **{c: int(getattr(row, c)) for c in COUNTERS}}
+        for row in rows
+    ]
+
+def totals(items: Sequence[dict]) -> dict:
+    return {c: sum(item[c] for item in items) for c in COUNTERS}
+
+if __name__ == "__main__":
+    import json
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        report = rollup(session)
+        report["compacted"] = compact(session)
+        print(json.dumps(report, indent=2))
+    finally:
+        session.close()
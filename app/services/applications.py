@@ -0,0 +1,103 @@
+"""
+Application review: set-based status changes and capacity handling
+
+Reviewing is one ``UPDATE ... RETURNING`` per previous status, restricted
+to applications of initiatives the reviewer owns inside the statement
+itself, so a list of ids from any source can be passed safely. Knowing the
+previous status per returned row lets the dashboard counters move without
+re-reading the applications.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import and_, func, select, true, update
+from sqlalchemy.orm import Session
+from app.models.engagement import InitiativeApplication
+from app.models.initiative import Initiative, InitiativeStatus
+from app.services import dashboard
+
+STATUSES = ("pending", "accepted", "rejected")
+
+# Initiatives in these states become FULL once capacity is reached
+FILLABLE = (InitiativeStatus.OPEN, InitiativeStatus.ACTIVE)
+
+def _accepted_count():
+    return (
+        select(func.count(InitiativeApplication.id))
+        .where(InitiativeApplication.initiative_id == Initiative.id, InitiativeApplication.status == "accepted")
+        .scalar_subquery()
+    )
+
+def apply_capacity(db: Session, initiative_ids: Iterable[int]) -> Dict[str, List[int]]:
+    """
+    Mark initiatives FULL when their accepted applications reach capacity,
+    and reopen FULL ones that dropped below it. Returns the changed ids.
+    """
+    ids = list(set(initiative_ids))
+    if not ids:
+        return {"full": [], "reopened": []}
+    accepted = _accepted_count()
+    full = db.execute(
+        update(Initiative)
+        .where(Initiative.id.in_(ids), Initiative.capacity.is_not(None),
+               Initiative.status.in_(FILLABLE), accepted >= Initiative.capacity)
+        .values(status=InitiativeStatus.FULL, version=Initiative.version + 1)
+        .returning(Initiative.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    reopened = db.execute(
+        update(Initiative)
+        .where(Initiative.id.in_(ids), Initiative.capacity.is_not(None),
+               Initiative.status == InitiativeStatus.FULL, accepted < Initiative.capacity)
+        .values(status=InitiativeStatus.OPEN, version=Initiative.version + 1)
+        .returning(Initiative.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    if full or reopened:
+        dashboard.refresh(db, full + reopened)
+    return {"full": sorted(full), "reopened": sorted(reopened)}
+
+def review(db: Session, application_ids: Sequence[int], new_status: str,
+           owner_id: Optional[int]) -> dict:
+    """
+    Set ``new_status`` on the given applications of initiatives owned by
+    ``owner_id`` (any owner when None) within the caller's transaction.
+    """
+    ids = list(dict.fromkeys(application_ids))
+    ownership = true() if owner_id is None else \
+        InitiativeApplication.initiative_id.in_(select(Initiative.id).where(Initiative.owner_id == owner_id))
+
+    updated, moves = [], defaultdict(lambda: defaultdict(int))
+    for old_status in STATUSES:
+        if old_status == new_status:
+            continue
+        rows = db.execute(
+            update(InitiativeApplication)
+            .where(and_(InitiativeApplication.id.in_(ids), InitiativeApplication.status == old_status, ownership))
+            .values(status=new_status)
+            .returning(InitiativeApplication.id, InitiativeApplication.initiative_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        for application_id, initiative_id in rows:
+            updated.append(application_id)
+            moves[initiative_id][dashboard.APPLICATION_COUNTERS[old_status]] -= 1
+            moves[initiative_id][dashboard.APPLICATION_COUNTERS[new_status]] += 1
+
+    for initiative_id, deltas in moves.items():
+        dashboard.record(db, initiative_id, "review", **deltas)
+    capacity = apply_capacity(db, list(moves))
+
+    done = set(updated)
+    remaining = [i for i in ids if i not in done]
+    unchanged = set(db.execute(
+        select(InitiativeApplication.id)
+        .where(InitiativeApplication.id.in_(remaining), InitiativeApplication.status == new_status, ownership)
+    ).scalars().all()) if remaining else set()
+    return {
+        "status": new_status,
+        "updated": sorted(updated),
+        "unchanged": [i for i in remaining if i in unchanged],
+        "not_found": [i for i in remaining if i not in unchanged],
+        "initiatives_full": capacity["full"],
+        "initiatives_reopened": capacity["reopened"],
+        "affected_initiatives": sorted(moves),
+    }
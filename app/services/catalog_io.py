@@ -0,0 +1,318 @@
+"""
+Streaming bulk import and export of initiatives (JSONL or CSV)
+
+Import reads the input lazily, validates rows in chunks of
+``IMPORT_BATCH_SIZE`` against the same schema as ``POST /initiatives/``
+and writes each chunk in its own transaction:
+
+* one Core ``executemany`` insert of the initiatives (``RETURNING`` ids),
+* one insert of their MinHash signatures and a set-based refresh of the
+  owners' dashboard summaries,
+* one ``enqueue_many`` per background job type (tags, embeddings).
+
+Invalid rows are reported with their line number and skipped; a chunk
+that fails to insert is rolled back and reported as a whole. The LSH index
+and caches are updated after each commit.
+
+Export streams rows through a server-side cursor (``yield_per``) and
+encodes them one at a time, so memory stays flat for any catalog size.
+
+    python -m app.services.catalog_io import initiatives.jsonl --owner-email leader@deloitte.com
+    python -m app.services.catalog_io export --format csv --output initiatives.csv
+"""
+import csv
+import io
+import json
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import enqueue_many
+from app.models.initiative import Initiative, InitiativeStatus
+from app.models.similarity import InitiativeMinHash
+from app.models.user import User
+from app.schemas.base import get_list_from_json
+from app.schemas.initiative import InitiativeCreate
+from app.services import dashboard, dedup
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("jsonl", "csv")
+
+LIST_FIELDS = ("skills_needed", "industries", "tags")
+
+EXPORT_COLUMNS = [
+    "id", "title", "description", "practice_area", "skills_needed", "industries", "tags",
+    "time_commitment", "duration", "duration_details", "role_type", "contact_person",
+    "contact_email", "status", "capacity", "owner_id", "created_at", "updated_at",
+]
+
+# Per-row errors kept in a report; the counts stay exact
+MAX_REPORTED_ERRORS = 1000
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    if filename:
+        suffix = filename.rsplit(".", 1)[-1].lower()
+        if suffix in ("jsonl", "ndjson"):
+            return "jsonl"
+        if suffix == "csv":
+            return "csv"
+    return None
+
+def _split_list(value) -> list:
+    """CSV list cells: a JSON array or ``;``-separated values"""
+    if isinstance(value, list):
+        return value
+    text = (value or "").strip()
+    if text.startswith("["):
+        return get_list_from_json(text)
+    return [part.strip() for part in text.split(";") if part.strip()]
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, object]]:
+    """(line number, record or error message) for every non-empty input row"""
+    if fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except ValueError as exc:
+                yield line_no, f"invalid JSON: {exc}"
+    elif fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            record = {k: v for k, v in row.items() if k and v not in (None, "")}
+            for field in LIST_FIELDS:
+                if field in record:
+                    record[field] = _split_list(record[field])
+            yield reader.line_num, record
+    else:
+        raise ValueError(f"unsupported format {fmt!r}")
+
+def _format_error(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}" for e in exc.errors())
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.batches = 0
+        self.errors: List[dict] = []
+
+    def error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "imported": self.imported,
+            "failed": self.failed,
+            "batches": self.batches,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+def _owner_id(record: dict):
+    value = record.get("owner_id")
+    return int(value) if isinstance(value, str) and value.strip().isdigit() else value
+
+def _resolve_owners(db: Session, chunk: List[Tuple[int, dict]]) -> Tuple[Dict[str, int], set]:
+    emails = {r["owner_email"] for _, r in chunk if isinstance(r.get("owner_email"), str)}
+    ids = {i for i in (_owner_id(r) for _, r in chunk) if isinstance(i, int)}
+    by_email = dict(db.execute(select(User.email, User.id).where(User.email.in_(emails))).all()) if emails else {}
+    known_ids = set(db.execute(select(User.id).where(User.id.in_(ids))).scalars().all()) if ids else set()
+    return by_email, known_ids
+
+def _validate(db: Session, chunk: List[Tuple[int, object]], default_owner_id: int,
+              report: ImportReport) -> List[Tuple[int, dict]]:
+    """Turn raw records into insert rows, reporting the invalid ones"""
+    records = [(line, r) for line, r in chunk if isinstance(r, dict)]
+    for line, r in chunk:
+        if isinstance(r, str):
+            report.error(line, r)
+        elif not isinstance(r, dict):
+            report.error(line, "row must be an object")
+    by_email, known_ids = _resolve_owners(db, records)
+
+    rows = []
+    for line, record in records:
+        owner_id = _owner_id(record)
+        record = dict(record)
+        record.pop("id", None)
+        record.pop("owner_id", None)
+        owner_email = record.pop("owner_email", None)
+        try:
+            data = InitiativeCreate.model_validate(record).model_dump()
+            initiative_status = InitiativeStatus(record["status"]) if record.get("status") else InitiativeStatus.OPEN
+        except ValidationError as exc:
+            report.error(line, _format_error(exc))
+            continue
+        except ValueError:
+            report.error(line, f"status: must be one of {', '.join(s.value for s in InitiativeStatus)}")
+            continue
+        if owner_email is not None:
+            owner_id = by_email.get(owner_email)
+            if owner_id is None:
+                report.error(line, f"owner_email: unknown user {owner_email!r}")
+                continue
+        elif owner_id is not None:
+            if owner_id not in known_ids:
+                report.error(line, f"owner_id: unknown user {owner_id}")
+                continue
+        else:
+            owner_id = default_owner_id
+        for field in LIST_FIELDS:
+            data[field] = json.dumps(data[field]) if data.get(field) else None
+        data.update(status=initiative_status, owner_id=owner_id)
+        rows.append((line, data))
+    return rows
+
+def _insert_batch(db: Session, rows: List[Tuple[int, dict]]) -> List[Tuple[int, object]]:
+    """Insert one validated chunk plus its derived rows; returns (id, signature) pairs"""
+    ids = db.execute(insert(Initiative).returning(Initiative.id, sort_by_parameter_order=True),
+                     [data for _, data in rows]).scalars().all()
+
+    signatures, minhash_rows = [], []
+    for initiative_id, (_, data) in zip(ids, rows):
+        sig = dedup.signature(dedup.shingles(data["title"], data["description"]))
+        signatures.append((initiative_id, sig))
+        if sig is not None:
+            minhash_rows.append({
+                "initiative_id": initiative_id,
+                "signature": sig.astype("<u4").tobytes(),
+                "content_hash": dedup.content_hash(data["title"], data["description"]),
+            })
+    if minhash_rows:
+        db.execute(insert(InitiativeMinHash), minhash_rows)
+    dashboard.refresh(db, ids)
+    enqueue_many(db, "tag_initiative", ids)
+    enqueue_many(db, "embed_initiative", ids)
+    return signatures
+
+def import_initiatives(db: Session, records: Iterable[Tuple[int, object]], default_owner_id: int,
+                       batch_size: Optional[int] = None) -> dict:
+    """Validate and insert records chunk by chunk, one transaction per chunk"""
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    report = ImportReport()
+
+    def flush(chunk):
+        rows = _validate(db, chunk, default_owner_id, report)
+        if not rows:
+            return
+        try:
+            signatures = _insert_batch(db, rows)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.exception("import batch failed")
+            for line, _ in rows:
+                report.error(line, f"batch insert failed: {exc.__class__.__name__}")
+            return
+        report.imported += len(rows)
+        report.batches += 1
+        for initiative_id, sig in signatures:
+            if sig is not None:
+                dedup.lsh.add(initiative_id, sig)
+        cache.invalidate_tags("initiatives")
+
+    chunk = []
+    for item in records:
+        report.rows += 1
+        chunk.append(item)
+        if len(chunk) >= batch_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+    return report.as_dict()
+
+def _export_row(record) -> dict:
+    row = dict(record)
+    for field in LIST_FIELDS:
+        row[field] = get_list_from_json(row[field])
+    for field in ("duration", "status"):
+        row[field] = row[field].value if row[field] is not None else None
+    for field in ("created_at", "updated_at"):
+        row[field] = row[field].isoformat() if row[field] is not None else None
+    return row
+
+def export_initiatives(db: Session, fmt: str, yield_per: Optional[int] = None) -> Iterator[str]:
+    """Encoded export chunks (one row each, CSV header first) read through a server-side cursor"""
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported format {fmt!r}")
+    query = (
+        select(*(getattr(Initiative, column) for column in EXPORT_COLUMNS))
+        .order_by(Initiative.id)
+        .execution_options(yield_per=yield_per or settings.EXPORT_YIELD_PER)
+    )
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    if fmt == "csv":
+        writer.writeheader()
+        yield buffer.getvalue()
+    for record in db.execute(query).mappings():
+        row = _export_row(record)
+        if fmt == "jsonl":
+            yield json.dumps(row) + "\n"
+            continue
+        for field in LIST_FIELDS:
+            row[field] = json.dumps(row[field]) if row[field] else ""
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+def main(argv=None) -> int:
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Bulk import or export initiatives")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="import a JSONL or CSV file ('-' for stdin)")
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=FORMATS, default=None)
+    importer.add_argument("--owner-email", required=True, help="owner of rows without owner_id/owner_email")
+    importer.add_argument("--batch-size", type=int, default=None)
+    exporter = commands.add_parser("export", help="export every initiative")
+    exporter.add_argument("--format", choices=FORMATS, default="jsonl")
+    exporter.add_argument("--output", default="-")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        if args.command == "import":
+            fmt = args.format or detect_format(args.path)
+            if fmt is None:
+                parser.error("cannot tell the format from the file name; pass --format")
+            owner_id = db.execute(select(User.id).where(User.email == args.owner_email)).scalar()
+            if owner_id is None:
+                parser.error(f"unknown user {args.owner_email}")
+            stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8", newline="")
+            try:
+                report = import_initiatives(db, read_records(stream, fmt), owner_id, args.batch_size)
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+            print(json.dumps(report, indent=2))
+            return 1 if report["failed"] else 0
+        out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+        try:
+            for chunk in export_initiatives(db, args.format):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    raise SystemExit(main())
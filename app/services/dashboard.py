@@ -0,0 +1,148 @@
+"""
+Materialized per-initiative summaries behind the leader dashboard
+
+``initiative_summaries`` holds one row of engagement counters per
+initiative, indexed by owner. The initiative and engagement write paths
+adjust it in the same transaction as the change itself (atomic
+``col = col + n`` updates), so the dashboard never aggregates applications
+or saves at read time.
+
+A missing row (initiatives created before this table, or by scripts that
+bypass the API) is recomputed from the source tables the first time a
+write path touches it; ``python -m app.services.dashboard`` rebuilds all
+rows at once.
+"""
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.dashboard import InitiativeSummary
+from app.models.engagement import InitiativeApplication, SavedInitiative
+from app.models.initiative import Initiative
+
+logger = logging.getLogger(__name__)
+
+# Application status -> summary counter column
+APPLICATION_COUNTERS = {
+    "pending": "pending_applications",
+    "accepted": "accepted_applications",
+    "rejected": "rejected_applications",
+}
+
+def _compute(db: Session, initiative_ids: List[int]) -> List[dict]:
+    """Summary rows recomputed from the initiative and engagement tables"""
+    rows = {
+        row.id: {
+            "initiative_id": row.id, "owner_id": row.owner_id, "title": row.title, "status": row.status,
+            "views": row.view_count or 0, "saves": 0, "last_activity": None, "last_activity_at": None,
+            **dict.fromkeys(APPLICATION_COUNTERS.values(), 0),
+        }
+        for row in db.execute(
+            select(Initiative.id, Initiative.owner_id, Initiative.title, Initiative.status, Initiative.view_count)
+            .where(Initiative.id.in_(initiative_ids))
+        )
+    }
+
+    def touch(row, activity, when):
+        if when is not None and (row["last_activity_at"] is None or when > row["last_activity_at"]):
+            row["last_activity"], row["last_activity_at"] = activity, when
+
+    for initiative_id, count, latest in db.execute(
+        select(SavedInitiative.initiative_id, func.count(), func.max(SavedInitiative.saved_at))
+        .where(SavedInitiative.initiative_id.in_(rows)).group_by(SavedInitiative.initiative_id)
+    ):
+        rows[initiative_id]["saves"] = count
+        touch(rows[initiative_id], "save", latest)
+    for initiative_id, app_status, count, latest in db.execute(
+        select(InitiativeApplication.initiative_id, InitiativeApplication.status, func.count(),
+               func.max(InitiativeApplication.applied_at))
+        .where(InitiativeApplication.initiative_id.in_(rows))
+        .group_by(InitiativeApplication.initiative_id, InitiativeApplication.status)
+    ):
+        column = APPLICATION_COUNTERS.get(app_status)
+        if column:
+            rows[initiative_id][column] += count
+        touch(rows[initiative_id], "application", latest)
+    return list(rows.values())
+
+def refresh(db: Session, initiative_ids: Iterable[int]) -> int:
+    """Recompute the summary rows of the given initiatives (within the caller's transaction)"""
+    ids = list(dict.fromkeys(initiative_ids))
+    db.flush()
+    written = 0
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        db.execute(delete(InitiativeSummary).where(InitiativeSummary.initiative_id.in_(chunk)))
+        rows = _compute(db, chunk)
+        if rows:
+            db.execute(insert(InitiativeSummary), rows)
+        written += len(rows)
+    return written
+
+def sync_initiative(db: Session, initiative: Initiative) -> None:
+    """Copy owner, title and status after an initiative is created or edited"""
+    updated = db.execute(
+        update(InitiativeSummary)
+        .where(InitiativeSummary.initiative_id == initiative.id)
+        .values(owner_id=initiative.owner_id, title=initiative.title, status=initiative.status)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not updated:
+        refresh(db, [initiative.id])
+
+def record(db: Session, initiative_id: int, activity: Optional[str] = None, **deltas: int) -> None:
+    """
+    Add ``deltas`` (counter name -> change) to an initiative's summary and
+    optionally stamp it as its latest activity.
+    """
+    record_many(db, [initiative_id], activity, **deltas)
+
+def record_many(db: Session, initiative_ids: Iterable[int], activity: Optional[str] = None, **deltas: int) -> None:
+    """Apply the same counter changes to several summaries with one ``UPDATE``"""
+    ids = list(dict.fromkeys(initiative_ids))
+    values = {name: getattr(InitiativeSummary, name) + delta for name, delta in deltas.items() if delta}
+    if activity is not None:
+        values.update(last_activity=activity, last_activity_at=datetime.utcnow())
+    if not ids or not values:
+        return
+    updated = db.execute(
+        update(InitiativeSummary)
+        .where(InitiativeSummary.initiative_id.in_(ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if updated < len(ids):
+        present = set(db.execute(
+            select(InitiativeSummary.initiative_id).where(InitiativeSummary.initiative_id.in_(ids))
+        ).scalars().all())
+        refresh(db, [i for i in ids if i not in present])
+
+def forget(db: Session, initiative_id: int) -> None:
+    db.execute(delete(InitiativeSummary).where(InitiativeSummary.initiative_id == initiative_id))
+
+def owner_summaries(db: Session, owner_id: int) -> List[InitiativeSummary]:
+    """Every summary row of one owner, most recently active first"""
+    rows = db.execute(
+        select(InitiativeSummary).where(InitiativeSummary.owner_id == owner_id)
+    ).scalars().all()
+    return sorted(rows, key=lambda r: (r.last_activity_at or datetime.min, r.initiative_id), reverse=True)
+
+def rebuild(db: Session) -> dict:
+    """Recompute every summary row and drop rows of deleted initiatives"""
+    ids = db.execute(select(Initiative.id)).scalars().all()
+    db.execute(delete(InitiativeSummary).where(InitiativeSummary.initiative_id.not_in(select(Initiative.id))))
+    written = refresh(db, ids)
+    db.commit()
+    return {"initiatives": written}
+
+if __name__ == "__main__":
+    import json
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        print(json.dumps(rebuild(session), indent=2))
+    finally:
+        session.close()
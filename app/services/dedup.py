@@ -0,0 +1,284 @@
+"""
+Near-duplicate initiative detection with MinHash LSH
+
+Each initiative's title and description are reduced to word shingles and a
+MinHash signature (``DEDUP_NUM_PERM`` uint32 values). Two signatures agree
+on a position with probability equal to the Jaccard similarity of the
+shingle sets, so the fraction of equal positions estimates it.
+
+Signatures are split into ``DEDUP_BANDS`` bands; initiatives sharing any
+band are candidates. With 16 bands of 8 rows, pairs above ~0.7 similarity
+collide with high probability while dissimilar ones almost never do, so a
+lookup is a handful of dict probes regardless of catalog size.
+
+Signatures are computed on create/update and stored in
+``initiative_minhash``; the band index lives in memory, is built from that
+table on first use (or before forking, as a preloader) and picks up rows
+written by other workers through an ``updated_at`` high-water mark. Rows
+they delete leave nothing to follow, so their ``initiative:<id>`` cache
+invalidations mark those ids for a check on the next sync.
+
+    python -m app.services.dedup   # backfill signatures for existing initiatives
+"""
+import hashlib
+import logging
+import threading
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.invalidation import channel
+from app.core.warmup import register_preloader
+from app.models.initiative import Initiative
+from app.models.similarity import InitiativeMinHash
+from app.services.embeddings import tokenize
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+def _permutations(num_perm: int, seed: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+    return a, b
+
+_PERM_A, _PERM_B = _permutations(settings.DEDUP_NUM_PERM)
+
+def shingles(title: Optional[str], description: Optional[str], size: Optional[int] = None) -> Set[str]:
+    """Overlapping word n-grams of the title and description"""
+    size = size or settings.DEDUP_SHINGLE_SIZE
+    tokens = tokenize(f"{title or ''}\n{description or ''}")
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+def signature(shingle_set: Iterable[str]) -> Optional[np.ndarray]:
+    """MinHash signature of a shingle set, or None when it is empty"""
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set), dtype=np.uint64)
+    if not len(hashes):
+        return None
+    # Universal hashing (a*x + b) mod p, truncated to 32 bits; products wrap
+    # at 2**64 like the reference implementation
+    with np.errstate(over="ignore"):
+        values = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return values.min(axis=0).astype(np.uint32)
+
+def content_hash(title: Optional[str], description: Optional[str]) -> str:
+    return hashlib.sha1(f"{settings.DEDUP_NUM_PERM}\n{title or ''}\n{description or ''}".encode("utf-8")).hexdigest()
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+class MinHashLSH:
+    """In-memory LSH band index over initiative signatures"""
+
+    def __init__(self, num_perm: int, bands: int):
+        if num_perm % bands:
+            raise ValueError("DEDUP_BANDS must divide DEDUP_NUM_PERM")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets: List[Dict[bytes, Set[int]]] = [defaultdict(set) for _ in range(bands)]
+        self.signatures: Dict[int, np.ndarray] = {}
+        self.watermark: Optional[datetime] = None
+        self.suspects: Set[int] = set()  # may have been deleted by another worker
+        self.loaded = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _keys(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, initiative_id: int, sig: np.ndarray) -> None:
+        with self._lock:
+            self.remove(initiative_id)
+            self.signatures[initiative_id] = sig
+            for band, key in zip(self.buckets, self._keys(sig)):
+                band[key].add(initiative_id)
+
+    def remove(self, initiative_id: int) -> None:
+        with self._lock:
+            sig = self.signatures.pop(initiative_id, None)
+            if sig is None:
+                return
+            for band, key in zip(self.buckets, self._keys(sig)):
+                members = band.get(key)
+                if members is not None:
+                    members.discard(initiative_id)
+                    if not members:
+                        del band[key]
+
+    def query(self, sig: np.ndarray, threshold: float, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Indexed initiatives whose estimated similarity is at least ``threshold``"""
+        with self._lock:
+            candidates = set()
+            for band, key in zip(self.buckets, self._keys(sig)):
+                members = band.get(key)
+                if members:
+                    candidates |= members
+            candidates.discard(exclude)
+            scored = [(c, similarity(sig, self.signatures[c])) for c in candidates]
+        matches = [(c, s) for c, s in scored if s >= threshold]
+        return sorted(matches, key=lambda m: (-m[1], m[0]))
+
+    def clusters(self, threshold: float) -> List[List[int]]:
+        """
+        Connected groups of initiatives linked by a verified duplicate pair.
+
+        Each bucket is verified as a chain (every member against the
+        bucket's smallest id and its predecessor), which is linear in the
+        bucket size yet connects any tight group of near-duplicates.
+        """
+        parent: Dict[int, int] = {}
+
+        def find(x):
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        with self._lock:
+            for band in self.buckets:
+                for members in band.values():
+                    if len(members) < 2:
+                        continue
+                    ordered = sorted(members)
+                    head = ordered[0]
+                    for prev, current in zip(ordered, ordered[1:]):
+                        for other in {head, prev}:
+                            if find(other) != find(current) and \
+                                    similarity(self.signatures[other], self.signatures[current]) >= threshold:
+                                parent[find(current)] = find(other)
+
+        groups = defaultdict(list)
+        for node in parent:
+            groups[find(node)].append(node)
+        return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=lambda g: (-len(g), g[0]))
+
+    def suspect(self, initiative_ids: Iterable[int]) -> None:
+        """Check on the next sync whether these indexed initiatives still have a signature"""
+        with self._lock:
+            self.suspects.update(i for i in initiative_ids if i in self.signatures)
+
+    def sync(self, db: Session) -> None:
+        """Load signatures written and drop suspects deleted since the last sync (by any worker)"""
+        with self._lock:
+            suspects, self.suspects = self.suspects, set()
+        if suspects:
+            kept = set(db.execute(
+                select(InitiativeMinHash.initiative_id).where(InitiativeMinHash.initiative_id.in_(suspects))
+            ).scalars().all())
+            for initiative_id in suspects - kept:
+                self.remove(initiative_id)
+        query = select(InitiativeMinHash.initiative_id, InitiativeMinHash.signature, InitiativeMinHash.updated_at)
+        if self.watermark is not None:
+            query = query.where(InitiativeMinHash.updated_at >= self.watermark)
+        rows = db.execute(query).all()
+        with self._lock:
+            for row in rows:
+                self.add(row.initiative_id, np.frombuffer(row.signature, dtype="<u4"))
+                if self.watermark is None or row.updated_at > self.watermark:
+                    self.watermark = row.updated_at
+            self.loaded = True
+
+lsh = MinHashLSH(settings.DEDUP_NUM_PERM, settings.DEDUP_BANDS)
+
+def _on_invalidation(tags: List[str]) -> None:
+    """Other workers' deletions and text edits arrive as ``initiative:<id>`` invalidations"""
+    lsh.suspect(int(tag.split(":", 1)[1]) for tag in tags if tag.startswith("initiative:"))
+
+channel.subscribe(_on_invalidation)
+
+@register_preloader
+def _preload_index():
+    db = SessionLocal()
+    try:
+        lsh.sync(db)
+    finally:
+        db.close()
+
+def find_duplicates(db: Session, title: Optional[str], description: Optional[str],
+                    exclude_id: Optional[int] = None) -> Tuple[Optional[np.ndarray], List[Tuple[int, float]]]:
+    """Signature of the given text and the indexed initiatives it nearly duplicates"""
+    lsh.sync(db)
+    sig = signature(shingles(title, description))
+    if sig is None:
+        return None, []
+    return sig, lsh.query(sig, settings.DEDUP_THRESHOLD, exclude=exclude_id)
+
+def store_signature(db: Session, initiative_id: int, sig: Optional[np.ndarray],
+                    title: Optional[str], description: Optional[str]) -> None:
+    """Upsert the stored signature as part of the caller's transaction"""
+    row = db.get(InitiativeMinHash, initiative_id)
+    if sig is None:
+        if row is not None:
+            db.delete(row)
+        return
+    if row is None:
+        row = InitiativeMinHash(initiative_id=initiative_id)
+        db.add(row)
+    row.signature = sig.astype("<u4").tobytes()
+    row.content_hash = content_hash(title, description)
+    row.updated_at = datetime.utcnow()
+
+def forget(db: Session, initiative_id: int) -> None:
+    db.execute(delete(InitiativeMinHash).where(InitiativeMinHash.initiative_id == initiative_id))
+
+def describe(db: Session, matches: Sequence[Tuple[int, float]]) -> List[dict]:
+    """Attach titles to (id, similarity) matches, dropping initiatives that no longer exist"""
+    if not matches:
+        return []
+    titles = dict(db.execute(
+        select(Initiative.id, Initiative.title).where(Initiative.id.in_([m[0] for m in matches]))
+    ).all())
+    return [
+        {"id": initiative_id, "title": titles[initiative_id], "similarity": round(score, 3)}
+        for initiative_id, score in matches if initiative_id in titles
+    ]
+
+def duplicate_clusters(db: Session, threshold: float, limit: int) -> dict:
+    """Near-duplicate clusters across the whole catalog, largest first"""
+    lsh.sync(db)
+    groups = lsh.clusters(threshold)
+    clusters = []
+    for group in groups[:limit]:
+        head = lsh.signatures[group[0]]
+        members = describe(db, [(i, similarity(head, lsh.signatures[i])) for i in group])
+        if len(members) > 1:
+            clusters.append({"size": len(members), "initiatives": members})
+    return {"total_clusters": len(groups), "indexed": len(lsh), "threshold": threshold, "clusters": clusters}
+
+def backfill(db: Session, batch_size: int = 1000) -> dict:
+    """Compute signatures for initiatives that have none or whose text changed"""
+    stored = dict(db.execute(select(InitiativeMinHash.initiative_id, InitiativeMinHash.content_hash)).all())
+    updated = 0
+    rows = db.execute(select(Initiative.id, Initiative.title, Initiative.description)).all()
+    for start in range(0, len(rows), batch_size):
+        for row in rows[start:start + batch_size]:
+            if stored.get(row.id) == content_hash(row.title, row.description):
+                continue
+            store_signature(db, row.id, signature(shingles(row.title, row.description)), row.title, row.description)
+            updated += 1
+        db.commit()
+    lsh.sync(db)
+    return {"initiatives": len(rows), "updated": updated, "indexed": len(lsh)}
+
+if __name__ == "__main__":
+    import json
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        print(json.dumps(backfill(session), indent=2))
+    finally:
+        session.close()
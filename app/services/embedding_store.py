@@ -0,0 +1,416 @@
+"""
+Memory-mapped initiative embedding store shared by every worker
+
+The embedding matrix lives in one binary file that every worker maps with
+``numpy.memmap``, so all processes read the same page-cache pages instead of
+each holding a private copy. Layout (little-endian, sections 64-byte aligned):
+
+    header      magic ``IEMB``, version, dtype (float32 / float16), dim,
+                capacity, row count, generation, sync watermarks, model
+    ids         int64[capacity]          initiative id of each row
+    tombstones  bit[capacity]            deleted rows
+    matrix      dtype[capacity, dim]     L2-normalized vectors
+
+* **Append-only** - a new or changed embedding is written to the next free
+  row and only then published by bumping the row count, so readers never
+  see a half-written row; the previous row of that initiative is
+  tombstoned. A full file is copied into one of twice the capacity.
+* **Compaction** drops tombstoned rows into a new file and increments the
+  generation, which renumbers rows (row-addressed structures such as the
+  HNSW graph are rebuilt for it).
+* **Atomic swaps** - copies are written to a temporary file and renamed
+  over the store. Readers keep their old mapping until they ``refresh()``
+  and notice the new inode.
+
+One process writes at a time (``fcntl.flock`` on ``<path>.lock``). Rows are
+pulled from ``initiative_embeddings`` through ``updated_at`` / ``deleted_at``
+high-water marks kept in the header, so whichever worker syncs continues
+where the last one stopped. Purged initiatives leave no ``deleted_at`` to
+follow; when the store holds more live rows than the database has
+embeddings, the ids are reconciled and the missing ones tombstoned.
+
+    python -m app.services.embedding_store            # sync from the database
+    python -m app.services.embedding_store --compact  # and drop deleted rows
+"""
+import fcntl
+import logging
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.embedding import InitiativeEmbedding
+from app.models.initiative import Initiative
+from app.services.embeddings import current_model_name
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"IEMB"
+VERSION = 1
+# magic, version, dtype code, dim, capacity, count, generation, watermark, deleted watermark, model
+HEADER = struct.Struct("<4sHBxI4xQQQdd64s")
+HEADER_SIZE = 128
+COUNT_OFFSET = 24
+WATERMARK_OFFSET = 40
+ALIGN = 64
+MIN_CAPACITY = 1024
+
+DTYPES = {0: np.dtype("<f4"), 1: np.dtype("<f2")}
+DTYPE_CODES = {"float32": 0, "float16": 1}
+
+_EPOCH = datetime(1970, 1, 1)
+
+def _align(offset: int) -> int:
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+def _layout(capacity: int, dim: int, itemsize: int):
+    """Byte offsets of the id, tombstone and matrix sections, and the file size"""
+    ids = HEADER_SIZE
+    tombstones = _align(ids + 8 * capacity)
+    matrix = _align(tombstones + (capacity + 7) // 8)
+    return ids, tombstones, matrix, _align(matrix + capacity * dim * itemsize)
+
+def _stamp(value: Optional[datetime]) -> float:
+    return (value - _EPOCH).total_seconds() if value is not None else float("nan")
+
+def _unstamp(value: float) -> Optional[datetime]:
+    return None if value != value else datetime.utcfromtimestamp(value)
+
+class _Mapping:
+    """Typed views over one mapped store file"""
+
+    def __init__(self, path: str, writable: bool):
+        self.inode = os.stat(path).st_ino
+        self.raw = np.memmap(path, dtype=np.uint8, mode="r+" if writable else "r")
+        (magic, version, code, self.dim, self.capacity, _, self.generation,
+         watermark, deleted_watermark, model) = HEADER.unpack_from(self.raw, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an embedding store (version {VERSION})")
+        self.dtype = DTYPES[code]
+        self.model = model.rstrip(b"\0").decode("utf-8")
+        self.watermark, self.deleted_watermark = _unstamp(watermark), _unstamp(deleted_watermark)
+        ids, tombstones, matrix, _ = _layout(self.capacity, self.dim, self.dtype.itemsize)
+        self.count_view = self.raw[COUNT_OFFSET:COUNT_OFFSET + 8].view("<u8")
+        self.ids = self.raw[ids:ids + 8 * self.capacity].view("<i8")
+        self.tombstones = self.raw[tombstones:tombstones + (self.capacity + 7) // 8]
+        self.matrix = self.raw[matrix:matrix + self.capacity * self.dim * self.dtype.itemsize] \
+            .view(self.dtype).reshape(self.capacity, self.dim)
+
+    @property
+    def count(self) -> int:
+        return int(self.count_view[0])
+
+def write_store(path: str, dim: int, model: str, capacity: int, dtype: str = "float32",
+                generation: int = 0, watermark: Optional[datetime] = None,
+                deleted_watermark: Optional[datetime] = None,
+                ids: Optional[np.ndarray] = None, matrix: Optional[np.ndarray] = None,
+                tombstones: Optional[np.ndarray] = None,
+                before_swap: Optional[Callable[[str], None]] = None) -> None:
+    """
+    Write a complete store file next to ``path`` and rename it into place.
+    ``before_swap(temporary_path)`` runs once the new file is complete.
+    """
+    code = DTYPE_CODES[dtype]
+    count = 0 if ids is None else len(ids)
+    capacity = max(capacity, count, MIN_CAPACITY)
+    ids_offset, tombstones_offset, matrix_offset, size = _layout(capacity, dim, DTYPES[code].itemsize)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(temporary, "wb") as handle:
+        handle.truncate(size)
+        handle.write(HEADER.pack(MAGIC, VERSION, code, dim, capacity, count, generation, _stamp(watermark),
+                                 _stamp(deleted_watermark), model.encode("utf-8")[:64]))
+        if count:
+            handle.seek(ids_offset)
+            handle.write(np.ascontiguousarray(ids, dtype="<i8").tobytes())
+            if tombstones is not None:
+                handle.seek(tombstones_offset)
+                handle.write(np.packbits(tombstones[:count].astype(bool), bitorder="little").tobytes())
+            handle.seek(matrix_offset)
+            handle.write(np.ascontiguousarray(matrix, dtype=DTYPES[code]).tobytes())
+        handle.flush()
+        os.fsync(handle.fileno())
+    if before_swap is not None:
+        before_swap(temporary)
+    os.replace(temporary, path)
+
+class EmbeddingStore:
+    """Reader and (under the file lock) writer of one embedding store file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mapping: Optional[_Mapping] = None
+        self._writer: Optional[_Mapping] = None
+        self.rows: Dict[int, int] = {}  # initiative id -> newest row
+        self._seen = 0
+        self._lock = threading.RLock()
+
+    # -- reading ---------------------------------------------------------
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def refresh(self) -> "EmbeddingStore":
+        """Pick up rows appended and files swapped in by any process"""
+        with self._lock:
+            if not self.exists():
+                self._mapping, self.rows, self._seen = None, {}, 0
+                return self
+            inode = os.stat(self.path).st_ino
+            if self._mapping is None or self._mapping.inode != inode:
+                previous = self._mapping
+                self._mapping = _Mapping(self.path, writable=False)
+                if previous is None or previous.generation != self._mapping.generation:
+                    self.rows, self._seen = {}, 0
+            count = self._mapping.count
+            if count > self._seen:
+                labels = self._mapping.ids[self._seen:count].tolist()
+                self.rows.update(zip(labels, range(self._seen, count)))
+                self._seen = count
+            return self
+
+    @property
+    def mapping(self) -> Optional[_Mapping]:
+        return self._mapping
+
+    @property
+    def count(self) -> int:
+        return self._seen
+
+    @property
+    def generation(self) -> int:
+        return self._mapping.generation if self._mapping is not None else -1
+
+    @property
+    def model(self) -> Optional[str]:
+        return self._mapping.model if self._mapping is not None else None
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._mapping.dim if self._mapping is not None else None
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._mapping.ids[:self._seen] if self._mapping is not None else np.empty(0, dtype="<i8")
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Published rows as a read-only (count, dim) view of the shared pages"""
+        if self._mapping is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._mapping.matrix[:self._seen]
+
+    def deleted(self, count: Optional[int] = None) -> np.ndarray:
+        """Boolean tombstone flags of the first ``count`` rows (default: all published)"""
+        count = self._seen if count is None else count
+        if self._mapping is None or not count:
+            return np.zeros(count, dtype=bool)
+        bits = np.unpackbits(self._mapping.tombstones[:(count + 7) // 8], bitorder="little")
+        return bits[:count].astype(bool)
+
+    def live(self) -> int:
+        return self._seen - int(self.deleted().sum())
+
+    def get(self, initiative_id: int) -> Optional[np.ndarray]:
+        row = self.rows.get(initiative_id)
+        if row is None or self._mapping.tombstones[row >> 3] & (1 << (row & 7)):
+            return None
+        return np.asarray(self._mapping.matrix[row], dtype=np.float32)
+
+    # -- writing ---------------------------------------------------------
+
+    @contextmanager
+    def writing(self, blocking: bool = True) -> Iterator[bool]:
+        """Hold the cross-process write lock; yields False if ``blocking`` is off and it is taken"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._lock, open(f"{self.path}.lock", "a+b") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                self.refresh()
+                self._writer = _Mapping(self.path, writable=True) if self.exists() else None
+                yield True
+                if self._writer is not None:
+                    self._writer.raw.flush()
+            finally:
+                self._writer = None
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _require_writer(self) -> _Mapping:
+        if self._writer is None:
+            raise RuntimeError("embedding store writes need the write lock (and an existing store)")
+        return self._writer
+
+    def reset(self, model: str, dim: int, dtype: Optional[str] = None) -> None:
+        """Replace the store with an empty one (new model, dimension or dtype)"""
+        generation = self.generation + 1 if self._mapping is not None else 0
+        write_store(self.path, dim, model, MIN_CAPACITY, dtype or settings.EMBEDDING_STORE_DTYPE, generation)
+        self.refresh()
+        self._writer = _Mapping(self.path, writable=True)
+
+    def _grow(self) -> None:
+        """Copy into a file of twice the capacity; row numbers are kept"""
+        writer = self._require_writer()
+        count = writer.count
+        write_store(
+            self.path, writer.dim, writer.model, 2 * writer.capacity, _dtype_name(writer.dtype),
+            writer.generation, writer.watermark, writer.deleted_watermark,
+            writer.ids[:count], writer.matrix[:count],
+            np.unpackbits(writer.tombstones[:(count + 7) // 8], bitorder="little")[:count],
+        )
+        self.refresh()
+        self._writer = _Mapping(self.path, writable=True)
+
+    def _tombstone(self, writer: _Mapping, row: int) -> None:
+        writer.tombstones[row >> 3] |= np.uint8(1 << (row & 7))
+
+    def append(self, initiative_id: int, vector: np.ndarray) -> None:
+        """Store a new vector for ``initiative_id``, tombstoning its previous row"""
+        writer = self._require_writer()
+        previous = self.rows.get(initiative_id)
+        if previous is not None:
+            if np.array_equal(writer.matrix[previous], np.asarray(vector, dtype=writer.dtype)) \
+                    and not writer.tombstones[previous >> 3] & (1 << (previous & 7)):
+                return
+            self._tombstone(writer, previous)
+        if writer.count == writer.capacity:
+            self._grow()
+            writer = self._writer
+        row = writer.count
+        writer.ids[row] = initiative_id
+        writer.matrix[row] = vector
+        # Publish only once the row is complete
+        writer.count_view[0] = row + 1
+        self.refresh()
+
+    def delete(self, initiative_id: int) -> bool:
+        writer = self._require_writer()
+        row = self.rows.get(initiative_id)
+        if row is None:
+            return False
+        self._tombstone(writer, row)
+        return True
+
+    def set_watermarks(self, watermark: Optional[datetime], deleted_watermark: Optional[datetime]) -> None:
+        writer = self._require_writer()
+        writer.raw[WATERMARK_OFFSET:WATERMARK_OFFSET + 16].view("<f8")[:] = (_stamp(watermark), _stamp(deleted_watermark))
+        writer.watermark, writer.deleted_watermark = watermark, deleted_watermark
+
+    def compact(self, before_swap: Optional[Callable[[str], None]] = None) -> dict:
+        """Rewrite the live rows into a new generation (needs the write lock)"""
+        writer = self._require_writer()
+        count = writer.count
+        live = ~np.unpackbits(writer.tombstones[:(count + 7) // 8], bitorder="little")[:count].astype(bool)
+        write_store(
+            self.path, writer.dim, writer.model, 2 * int(live.sum()), _dtype_name(writer.dtype),
+            writer.generation + 1, writer.watermark, writer.deleted_watermark,
+            writer.ids[:count][live], writer.matrix[:count][live], before_swap=before_swap,
+        )
+        self.refresh()
+        self._writer = _Mapping(self.path, writable=True)
+        return {"rows_before": count, "rows_after": int(live.sum()), "generation": self.generation}
+
+    def stats(self) -> dict:
+        self.refresh()
+        if self._mapping is None:
+            return {"path": self.path, "exists": False}
+        return {
+            "path": self.path, "model": self.model, "dim": self.dim, "dtype": _dtype_name(self._mapping.dtype),
+            "generation": self.generation, "rows": self.count, "live": self.live(),
+            "capacity": self._mapping.capacity, "file_bytes": os.path.getsize(self.path),
+        }
+
+def _dtype_name(dtype: np.dtype) -> str:
+    return "float16" if dtype.itemsize == 2 else "float32"
+
+store = EmbeddingStore(settings.EMBEDDING_STORE_PATH)
+
+def sync(db: Session, blocking: bool = False) -> EmbeddingStore:
+    """
+    Append embeddings written and tombstone initiatives deleted since the
+    store's watermarks. Without ``blocking``, a sync already running in
+    another process is left to finish and only its results are read.
+    """
+    model = current_model_name()
+    with store.writing(blocking) as locked:
+        if locked:
+            _apply_changes(db, model)
+    return store.refresh()
+
+def _apply_changes(db: Session, model: str) -> None:
+    if not store.exists() or store.model != model or store._writer is None \
+            or _dtype_name(store.mapping.dtype) != settings.EMBEDDING_STORE_DTYPE:
+        dim = db.execute(
+            select(InitiativeEmbedding.dim).where(InitiativeEmbedding.model == model).limit(1)
+        ).scalar()
+        store.reset(model, int(dim or settings.EMBEDDING_DIM))
+    writer = store._require_writer()
+    watermark, deleted_watermark = writer.watermark, writer.deleted_watermark
+
+    query = (
+        select(InitiativeEmbedding.initiative_id, InitiativeEmbedding.vector,
+               InitiativeEmbedding.dim, InitiativeEmbedding.updated_at)
+        # Joining the initiative leaves soft-deleted ones out
+        .join(Initiative, Initiative.id == InitiativeEmbedding.initiative_id)
+        .where(InitiativeEmbedding.model == model)
+    )
+    if watermark is not None:
+        query = query.where(InitiativeEmbedding.updated_at >= watermark)
+    for row in db.execute(query.order_by(InitiativeEmbedding.updated_at)).all():
+        if row.dim == store.dim:
+            store.append(row.initiative_id, np.frombuffer(row.vector, dtype="<f4"))
+        if row.updated_at is not None and (watermark is None or row.updated_at > watermark):
+            watermark = row.updated_at
+
+    deleted = select(Initiative.id, Initiative.deleted_at).where(Initiative.deleted_at.isnot(None))
+    if deleted_watermark is not None:
+        deleted = deleted.where(Initiative.deleted_at >= deleted_watermark)
+    for initiative_id, deleted_at in db.execute(deleted.execution_options(include_deleted=True)).all():
+        store.delete(initiative_id)
+        if deleted_watermark is None or deleted_at > deleted_watermark:
+            deleted_watermark = deleted_at
+    store.set_watermarks(watermark, deleted_watermark)
+    _drop_purged(db, model)
+
+def _drop_purged(db: Session, model: str) -> None:
+    """Tombstone rows of initiatives hard-deleted before a sync saw their ``deleted_at``"""
+    embedded = (
+        select(InitiativeEmbedding.initiative_id)
+        .join(Initiative, Initiative.id == InitiativeEmbedding.initiative_id)
+        .where(InitiativeEmbedding.model == model, InitiativeEmbedding.dim == store.dim)
+    )
+    expected = db.execute(select(func.count()).select_from(embedded.subquery())).scalar()
+    if store.live() <= expected:
+        return
+    present = set(db.execute(embedded).scalars().all())
+    purged = [initiative_id for initiative_id in store.rows if initiative_id not in present]
+    for initiative_id in purged:
+        store.delete(initiative_id)
+    logger.info("tombstoned %d purged initiatives in the embedding store", len(purged))
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Sync the embedding store from the database")
+    parser.add_argument("--compact", action="store_true", help="drop deleted rows afterwards")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        sync(session, blocking=True)
+        if args.compact:
+            with store.writing() as locked:
+                print(json.dumps(store.compact(), indent=2))
+        print(json.dumps(store.stats(), indent=2))
+    finally:
+        session.close()
@@ -0,0 +1,173 @@
+"""
+Text embedding service
+
+The sentence-transformers model (and torch behind it) is only imported and
+loaded the first time an embedding is requested.
+
+``EMBEDDING_BACKEND`` selects the encoder:
+
+* ``sentence-transformers`` - the configured transformer model
+* ``hashing`` - dependency-free feature hashing of word uni/bigrams; lower
+  quality but deterministic and fast, useful for tests and offline setups
+* ``auto`` - sentence-transformers when installed, otherwise hashing
+
+Writes enqueue ``embed_initiative``; initiatives that existed before (or
+after a model change) are embedded in batches by the backfill:
+
+    python -m app.services.embeddings   # embed existing initiatives
+"""
+import hashlib
+import logging
+import re
+import threading
+from typing import List, Optional, Sequence
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import enqueue, enqueue_many, job_handler
+from app.core.lazy import lazy_import
+from app.models.embedding import InitiativeEmbedding
+from app.models.initiative import Initiative
+from app.schemas.base import get_list_from_json
+
+logger = logging.getLogger(__name__)
+
+sentence_transformers = lazy_import("sentence_transformers")
+
+_model = None
+_backend = None
+_model_lock = threading.Lock()
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+
+def _resolve_backend() -> str:
+    global _backend
+    if _backend is None:
+        backend = settings.EMBEDDING_BACKEND
+        if backend == "auto":
+            try:
+                sentence_transformers.SentenceTransformer
+                backend = "sentence-transformers"
+            except ImportError:
+                logger.warning("sentence-transformers not installed; using hashing embeddings")
+                backend = "hashing"
+        _backend = backend
+    return _backend
+
+def get_embedding_model():
+    """Load the configured SentenceTransformer model once per process"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = sentence_transformers.SentenceTransformer(settings.EMBEDDING_MODEL)
+    return _model
+
+def current_model_name() -> str:
+    """Identifier stored alongside vectors so mixed encoders are never compared"""
+    if _resolve_backend() == "hashing":
+        return f"hashing-{settings.EMBEDDING_DIM}"
+    return settings.EMBEDDING_MODEL
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+def _hash_embed(texts: Sequence[str], dim: int) -> np.ndarray:
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            out[row, digest % dim] += 1.0 if (digest >> 63) & 1 else -1.0
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return out / norms
+
+def embed_matrix(texts: Sequence[str]) -> np.ndarray:
+    """Embed texts as an (n, dim) float32 matrix of L2-normalized rows"""
+    if _resolve_backend() == "hashing":
+        return _hash_embed(texts, settings.EMBEDDING_DIM)
+    model = get_embedding_model()
+    return np.asarray(model.encode(list(texts), normalize_embeddings=True), dtype=np.float32)
+
+def initiative_text(initiative) -> str:
+    """Text representation of an initiative used for embedding"""
+    parts = [
+        initiative.title or "",
+        initiative.description or "",
+        " ".join(get_list_from_json(initiative.skills_needed)),
+        " ".join(get_list_from_json(initiative.tags)),
+        " ".join(get_list_from_json(initiative.industries)),
+        initiative.practice_area or "",
+    ]
+    return "\n".join(p for p in parts if p)
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(f"{current_model_name()}\n{text}".encode("utf-8")).hexdigest()
+
+@job_handler("embed_initiative")
+def embed_initiative(db: Session, initiative_id: int, payload: dict) -> None:
+    """(Re)compute and store the embedding of one initiative"""
+    initiative = db.get(Initiative, initiative_id)
+    existing = db.get(InitiativeEmbedding, initiative_id)
+    if initiative is None:
+        if existing is not None:
+            db.delete(existing)
+        enqueue(db, "refresh_neighbors", initiative_id)
+        return
+
+    text = initiative_text(initiative)
+    digest = content_hash(text)
+    if existing is not None and existing.content_hash == digest:
+        return
+
+    _store(db, initiative_id, existing, embed_matrix([text])[0], digest)
+    # Similar-initiative lists depend on the vector
+    enqueue(db, "refresh_neighbors", initiative_id)
+
+def _store(db: Session, initiative_id: int, existing: Optional[InitiativeEmbedding], vector: np.ndarray,
+           digest: str) -> None:
+    vector = vector.astype("<f4")
+    if existing is None:
+        existing = InitiativeEmbedding(initiative_id=initiative_id)
+        db.add(existing)
+    existing.model = current_model_name()
+    existing.dim = int(vector.shape[0])
+    existing.vector = vector.tobytes()
+    existing.content_hash = digest
+
+def backfill(db: Session, batch_size: int = 256) -> dict:
+    """Embed initiatives that have no vector for the current model or whose text changed"""
+    stored = dict(db.execute(select(InitiativeEmbedding.initiative_id, InitiativeEmbedding.content_hash)).all())
+    ids = db.execute(select(Initiative.id).order_by(Initiative.id)).scalars().all()
+    embedded = 0
+    for start in range(0, len(ids), batch_size):
+        pending = []
+        for initiative in db.query(Initiative).filter(Initiative.id.in_(ids[start:start + batch_size])):
+            text = initiative_text(initiative)
+            digest = content_hash(text)
+            if stored.get(initiative.id) != digest:
+                pending.append((initiative.id, text, digest))
+        if not pending:
+            continue
+        # One encoder call per batch
+        vectors = embed_matrix([text for _, text, _ in pending])
+        for (initiative_id, _, digest), vector in zip(pending, vectors):
+            _store(db, initiative_id, db.get(InitiativeEmbedding, initiative_id), vector, digest)
+        enqueue_many(db, "refresh_neighbors", [initiative_id for initiative_id, _, _ in pending])
+        db.commit()
+        embedded += len(pending)
+    return {"initiatives": len(ids), "embedded": embedded}
+
+if __name__ == "__main__":
+    import json
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        print(json.dumps(backfill(session), indent=2))
+    finally:
+        session.close()
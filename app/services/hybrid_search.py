@@ -0,0 +1,74 @@
+"""
+Hybrid lexical + semantic ranking
+
+Keyword search finds exact names (a skill, a client, a practice) that an
+embedding may blur; semantic search finds paraphrases keywords miss. Hybrid
+search runs both retrievers and fuses their rankings:
+
+* **Lexical** - every query term (and the whole phrase) is matched against
+  the initiative fields, each hit weighted by ``SEARCH_FIELD_BOOSTS``
+  (title, tags and skills above description), scored in SQL.
+* **Semantic** - the filtered vector index (``app.services.vector_index``).
+* **Fusion** - reciprocal rank fusion, ``sum(w / (k + rank))`` over the
+  lists a document appears in (``rrf``, robust to incomparable scores), or
+  a weighted sum of min-max normalized scores (``weighted``).
+  ``SEARCH_HYBRID_SEMANTIC_WEIGHT`` splits ``w`` between the two lists.
+"""
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import case, literal
+from app.core.config import settings
+from app.models.initiative import Initiative
+
+FUSIONS = ("rrf", "weighted")
+
+Hits = Sequence[Tuple[int, float]]
+
+def terms(query: str) -> List[str]:
+    """Distinct lowercase query words, plus the whole phrase when it has several"""
+    words = list(dict.fromkeys(re.findall(r"[\w+#.-]{2,}", query.lower())))
+    phrase = " ".join(query.lower().split())
+    return words + [phrase] if len(words) > 1 else words
+
+def lexical_score(query: str):
+    """SQL expression scoring an initiative's field-boosted term hits for ``query``"""
+    score = literal(0.0)
+    for term in terms(query):
+        pattern = f"%{term}%"
+        for field, boost in settings.SEARCH_FIELD_BOOSTS.items():
+            score = score + case((getattr(Initiative, field).ilike(pattern), boost), else_=0.0)
+    return score
+
+def reciprocal_rank_fusion(lexical: Hits, semantic: Hits, semantic_weight: float, k: int) -> Dict[int, float]:
+    fused: Dict[int, float] = {}
+    for hits, weight in ((lexical, 1.0 - semantic_weight), (semantic, semantic_weight)):
+        for rank, (initiative_id, _) in enumerate(hits, start=1):
+            fused[initiative_id] = fused.get(initiative_id, 0.0) + weight / (k + rank)
+    return fused
+
+def _normalized(hits: Hits) -> Dict[int, float]:
+    if not hits:
+        return {}
+    scores = [score for _, score in hits]
+    low, high = min(scores), max(scores)
+    span = high - low
+    return {initiative_id: (score - low) / span if span else 1.0 for initiative_id, score in hits}
+
+def weighted_fusion(lexical: Hits, semantic: Hits, semantic_weight: float) -> Dict[int, float]:
+    fused: Dict[int, float] = {}
+    for hits, weight in ((lexical, 1.0 - semantic_weight), (semantic, semantic_weight)):
+        for initiative_id, score in _normalized(hits).items():
+            fused[initiative_id] = fused.get(initiative_id, 0.0) + weight * score
+    return fused
+
+def fuse(lexical: Hits, semantic: Optional[Hits], fusion: Optional[str] = None) -> List[Tuple[int, float]]:
+    """(initiative_id, fused score) best first; ``semantic`` is None when nothing is indexed"""
+    fusion = fusion or settings.SEARCH_HYBRID_FUSION
+    if fusion not in FUSIONS:
+        raise ValueError(f"unknown fusion {fusion!r}; expected one of {FUSIONS}")
+    weight = settings.SEARCH_HYBRID_SEMANTIC_WEIGHT if semantic is not None else 0.0
+    if fusion == "rrf":
+        fused = reciprocal_rank_fusion(lexical, semantic or [], weight, settings.SEARCH_HYBRID_RRF_K)
+    else:
+        fused = weighted_fusion(lexical, semantic or [], weight)
+    return sorted(fused.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,196 @@
+"""
+Asynchronous purge of soft-deleted initiatives and users
+
+Deleting an initiative or a user only stamps ``deleted_at`` (hiding the row
+from every ORM query) and queues a ``purge_initiative`` / ``purge_user``
+job, so the request does not wait on the rows that hang off it. The job
+removes those dependents in chunks of ``PURGE_BATCH_SIZE`` rows, committing
+after each chunk, and deletes the row itself last.
+
+The foreign keys are declared ``ON DELETE CASCADE`` (enforced on SQLite
+through ``PRAGMA foreign_keys``), which keeps the database consistent if a
+row is ever deleted directly. The purge still deletes dependents
+explicitly: it bounds the size of each transaction, keeps the denormalized
+counters of other initiatives right, and works on databases created before
+the cascades were declared. Every step is idempotent, so a failed purge
+simply resumes when the job is retried.
+"""
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import enqueue_many, job_handler
+from app.models.analytics import EngagementDaily, EngagementHourly
+from app.models.dashboard import InitiativeSummary
+from app.models.embedding import InitiativeEmbedding
+from app.models.engagement import InitiativeApplication, InitiativeView, SavedInitiative
+from app.models.initiative import Initiative
+from app.models.recommendation import PopularInitiative
+from app.models.similarity import InitiativeMinHash, InitiativeNeighbor
+from app.models.tagging import InitiativeAutoTags
+from app.models.trending import TrendingScore
+from app.models.user import User
+from app.services import applications, dashboard
+
+logger = logging.getLogger(__name__)
+
+# Rows keyed by the initiative, removed before the initiative itself
+INITIATIVE_DEPENDENTS = [
+    (SavedInitiative, SavedInitiative.initiative_id),
+    (InitiativeApplication, InitiativeApplication.initiative_id),
+    (InitiativeView, InitiativeView.initiative_id),
+    (InitiativeEmbedding, InitiativeEmbedding.initiative_id),
+    (InitiativeAutoTags, InitiativeAutoTags.initiative_id),
+    (InitiativeMinHash, InitiativeMinHash.initiative_id),
+    (InitiativeNeighbor, InitiativeNeighbor.initiative_id),
+    (InitiativeSummary, InitiativeSummary.initiative_id),
+    (PopularInitiative, PopularInitiative.initiative_id),
+    (TrendingScore, TrendingScore.initiative_id),
+    (EngagementHourly, EngagementHourly.initiative_id),
+    (EngagementDaily, EngagementDaily.initiative_id),
+]
+
+def _batch(model, condition, batch_size: int):
+    """Primary keys of at most ``batch_size`` rows matching ``condition``"""
+    key = list(model.__table__.primary_key.columns)
+    chunk = select(*key).where(condition).limit(batch_size)
+    return (key[0] if len(key) == 1 else tuple_(*key)).in_(chunk)
+
+def delete_in_batches(db: Session, model, condition, batch_size: Optional[int] = None,
+                      returning=None) -> List:
+    """
+    Delete the rows matching ``condition`` one committed chunk at a time.
+    Returns the ``returning`` column of every deleted row (empty without it).
+    """
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    returned = []
+    while True:
+        stmt = delete(model).where(_batch(model, condition, batch_size)).execution_options(synchronize_session=False)
+        if returning is not None:
+            values = db.execute(stmt.returning(returning)).scalars().all()
+            returned.extend(values)
+            deleted = len(values)
+        else:
+            deleted = db.execute(stmt).rowcount
+        db.commit()
+        if deleted < batch_size:
+            return returned
+
+def _recount(db: Session, initiative_ids: Iterable[int]) -> None:
+    """Recompute the save/application counters of initiatives that lost rows"""
+    ids = list(set(initiative_ids))
+    if not ids:
+        return
+    db.execute(
+        update(Initiative)
+        .where(Initiative.id.in_(ids))
+        .values(
+            save_count=select(func.count(SavedInitiative.id))
+            .where(SavedInitiative.initiative_id == Initiative.id).scalar_subquery(),
+            application_count=select(func.count(InitiativeApplication.id))
+            .where(InitiativeApplication.initiative_id == Initiative.id).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    applications.apply_capacity(db, ids)
+    dashboard.refresh(db, ids)
+    db.commit()
+
+def purge_initiative_rows(db: Session, initiative_id: int) -> bool:
+    """Delete a soft-deleted initiative and everything that references it"""
+    deleted_at = db.execute(
+        select(Initiative.deleted_at).where(Initiative.id == initiative_id)
+        .execution_options(include_deleted=True)
+    ).scalar()
+    if deleted_at is None:
+        # Already purged, or never soft-deleted
+        return False
+
+    # Lists that point at the initiative are recomputed without it
+    pointing = delete_in_batches(
+        db, InitiativeNeighbor, InitiativeNeighbor.neighbor_id == initiative_id,
+        returning=InitiativeNeighbor.initiative_id,
+    )
+    pointing = [i for i in dict.fromkeys(pointing) if i != initiative_id]
+    if pointing:
+        enqueue_many(db, "refresh_neighbors", pointing)
+        db.commit()
+    for model, column in INITIATIVE_DEPENDENTS:
+        delete_in_batches(db, model, column == initiative_id)
+
+    db.execute(delete(Initiative).where(Initiative.id == initiative_id))
+    db.commit()
+    return True
+
+def purge_user_rows(db: Session, user_id: int) -> bool:
+    """Delete a soft-deleted user, their engagement and the initiatives they own"""
+    deleted_at = db.execute(
+        select(User.deleted_at).where(User.id == user_id).execution_options(include_deleted=True)
+    ).scalar()
+    if deleted_at is None:
+        return False
+
+    touched = delete_in_batches(db, SavedInitiative, SavedInitiative.user_id == user_id,
+                                returning=SavedInitiative.initiative_id)
+    touched += delete_in_batches(db, InitiativeApplication, InitiativeApplication.user_id == user_id,
+                                 returning=InitiativeApplication.initiative_id)
+    delete_in_batches(db, InitiativeView, InitiativeView.user_id == user_id)
+
+    owned = db.execute(
+        select(Initiative.id, Initiative.deleted_at).where(Initiative.owner_id == user_id)
+        .execution_options(include_deleted=True)
+    ).all()
+    owned_ids = {initiative_id for initiative_id, _ in owned}
+    _recount(db, [i for i in touched if i not in owned_ids])
+
+    live = [initiative_id for initiative_id, stamp in owned if stamp is None]
+    if live:
+        db.execute(
+            update(Initiative).where(Initiative.id.in_(live))
+            .values(deleted_at=datetime.utcnow()).execution_options(synchronize_session=False)
+        )
+        db.commit()
+    for initiative_id in owned_ids:
+        purge_initiative_rows(db, initiative_id)
+
+    delete_in_batches(db, InitiativeSummary, InitiativeSummary.owner_id == user_id)
+    db.execute(delete(User).where(User.id == user_id))
+    db.commit()
+    return True
+
+@job_handler("purge_initiative")
+def purge_initiative(db: Session, initiative_id: int, payload: dict) -> None:
+    if purge_initiative_rows(db, initiative_id):
+        logger.info("purged initiative %s", initiative_id)
+
+@job_handler("purge_user")
+def purge_user(db: Session, user_id: int, payload: dict) -> None:
+    if purge_user_rows(db, user_id):
+        logger.info("purged user %s", user_id)
+
+def purge_all(db: Session) -> dict:
+    """Purge every soft-deleted row now (users first, they own initiatives)"""
+    users = db.execute(
+        select(User.id).where(User.deleted_at.is_not(None)).execution_options(include_deleted=True)
+    ).scalars().all()
+    for user_id in users:
+        purge_user_rows(db, user_id)
+    initiatives = db.execute(
+        select(Initiative.id).where(Initiative.deleted_at.is_not(None)).execution_options(include_deleted=True)
+    ).scalars().all()
+    for initiative_id in initiatives:
+        purge_initiative_rows(db, initiative_id)
+    return {"users": len(users), "initiatives": len(initiatives)}
+
+if __name__ == "__main__":
+    import json
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        print(json.dumps(purge_all(session), indent=2))
+    finally:
+        session.close()
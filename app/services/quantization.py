@@ -0,0 +1,135 @@
+"""
+Scalar quantization of embedding vectors
+
+Scoring a query against a float32 matrix is bound by memory bandwidth; a
+compressed copy moves a half (``float16``) or a quarter (``int8``) of the
+bytes. ``int8`` stores each component as an unsigned byte with a
+per-dimension offset and scale fitted on the data:
+
+    x ~ offset + scale * code        code in 0..255
+
+so ``q . x ~ q . offset + (q * scale) . code`` - one pass over the codes.
+Quantized scores rank candidates; the best ``k * VECTOR_RERANK_FACTOR`` are
+then re-scored against the full-precision vectors, which recovers almost
+all of the recall lost to rounding.
+"""
+from typing import Optional, Sequence
+import numpy as np
+
+# Rows decoded and scored per block; small enough to stay in cache
+BLOCK_ROWS = 512
+
+class ScalarQuantizer:
+    """Per-dimension affine int8 codes, or float16, for a matrix of vectors"""
+
+    def __init__(self, kind: str, offset: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None):
+        if kind not in ("float16", "int8"):
+            raise ValueError(f"unknown quantization {kind!r}; expected float16 or int8")
+        self.kind = kind
+        self.offset = offset
+        self.scale = scale
+
+    @classmethod
+    def fit(cls, kind: str, sample: np.ndarray, dim: int) -> "ScalarQuantizer":
+        """Quantizer for vectors like ``sample`` (unit-vector range when it is empty)"""
+        if kind == "float16":
+            return cls(kind)
+        if len(sample):
+            sample = np.asarray(sample, dtype=np.float32)
+            low, high = sample.min(axis=0), sample.max(axis=0)
+        else:
+            low, high = np.full(dim, -1.0, dtype=np.float32), np.full(dim, 1.0, dtype=np.float32)
+        scale = (high - low) / 255.0
+        scale[scale == 0] = 1.0
+        return cls(kind, low.astype(np.float32), scale.astype(np.float32))
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.float16) if self.kind == "float16" else np.dtype(np.uint8)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.kind == "float16":
+            return vectors.astype(np.float16)
+        codes = np.rint((vectors - self.offset) / self.scale)
+        return np.clip(codes, 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        if self.kind == "float16":
+            return codes.astype(np.float32)
+        decoded = codes * self.scale
+        decoded += self.offset
+        return decoded
+
+    def prepare(self, query: np.ndarray):
+        """(weights, bias) with ``codes . weights + bias ~ decoded . query``"""
+        query = np.asarray(query, dtype=np.float32)
+        if self.kind == "float16":
+            return query, 0.0
+        return query * self.scale, float(query @ self.offset)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Approximate ``codes . query`` for every row, block by block"""
+        weights, bias = self.prepare(query)
+        out = np.empty(len(codes), dtype=np.float32)
+        buffer = np.empty((min(BLOCK_ROWS, len(codes)), codes.shape[1]), dtype=np.float32)
+        for start in range(0, len(codes), BLOCK_ROWS):
+            block = codes[start:start + BLOCK_ROWS]
+            decoded = buffer[:len(block)]
+            np.copyto(decoded, block, casting="unsafe")
+            np.dot(decoded, weights, out=out[start:start + len(block)])
+        out += bias
+        return out
+
+class QuantizedVectors:
+    """
+    Growable quantized copy of a matrix. Indexing decodes rows to float32,
+    so it can stand in for the matrix a graph index walks.
+    """
+
+    def __init__(self, quantizer: ScalarQuantizer, dim: int):
+        self.quantizer = quantizer
+        self.dim = dim
+        self.codes = np.empty((0, dim), dtype=quantizer.dtype)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, rows) -> np.ndarray:
+        if isinstance(rows, slice):
+            rows = range(*rows.indices(self.count))
+        return self.quantizer.decode(self.codes[rows])
+
+    @property
+    def nbytes(self) -> int:
+        return self.count * self.dim * self.codes.itemsize
+
+    def extend(self, vectors: np.ndarray) -> None:
+        if not len(vectors):
+            return
+        needed = self.count + len(vectors)
+        if needed > len(self.codes):
+            grown = np.empty((max(needed, 2 * len(self.codes), 1024), self.dim), dtype=self.codes.dtype)
+            grown[:self.count] = self.codes[:self.count]
+            self.codes = grown
+        self.codes[self.count:needed] = self.quantizer.encode(vectors)
+        self.count = needed
+
+    def scorer(self, query: np.ndarray):
+        """Function scoring a list of rows against ``query`` without decoding them"""
+        weights, bias = self.quantizer.prepare(query)
+        codes = self.codes
+        return lambda rows: codes[rows] @ weights + bias
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        return self.quantizer.scores(self.codes[:self.count], query)
+
+def rerank(full: np.ndarray, rows: Sequence[int], query: np.ndarray, k: int):
+    """Exact (row, score) pairs of the best ``k`` of ``rows`` against full-precision vectors"""
+    if not len(rows):
+        return []
+    rows = np.asarray(rows)
+    exact = np.asarray(full[rows], dtype=np.float32) @ np.asarray(query, dtype=np.float32)
+    order = np.argsort(-exact, kind="stable")[:k]
+    return [(int(rows[i]), float(exact[i])) for i in order]
@@ -0,0 +1,224 @@
+"""
+Personalized recommendations with a time budget and a popularity fallback
+
+Personalized scoring compares the user's profile with every open initiative
+and can run long for large catalogs or profiles. It runs against a deadline
+and checks it as it goes; when the deadline passes, the request is served
+from ``popular_initiatives`` instead - a ranking by engagement (saves,
+applications and current trending score) precomputed per practice area by a
+periodic job, so the fallback is a single indexed read.
+
+Which path served each request is counted per worker (``stats()``).
+
+    python -m app.services.recommendations   # refresh the popularity lists now
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import job_handler
+from app.models.initiative import Initiative, InitiativeStatus
+from app.models.recommendation import PopularInitiative
+from app.models.trending import TrendingScore
+from app.models.user import User
+from app.schemas.base import get_list_from_json
+from app.services import trending
+
+logger = logging.getLogger(__name__)
+
+# Firm-wide popularity list key
+ALL_PRACTICES = ""
+
+# Open initiatives scored between deadline checks
+SCAN_CHUNK = 256
+
+PERSONALIZED = "personalized"
+FALLBACK = "fallback"
+
+class DeadlineExceeded(Exception):
+    """Personalized scoring did not finish within its time budget"""
+
+_stats_lock = threading.Lock()
+_stats = Counter()
+
+def _count(event: str) -> None:
+    with _stats_lock:
+        _stats[event] += 1
+
+def deadline_after(milliseconds: int) -> float:
+    """Monotonic deadline ``milliseconds`` from now"""
+    return time.monotonic() + milliseconds / 1000
+
+def _check(deadline: Optional[float]) -> None:
+    if deadline is not None and time.monotonic() > deadline:
+        raise DeadlineExceeded()
+
+def personalized(db: Session, user: User, limit: int, deadline: Optional[float] = None,
+                 full_profile: bool = True) -> List[dict]:
+    """
+    Score open initiatives against ``user``'s profile; raises
+    ``DeadlineExceeded`` once ``deadline`` has passed.
+
+    ``full_profile`` also matches interests and industries (the
+    user-facing endpoint); otherwise only skills and practice count.
+    """
+    _check(deadline)
+    user_skills = set(get_list_from_json(user.skills))
+    user_interests = set(get_list_from_json(user.interests)) if full_profile else set()
+    user_industries = set(get_list_from_json(user.industries)) if full_profile else set()
+
+    # Only the matched columns are read, a chunk at a time, so the deadline
+    # bounds the scan itself rather than being checked after it
+    result = db.execute(
+        select(Initiative.id, Initiative.skills_needed, Initiative.tags, Initiative.industries,
+               Initiative.practice_area)
+        .where(Initiative.status == InitiativeStatus.OPEN)
+        .execution_options(yield_per=SCAN_CHUNK)
+    )
+    scored = []
+    try:
+        for chunk in result.partitions():
+            _check(deadline)
+            for initiative in chunk:
+                score = 0.0
+                explanations = []
+
+                skill_overlap = user_skills.intersection(get_list_from_json(initiative.skills_needed))
+                if skill_overlap:
+                    score += len(skill_overlap) * 0.3
+                    explanations.append(f"Matched skills: {', '.join(skill_overlap)}")
+
+                interest_overlap = user_interests.intersection(get_list_from_json(initiative.tags))
+                if interest_overlap:
+                    score += len(interest_overlap) * 0.2
+                    explanations.append(f"Aligned with interests: {', '.join(interest_overlap)}")
+
+                industry_overlap = user_industries.intersection(get_list_from_json(initiative.industries))
+                if industry_overlap:
+                    score += len(industry_overlap) * 0.2
+                    explanations.append(f"Industry match: {', '.join(industry_overlap)}")
+
+                if user.practice and user.practice == initiative.practice_area:
+                    score += 0.3
+                    explanations.append(f"Same practice area: {user.practice}")
+
+                # Only include if there's some match
+                if score > 0:
+                    scored.append((min(score, 1.0), initiative.id, "; ".join(explanations)))
+    finally:
+        result.close()
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+    top = scored[:limit]
+    initiatives = {
+        initiative.id: initiative
+        for initiative in db.query(Initiative).filter(Initiative.id.in_([item[1] for item in top]))
+    }
+    return [
+        {"initiative": initiatives[initiative_id], "score": score, "explanation": explanation,
+         "source": PERSONALIZED}
+        for score, initiative_id, explanation in top if initiative_id in initiatives
+    ]
+
+def popular(db: Session, practice: Optional[str], limit: int) -> List[dict]:
+    """Precomputed popular open initiatives for ``practice`` (firm-wide if it has none)"""
+    precomputed = db.query(PopularInitiative).limit(1).first() is not None
+    rows, key = [], ALL_PRACTICES
+    for key in dict.fromkeys([practice or ALL_PRACTICES, ALL_PRACTICES]):
+        if precomputed:
+            query = db.query(Initiative, PopularInitiative.score).join(
+                PopularInitiative, PopularInitiative.initiative_id == Initiative.id
+            ).filter(PopularInitiative.practice == key).order_by(PopularInitiative.rank)
+        else:
+            # Nothing precomputed yet: rank by stored counters directly
+            query = db.query(Initiative, _counter_score()).order_by(_counter_score().desc(), Initiative.id)
+            if key:
+                query = query.filter(Initiative.practice_area == key)
+        rows = query.filter(Initiative.status == InitiativeStatus.OPEN).limit(limit).all()
+        if rows:
+            break
+
+    top = max((score for _, score in rows), default=0.0) or 1.0
+    where = f"in {key}" if key else "across the firm"
+    return [
+        {"initiative": initiative, "score": round(score / top, 4),
+         "explanation": f"Popular {where}", "source": FALLBACK}
+        for initiative, score in rows
+    ]
+
+def recommend(db: Session, user: User, limit: int, deadline_ms: int,
+              full_profile: bool = True) -> List[dict]:
+    """Personalized recommendations, or the popularity fallback if they miss the deadline"""
+    try:
+        items = personalized(db, user, limit, deadline_after(deadline_ms), full_profile)
+    except DeadlineExceeded:
+        _count("fallback_deadline")
+        return popular(db, user.practice, limit)
+    _count(PERSONALIZED)
+    return items
+
+# -- precomputation -----------------------------------------------------
+
+def _counter_score():
+    weights = trending.EVENT_WEIGHTS
+    return (func.coalesce(Initiative.save_count, 0) * weights["save"]
+            + func.coalesce(Initiative.application_count, 0) * weights["apply"])
+
+def refresh_popular(db: Session, size: Optional[int] = None) -> int:
+    """Rebuild the firm-wide and per-practice popularity lists; returns rows written"""
+    size = size or settings.RECOMMENDATION_FALLBACK_SIZE
+    factor = trending.current_factor(db)
+    score = (_counter_score() + func.coalesce(TrendingScore.score, 0.0) * factor).label("score")
+    rows = db.execute(
+        select(Initiative.id, Initiative.practice_area, score)
+        .outerjoin(TrendingScore, TrendingScore.initiative_id == Initiative.id)
+        .where(Initiative.status == InitiativeStatus.OPEN)
+        .order_by(score.desc(), Initiative.id)
+    ).all()
+
+    now = datetime.utcnow()
+    lists = {ALL_PRACTICES: []}
+    for initiative_id, practice_area, value in rows:
+        for key in dict.fromkeys((ALL_PRACTICES, practice_area or ALL_PRACTICES)):
+            ranked = lists.setdefault(key, [])
+            if len(ranked) < size:
+                ranked.append(dict(practice=key, rank=len(ranked), initiative_id=initiative_id,
+                                   score=float(value), computed_at=now))
+
+    db.execute(delete(PopularInitiative))
+    mappings = [row for ranked in lists.values() for row in ranked]
+    db.bulk_insert_mappings(PopularInitiative, mappings)
+    db.commit()
+    return len(mappings)
+
+@job_handler("refresh_popular", every=settings.RECOMMENDATION_FALLBACK_REFRESH)
+def refresh_popular_job(db: Session, entity_id: int, payload: dict) -> None:
+    """Periodic rebuild of the recommendation fallback lists"""
+    written = refresh_popular(db)
+    logger.debug("popular initiatives refreshed: %d rows", written)
+
+def stats() -> dict:
+    with _stats_lock:
+        data = dict(_stats)
+    served = data.get(PERSONALIZED, 0) + data.get("fallback_deadline", 0)
+    if served:
+        data["fallback_rate"] = round(data.get("fallback_deadline", 0) / served, 4)
+    return data
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        logger.info("popular initiatives refreshed: %d rows", refresh_popular(session))
+    finally:
+        session.close()
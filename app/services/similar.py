@@ -0,0 +1,253 @@
+"""
+"More like this": precomputed nearest-neighbor lists of initiatives
+
+Similarity blends two cosines into one dot product. Each initiative gets a
+feature row ``[sqrt(w) * text, sqrt(1 - w) * attributes]`` where ``text`` is
+its stored embedding and ``attributes`` a hashed, weighted multi-hot vector
+of its skills, tags and industries (both L2-normalized, ``w`` =
+``SIMILAR_TEXT_WEIGHT``). The top ``SIMILAR_TOP_K`` neighbors of every
+initiative are stored in ``initiative_neighbors`` so serving is one indexed
+lookup.
+
+* **Full rebuild** - blockwise matrix products over the whole catalog with
+  a per-row partial sort (``python -m app.services.similar``).
+* **Incremental** - the ``refresh_neighbors`` job, enqueued whenever an
+  embedding is written or dropped, recomputes the changed initiative's
+  list plus the lists of initiatives that currently point at it or are
+  among its ``SIMILAR_REVERSE_FANOUT`` nearest. Lists outside that radius
+  are corrected by the next full rebuild.
+
+Feature rows are kept in memory between jobs and synced from the database
+through ``updated_at`` and ``deleted_at`` high-water marks. Initiatives
+purged before a sync saw them deleted are dropped when a job finds them
+among the neighbors it is about to write (and by every full rebuild).
+"""
+import logging
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session
+from app.core.cache import cache, invalidate_after_commit
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import job_handler
+from app.models.embedding import InitiativeEmbedding
+from app.models.initiative import Initiative
+from app.models.similarity import InitiativeNeighbor
+from app.schemas.base import get_list_from_json
+from app.services.embeddings import current_model_name
+
+logger = logging.getLogger(__name__)
+
+# Contribution of each attribute field to the overlap vector
+ATTRIBUTE_WEIGHTS = {"skills_needed": 1.0, "tags": 0.7, "industries": 0.5}
+
+def attribute_vector(skills_needed, tags, industries, dim: int) -> np.ndarray:
+    """Hashed, weighted multi-hot vector of an initiative's skills, tags and industries"""
+    vec = np.zeros(dim, dtype=np.float32)
+    for field, raw in (("skills_needed", skills_needed), ("tags", tags), ("industries", industries)):
+        for value in get_list_from_json(raw):
+            if isinstance(value, str) and value.strip():
+                vec[zlib.crc32(f"{field}:{value.strip().lower()}".encode("utf-8")) % dim] += ATTRIBUTE_WEIGHTS[field]
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+class FeatureMatrix:
+    """Feature rows of every initiative, kept in sync incrementally"""
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self.rows: Dict[int, int] = {}
+        self.watermark: Optional[datetime] = None
+        self.deleted_watermark: Optional[datetime] = None
+        self.text_dim: Optional[int] = None
+        self.lock = threading.RLock()
+
+    def _text_dim(self, db: Session) -> int:
+        dim = db.execute(
+            select(InitiativeEmbedding.dim).where(InitiativeEmbedding.model == current_model_name()).limit(1)
+        ).scalar()
+        return int(dim or settings.EMBEDDING_DIM)
+
+    def _row(self, record, model: str) -> np.ndarray:
+        text = np.zeros(self.text_dim, dtype=np.float32)
+        if record.vector is not None and record.model == model and record.dim == self.text_dim:
+            text = np.frombuffer(record.vector, dtype="<f4")
+        attributes = attribute_vector(record.skills_needed, record.tags, record.industries, settings.SIMILAR_ATTR_DIM)
+        weight = settings.SIMILAR_TEXT_WEIGHT
+        return np.concatenate([np.sqrt(weight) * text, np.sqrt(1.0 - weight) * attributes]).astype(np.float32)
+
+    def _removed(self, db: Session, reconcile: bool) -> set:
+        """Ids soft-deleted since the last sync, plus with ``reconcile`` those no longer in the table"""
+        deleted = select(Initiative.id, Initiative.deleted_at).where(Initiative.deleted_at.isnot(None))
+        if self.deleted_watermark is not None:
+            deleted = deleted.where(Initiative.deleted_at >= self.deleted_watermark)
+        removed = set()
+        for initiative_id, deleted_at in db.execute(deleted.execution_options(include_deleted=True)).all():
+            removed.add(initiative_id)
+            if self.deleted_watermark is None or deleted_at > self.deleted_watermark:
+                self.deleted_watermark = deleted_at
+        if reconcile:
+            live = set(db.execute(select(Initiative.id)).scalars().all())
+            removed.update(initiative_id for initiative_id in self.rows if initiative_id not in live)
+        return removed
+
+    def sync(self, db: Session, reconcile: bool = False) -> None:
+        """
+        Apply initiatives and embeddings changed or removed since the last
+        sync; ``reconcile`` also compares every row against the table.
+        """
+        with self.lock:
+            if self.text_dim is None:
+                self.text_dim = self._text_dim(db)
+            query = (
+                select(
+                    Initiative.id, Initiative.skills_needed, Initiative.tags, Initiative.industries,
+                    Initiative.updated_at, InitiativeEmbedding.vector, InitiativeEmbedding.model,
+                    InitiativeEmbedding.dim, InitiativeEmbedding.updated_at.label("embedded_at"),
+                )
+                .outerjoin(InitiativeEmbedding, InitiativeEmbedding.initiative_id == Initiative.id)
+            )
+            if self.watermark is not None:
+                query = query.where(or_(
+                    Initiative.updated_at >= self.watermark, InitiativeEmbedding.updated_at >= self.watermark
+                ))
+            changed = db.execute(query).all()
+
+            self.discard(self._removed(db, reconcile))
+
+            if changed:
+                model = current_model_name()
+                new_rows = [self._row(record, model) for record in changed]
+                if not len(self.ids):
+                    self.matrix = np.empty((0, len(new_rows[0])), dtype=np.float32)
+                appended_ids, appended = [], []
+                for record, row in zip(changed, new_rows):
+                    index = self.rows.get(record.id)
+                    if index is None:
+                        appended_ids.append(record.id)
+                        appended.append(row)
+                    else:
+                        self.matrix[index] = row
+                    for stamp in (record.updated_at, record.embedded_at):
+                        if stamp is not None and (self.watermark is None or stamp > self.watermark):
+                            self.watermark = stamp
+                if appended:
+                    start = len(self.ids)
+                    self.ids = np.concatenate([self.ids, np.asarray(appended_ids, dtype=np.int64)])
+                    self.matrix = np.vstack([self.matrix, np.asarray(appended)])
+                    self.rows.update({initiative_id: start + i for i, initiative_id in enumerate(appended_ids)})
+
+    def discard(self, initiative_ids) -> None:
+        """Drop the rows of ``initiative_ids``"""
+        with self.lock:
+            removed = set(initiative_ids).intersection(self.rows)
+            if removed:
+                keep = [i for i, initiative_id in enumerate(self.ids.tolist()) if initiative_id not in removed]
+                self.ids, self.matrix = self.ids[keep], self.matrix[keep]
+                self.rows = {initiative_id: i for i, initiative_id in enumerate(self.ids.tolist())}
+
+    def top_k(self, row_indices: Sequence[int], k: int) -> List[List[tuple]]:
+        """(neighbor_id, score) lists, best first, for the given matrix rows"""
+        with self.lock:
+            if not len(row_indices) or len(self.ids) < 2:
+                return [[] for _ in row_indices]
+            scores = self.matrix[list(row_indices)] @ self.matrix.T
+            scores[np.arange(len(row_indices)), list(row_indices)] = -np.inf
+            k = min(k, len(self.ids) - 1)
+            part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            result = []
+            for r in range(len(row_indices)):
+                cols = part[r][np.argsort(-scores[r, part[r]], kind="stable")]
+                result.append([(int(self.ids[c]), float(scores[r, c])) for c in cols if scores[r, c] > 0])
+            return result
+
+features = FeatureMatrix()
+
+def _neighbor_rows(lists: Dict[int, List[tuple]]) -> List[dict]:
+    return [
+        {"initiative_id": initiative_id, "rank": rank, "neighbor_id": neighbor_id, "score": round(score, 6)}
+        for initiative_id, neighbors in lists.items()
+        for rank, (neighbor_id, score) in enumerate(neighbors)
+    ]
+
+def _write_neighbors(db: Session, lists: Dict[int, List[tuple]]) -> None:
+    ids = list(lists)
+    for start in range(0, len(ids), 500):
+        db.execute(delete(InitiativeNeighbor).where(InitiativeNeighbor.initiative_id.in_(ids[start:start + 500])))
+    rows = _neighbor_rows(lists)
+    if rows:
+        db.execute(insert(InitiativeNeighbor), rows)
+
+def rebuild(db: Session, block_size: Optional[int] = None) -> dict:
+    """Recompute every neighbor list from scratch"""
+    block_size = block_size or settings.SIMILAR_BLOCK_SIZE
+    started = time.perf_counter()
+    features.sync(db, reconcile=True)
+    synced = time.perf_counter()
+
+    db.execute(delete(InitiativeNeighbor))
+    total = len(features.ids)
+    for start in range(0, total, block_size):
+        indices = list(range(start, min(start + block_size, total)))
+        lists = features.top_k(indices, settings.SIMILAR_TOP_K)
+        rows = _neighbor_rows({int(features.ids[i]): neighbors for i, neighbors in zip(indices, lists)})
+        if rows:
+            db.execute(insert(InitiativeNeighbor), rows)
+    db.commit()
+    cache.invalidate_tags("similar")
+    return {
+        "initiatives": total,
+        "sync_s": round(synced - started, 2),
+        "neighbors_s": round(time.perf_counter() - synced, 2),
+    }
+
+def _lists(initiative_ids) -> Dict[int, List[tuple]]:
+    with features.lock:
+        indices = [features.rows[i] for i in initiative_ids if i in features.rows]
+        lists = features.top_k(indices, settings.SIMILAR_TOP_K)
+        return {int(features.ids[i]): neighbors for i, neighbors in zip(indices, lists)}
+
+@job_handler("refresh_neighbors")
+def refresh_neighbors(db: Session, initiative_id: int, payload: dict) -> None:
+    """Incrementally update neighbor lists affected by one initiative changing"""
+    features.sync(db)
+    pointing = set(db.execute(
+        select(InitiativeNeighbor.initiative_id).where(InitiativeNeighbor.neighbor_id == initiative_id)
+    ).scalars().all())
+
+    affected = set(pointing)
+    row = features.rows.get(initiative_id)
+    if row is None:
+        db.execute(delete(InitiativeNeighbor).where(InitiativeNeighbor.initiative_id == initiative_id))
+    else:
+        affected.add(initiative_id)
+        nearest = features.top_k([row], settings.SIMILAR_REVERSE_FANOUT)[0]
+        affected.update(neighbor_id for neighbor_id, _ in nearest)
+
+    lists = _lists(affected)
+    referenced = set(lists).union(neighbor_id for neighbors in lists.values() for neighbor_id, _ in neighbors)
+    existing = set(db.execute(
+        select(Initiative.id).where(Initiative.id.in_(referenced)).execution_options(include_deleted=True)
+    ).scalars().all())
+    if referenced - existing:
+        # Purged before any sync saw them soft-deleted
+        features.discard(referenced - existing)
+        lists = _lists(affected)
+    _write_neighbors(db, lists)
+    invalidate_after_commit(db, "similar")
+
+if __name__ == "__main__":
+    import json
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        print(json.dumps(rebuild(session), indent=2))
+    finally:
+        session.close()
@@ -0,0 +1,416 @@
+"""
+Batch auto-tagging of initiative descriptions
+
+Keyphrases are scored with TF-IDF over the whole description corpus, but
+only phrases from the existing skill/tag vocabulary are candidates, so every
+generated tag is one the platform already uses.
+
+* **Full run** - rebuilds the vocabulary (distinct initiative skills/tags and
+  user skills/interests), counts vocabulary phrases in every title and
+  description in one streaming pass, then computes document frequencies,
+  TF-IDF weights and the per-initiative top tags as whole-corpus numpy array
+  operations. Document frequencies are stored in ``tag_terms``.
+* **Incremental run** - re-tags only initiatives that are new or changed
+  since they were last tagged, scoring against the stored frequencies. The
+  ``tag_initiative`` job does the same for a single initiative on write.
+
+Generated tags are kept in ``initiative_auto_tags`` and merged into
+``Initiative.tags``; tags entered by hand are never removed.
+
+    python -m app.services.tagging               # full run
+    python -m app.services.tagging --incremental
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.core.cache import cache, invalidate_after_commit
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import enqueue_many, job_handler
+from app.core.warmup import register_preloader
+from app.models.initiative import Initiative
+from app.models.system import SystemState
+from app.models.tagging import InitiativeAutoTags, TagTerm
+from app.models.user import User
+from app.schemas.base import get_list_from_json
+from app.services.embeddings import tokenize
+
+logger = logging.getLogger(__name__)
+
+CORPUS_SIZE_KEY = "tagging.corpus_size"
+BUILT_AT_KEY = "tagging.built_at"
+
+# Title matches count this many times a description match
+TITLE_WEIGHT = 2
+
+@lru_cache(maxsize=100_000)
+def _normalize_token(token: str) -> str:
+    token = token.rstrip("./-")
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return token
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lower-cased tokens with trailing punctuation and plural 's' removed"""
+    return [t for t in map(_normalize_token, tokenize(text)) if t]
+
+def normalize_term(label: str) -> str:
+    return " ".join(normalize_tokens(label))
+
+def content_hash(title: Optional[str], description: Optional[str]) -> str:
+    return hashlib.sha1(f"{title or ''}\n{description or ''}".encode("utf-8")).hexdigest()
+
+class TagVocabulary:
+    """Vocabulary phrases, their document frequencies and a phrase matcher"""
+
+    def __init__(self, terms: Sequence[str], labels: Sequence[str],
+                 doc_freq: Optional[Sequence[int]] = None, corpus_size: int = 0):
+        self.terms = list(terms)
+        self.labels = list(labels)
+        self.doc_freq = np.asarray(doc_freq if doc_freq is not None else [0] * len(self.terms), dtype=np.int64)
+        self.corpus_size = corpus_size
+        self.index = {tuple(term.split()): i for i, term in enumerate(self.terms)}
+        # first token -> candidate phrase lengths, longest first
+        lengths = defaultdict(set)
+        for phrase in self.index:
+            lengths[phrase[0]].add(len(phrase))
+        self.lengths = {first: sorted(ls, reverse=True) for first, ls in lengths.items()}
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def match(self, tokens: Sequence[str], counts: Counter, weight: int = 1) -> None:
+        """Add greedy longest-match phrase occurrences in ``tokens`` to ``counts``"""
+        i, n = 0, len(tokens)
+        while i < n:
+            step = 1
+            for length in self.lengths.get(tokens[i], ()):
+                term_id = self.index.get(tuple(tokens[i:i + length]))
+                if term_id is not None:
+                    counts[term_id] += weight
+                    step = length
+                    break
+            i += step
+
+    def count(self, title: Optional[str], description: Optional[str]) -> Counter:
+        counts = Counter()
+        self.match(normalize_tokens(title or ""), counts, TITLE_WEIGHT)
+        self.match(normalize_tokens(description or ""), counts)
+        return counts
+
+def collect_vocabulary(db: Session) -> Tuple[List[str], List[str]]:
+    """Normalized terms and display labels of every skill/tag in use"""
+    labels = defaultdict(Counter)
+    sources = [
+        select(Initiative.skills_needed), select(Initiative.tags),
+        select(User.skills), select(User.interests),
+    ]
+    for query in sources:
+        for (raw,) in db.execute(query.execution_options(yield_per=5000)):
+            for label in get_list_from_json(raw):
+                if not isinstance(label, str):
+                    continue
+                term = normalize_term(label)
+                if term:
+                    labels[term][label.strip()] += 1
+    terms = sorted(labels)
+    return terms, [labels[t].most_common(1)[0][0] for t in terms]
+
+def term_frequencies(documents: Sequence[Counter]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flatten per-document counters into (doc, term, tf) arrays"""
+    sizes = np.fromiter((len(c) for c in documents), dtype=np.int64, count=len(documents))
+    total = int(sizes.sum())
+    docs = np.repeat(np.arange(len(documents), dtype=np.int64), sizes)
+    term_ids = np.empty(total, dtype=np.int64)
+    tf = np.empty(total, dtype=np.float64)
+    offset = 0
+    for counts in documents:
+        size = len(counts)
+        if size:
+            term_ids[offset:offset + size] = list(counts.keys())
+            tf[offset:offset + size] = list(counts.values())
+            offset += size
+    return docs, term_ids, tf
+
+def document_frequencies(term_ids: np.ndarray, vocabulary_size: int) -> np.ndarray:
+    """Number of documents containing each term (each (doc, term) pair is unique)"""
+    return np.bincount(term_ids, minlength=vocabulary_size)
+
+def top_terms(docs: np.ndarray, term_ids: np.ndarray, tf: np.ndarray, doc_count: int,
+              doc_freq: np.ndarray, corpus_size: int,
+              max_tags: int, min_score: float) -> List[List[int]]:
+    """
+    Per-document term ids ranked by L2-normalized sublinear TF-IDF.
+
+    Uses smoothed idf = ln((1 + N) / (1 + df)) + 1 and keeps at most
+    ``max_tags`` terms scoring at least ``min_score``.
+    """
+    result: List[List[int]] = [[] for _ in range(doc_count)]
+    if not len(docs):
+        return result
+    idf = np.log((1.0 + corpus_size) / (1.0 + doc_freq)) + 1.0
+    weights = (1.0 + np.log(tf)) * idf[term_ids]
+    norms = np.sqrt(np.bincount(docs, weights=weights * weights, minlength=doc_count))
+    scores = weights / norms[docs]
+
+    order = np.lexsort((-scores, docs))
+    docs, term_ids, scores = docs[order], term_ids[order], scores[order]
+    starts = np.searchsorted(docs, docs, side="left")
+    rank = np.arange(len(docs)) - starts
+    keep = (rank < max_tags) & (scores >= min_score)
+    for doc, term_id in zip(docs[keep].tolist(), term_ids[keep].tolist()):
+        result[doc].append(term_id)
+    return result
+
+def merge_tags(current: Iterable[str], previous_auto: Iterable[str], new_auto: Iterable[str]) -> List[str]:
+    """Manual tags (current minus previous auto tags) followed by the new auto tags"""
+    previous = {t.lower() for t in previous_auto}
+    merged, seen = [], set()
+    for tag in [*(t for t in current if t.lower() not in previous), *new_auto]:
+        key = tag.lower()
+        if key not in seen:
+            seen.add(key)
+            merged.append(tag)
+    return merged
+
+# -- persistence --------------------------------------------------------
+
+def _get_state(db: Session, key: str) -> Optional[str]:
+    return db.execute(select(SystemState.value).where(SystemState.key == key)).scalar()
+
+def _set_state(db: Session, key: str, value: str) -> None:
+    row = db.get(SystemState, key)
+    if row is None:
+        db.add(SystemState(key=key, value=value))
+    else:
+        row.value = value
+
+def _save_vocabulary(db: Session, vocabulary: TagVocabulary) -> None:
+    db.execute(delete(TagTerm))
+    if len(vocabulary):
+        db.execute(insert(TagTerm), [
+            {"term": term, "label": label, "doc_freq": int(df)}
+            for term, label, df in zip(vocabulary.terms, vocabulary.labels, vocabulary.doc_freq)
+        ])
+    _set_state(db, CORPUS_SIZE_KEY, str(vocabulary.corpus_size))
+    _set_state(db, BUILT_AT_KEY, datetime.utcnow().isoformat())
+
+_loaded: Dict[str, object] = {"built_at": None, "vocabulary": None}
+_loaded_lock = threading.Lock()
+
+def load_vocabulary(db: Session) -> TagVocabulary:
+    """
+    Stored vocabulary and frequencies, reloaded only after a full run.
+
+    Before the first full run the live vocabulary is used with zero
+    frequencies (plain TF ranking).
+    """
+    built_at = _get_state(db, BUILT_AT_KEY)
+    with _loaded_lock:
+        if built_at is not None and _loaded["built_at"] == built_at:
+            return _loaded["vocabulary"]
+    if built_at is None:
+        terms, labels = collect_vocabulary(db)
+        return TagVocabulary(terms, labels)
+    rows = db.execute(select(TagTerm.term, TagTerm.label, TagTerm.doc_freq).order_by(TagTerm.term)).all()
+    vocabulary = TagVocabulary(
+        [r.term for r in rows], [r.label for r in rows], [r.doc_freq for r in rows],
+        corpus_size=int(_get_state(db, CORPUS_SIZE_KEY) or 0)
+    )
+    with _loaded_lock:
+        _loaded.update(built_at=built_at, vocabulary=vocabulary)
+    return vocabulary
+
+@register_preloader
+def _preload_vocabulary():
+    db = SessionLocal()
+    try:
+        load_vocabulary(db)
+    finally:
+        db.close()
+
+def _write_tags(db: Session, ids: Sequence[int], hashes: Sequence[str],
+                generated: Sequence[List[str]]) -> int:
+    """Merge generated tags into one chunk of initiatives; returns how many changed"""
+    now = datetime.utcnow()
+    current = {
+        row.id: row for row in db.execute(
+            select(Initiative.id, Initiative.tags, Initiative.version).where(Initiative.id.in_(ids))
+        )
+    }
+    previous = {
+        row.initiative_id: get_list_from_json(row.tags) for row in db.execute(
+            select(InitiativeAutoTags.initiative_id, InitiativeAutoTags.tags)
+            .where(InitiativeAutoTags.initiative_id.in_(ids))
+        )
+    }
+
+    changes, auto_rows = [], []
+    for initiative_id, digest, tags in zip(ids, hashes, generated):
+        row = current.get(initiative_id)
+        if row is None:
+            continue
+        existing = get_list_from_json(row.tags)
+        merged = merge_tags(existing, previous.get(initiative_id, []), tags)
+        if merged != existing:
+            changes.append({
+                "id": initiative_id, "tags": json.dumps(merged) if merged else None,
+                "version": (row.version or 0) + 1, "updated_at": now,
+            })
+        auto_rows.append({
+            "initiative_id": initiative_id, "tags": json.dumps(tags),
+            "content_hash": digest, "tagged_at": now,
+        })
+
+    if changes:
+        db.execute(update(Initiative), changes)
+    db.execute(delete(InitiativeAutoTags).where(InitiativeAutoTags.initiative_id.in_(ids)))
+    if auto_rows:
+        db.execute(insert(InitiativeAutoTags), auto_rows)
+    # Tags are part of the embedded text
+    enqueue_many(db, "embed_initiative", [change["id"] for change in changes])
+    return len(changes)
+
+def _tag_rows(db: Session, vocabulary: TagVocabulary, rows, batch_size: int,
+              commit: bool = True) -> Tuple[int, int]:
+    """Score and write (id, title, description) rows against fixed frequencies"""
+    processed = changed = 0
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        counts = [vocabulary.count(r.title, r.description) for r in chunk]
+        ranked = top_terms(*term_frequencies(counts), len(chunk), vocabulary.doc_freq,
+                           vocabulary.corpus_size, settings.TAGGING_MAX_TAGS, settings.TAGGING_MIN_SCORE)
+        changed += _write_tags(
+            db, [r.id for r in chunk], [content_hash(r.title, r.description) for r in chunk],
+            [[vocabulary.labels[t] for t in term_ids] for term_ids in ranked]
+        )
+        if commit:
+            db.commit()
+        processed += len(chunk)
+    return processed, changed
+
+def run_full(db: Session, batch_size: Optional[int] = None) -> dict:
+    """Rebuild vocabulary and frequencies from the whole corpus and re-tag everything"""
+    batch_size = batch_size or settings.TAGGING_BATCH_SIZE
+    started = time.perf_counter()
+    terms, labels = collect_vocabulary(db)
+    vocabulary = TagVocabulary(terms, labels)
+
+    ids, hashes, counts = [], [], []
+    query = select(Initiative.id, Initiative.title, Initiative.description).execution_options(yield_per=batch_size)
+    for row in db.execute(query):
+        ids.append(row.id)
+        hashes.append(content_hash(row.title, row.description))
+        counts.append(vocabulary.count(row.title, row.description))
+    counted = time.perf_counter()
+
+    docs, term_ids, tf = term_frequencies(counts)
+    del counts
+    vocabulary.doc_freq = document_frequencies(term_ids, len(vocabulary))
+    vocabulary.corpus_size = len(ids)
+    ranked = top_terms(docs, term_ids, tf, len(ids), vocabulary.doc_freq, vocabulary.corpus_size,
+                       settings.TAGGING_MAX_TAGS, settings.TAGGING_MIN_SCORE)
+    scored = time.perf_counter()
+
+    _save_vocabulary(db, vocabulary)
+    changed = 0
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        changed += _write_tags(
+            db, ids[start:end], hashes[start:end],
+            [[vocabulary.labels[t] for t in term_ids] for term_ids in ranked[start:end]]
+        )
+        db.commit()
+    cache.invalidate_tags("initiatives")
+
+    return {
+        "mode": "full",
+        "initiatives": len(ids),
+        "vocabulary": len(vocabulary),
+        "changed": changed,
+        "count_s": round(counted - started, 2),
+        "score_s": round(scored - counted, 2),
+        "write_s": round(time.perf_counter() - scored, 2),
+    }
+
+def run_incremental(db: Session, batch_size: Optional[int] = None) -> dict:
+    """Re-tag initiatives that are new or changed since their last tagging"""
+    batch_size = batch_size or settings.TAGGING_BATCH_SIZE
+    started = time.perf_counter()
+    vocabulary = load_vocabulary(db)
+    candidates = db.execute(
+        select(Initiative.id, Initiative.title, Initiative.description, InitiativeAutoTags.content_hash)
+        .outerjoin(InitiativeAutoTags, InitiativeAutoTags.initiative_id == Initiative.id)
+        .where(or_(InitiativeAutoTags.initiative_id.is_(None),
+                   Initiative.updated_at > InitiativeAutoTags.tagged_at))
+    ).all()
+    rows, unchanged = [], []
+    for row in candidates:
+        if row.content_hash == content_hash(row.title, row.description):
+            unchanged.append(row.id)
+        else:
+            rows.append(row)
+    if unchanged:
+        # Edited fields other than title/description; nothing to re-tag
+        db.execute(
+            update(InitiativeAutoTags).where(InitiativeAutoTags.initiative_id.in_(unchanged))
+            .values(tagged_at=datetime.utcnow())
+        )
+        db.commit()
+    processed, changed = _tag_rows(db, vocabulary, rows, batch_size)
+    if changed:
+        cache.invalidate_tags("initiatives")
+    return {
+        "mode": "incremental",
+        "initiatives": processed,
+        "vocabulary": len(vocabulary),
+        "changed": changed,
+        "total_s": round(time.perf_counter() - started, 2),
+    }
+
+@job_handler("tag_initiative")
+def tag_initiative(db: Session, initiative_id: int, payload: dict) -> None:
+    """Auto-tag one new or edited initiative against the stored corpus frequencies"""
+    row = db.execute(
+        select(Initiative.id, Initiative.title, Initiative.description).where(Initiative.id == initiative_id)
+    ).first()
+    if row is None:
+        db.execute(delete(InitiativeAutoTags).where(InitiativeAutoTags.initiative_id == initiative_id))
+        return
+    existing = db.get(InitiativeAutoTags, initiative_id)
+    if existing is not None and existing.content_hash == content_hash(row.title, row.description) \
+            and not payload.get("force"):
+        return
+    vocabulary = load_vocabulary(db)
+    if _tag_rows(db, vocabulary, [row], 1, commit=False)[1]:
+        invalidate_after_commit(db, "initiatives", f"initiative:{initiative_id}")
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate initiative tags from descriptions")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only new or changed initiatives, using the stored corpus frequencies")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        report = run_incremental(db, args.batch_size) if args.incremental else run_full(db, args.batch_size)
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
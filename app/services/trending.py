@@ -0,0 +1,239 @@
+"""
+Trending initiatives from exponentially time-decayed engagement
+
+An event of weight ``w`` at time ``t`` contributes ``w * exp(-lambda * (now - t))``.
+Scores use *forward decay*: they are stored as ``sum(w * exp(lambda * (t - L)))``
+for a landmark ``L``. Every score decays by the same factor as time passes,
+so the ranking only changes when events arrive and recording an event is a
+single addition - no per-item timestamps or periodic re-decaying.
+
+* Each worker adds events to an in-memory buffer (O(1) per event) relative
+  to its own local landmark. The buffer is bounded: when it overflows, the
+  smallest entries are dropped.
+* A background thread flushes the buffer every ``TRENDING_FLUSH_INTERVAL``
+  seconds: deltas are rescaled to the shared landmark and added with one
+  upsert, and the table is pruned to the ``TRENDING_MAX_ROWS`` best scores.
+* The shared landmark moves forward (rescaling all rows) before
+  ``exp(lambda * (now - L))`` could lose precision.
+
+    python -m app.services.trending --backfill --days 14
+"""
+import logging
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal, upsert_insert
+from app.models.engagement import InitiativeApplication, InitiativeView, SavedInitiative
+from app.models.system import SystemState
+from app.models.trending import TrendingScore
+
+logger = logging.getLogger(__name__)
+
+LANDMARK_KEY = "trending.landmark"
+
+EVENT_WEIGHTS = {"view": 1.0, "save": 3.0, "apply": 5.0}
+
+# Move the landmark once stored scores carry this much growth (e**40)
+MAX_EXPONENT = 40.0
+
+def decay_rate() -> float:
+    """Per-second decay constant for the configured half-life"""
+    return math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600.0)
+
+def _seconds(later: datetime, earlier: datetime) -> float:
+    return (later - earlier).total_seconds()
+
+def _get_landmark(db: Session, lock: bool = False) -> Optional[datetime]:
+    query = select(SystemState.value).where(SystemState.key == LANDMARK_KEY)
+    if lock:
+        query = query.with_for_update()
+    value = db.execute(query).scalar()
+    return datetime.fromisoformat(value) if value else None
+
+def current_factor(db: Session, now: Optional[datetime] = None) -> float:
+    """Multiplier turning stored scores into present-day decayed scores"""
+    landmark = _get_landmark(db)
+    if landmark is None:
+        return 1.0
+    return math.exp(-decay_rate() * _seconds(now or datetime.utcnow(), landmark))
+
+class TrendingTracker:
+    """Per-worker event buffer with periodic persistence"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[int, float] = {}
+        self._landmark = datetime.utcnow()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def record(self, initiative_id: int, event: str, when: Optional[datetime] = None) -> None:
+        """Add one engagement event; constant time"""
+        when = when or datetime.utcnow()
+        with self._lock:
+            weight = EVENT_WEIGHTS[event] * math.exp(decay_rate() * _seconds(when, self._landmark))
+            self._pending[initiative_id] = self._pending.get(initiative_id, 0.0) + weight
+            if len(self._pending) > 2 * settings.TRENDING_BUFFER_SIZE:
+                self._shrink()
+
+    def _shrink(self) -> None:
+        # Amortized O(1): runs once per TRENDING_BUFFER_SIZE new keys
+        keep = sorted(self._pending.items(), key=lambda item: item[1], reverse=True)[:settings.TRENDING_BUFFER_SIZE]
+        self.dropped += len(self._pending) - len(keep)
+        self._pending = dict(keep)
+
+    def _take(self) -> Tuple[Dict[int, float], datetime]:
+        with self._lock:
+            pending, landmark = self._pending, self._landmark
+            self._pending, self._landmark = {}, datetime.utcnow()
+        return pending, landmark
+
+    def _restore(self, pending: Dict[int, float], landmark: datetime) -> None:
+        with self._lock:
+            shift = math.exp(decay_rate() * _seconds(landmark, self._landmark))
+            for initiative_id, score in pending.items():
+                self._pending[initiative_id] = self._pending.get(initiative_id, 0.0) + score * shift
+
+    def flush(self, db: Session) -> int:
+        """Persist buffered scores; returns the number of initiatives written"""
+        pending, local_landmark = self._take()
+        if not pending:
+            return 0
+        try:
+            apply_deltas(db, pending, local_landmark)
+            db.commit()
+        except Exception:
+            db.rollback()
+            self._restore(pending, local_landmark)
+            raise
+        return len(pending)
+
+    # -- background flushing ----------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.wait(settings.TRENDING_FLUSH_INTERVAL):
+            self._flush_once()
+
+    def _flush_once(self) -> None:
+        db = SessionLocal()
+        try:
+            self.flush(db)
+        except Exception:
+            logger.exception("trending flush failed")
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="trending-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._flush_once()
+
+def apply_deltas(db: Session, deltas: Dict[int, float], local_landmark: datetime) -> None:
+    """Add scores expressed relative to ``local_landmark`` to the shared table"""
+    now = datetime.utcnow()
+    rate = decay_rate()
+    # Row lock on Postgres; SQLite serializes the read and the writes below
+    landmark = _get_landmark(db, lock=True)
+    if landmark is None:
+        landmark = now
+        db.add(SystemState(key=LANDMARK_KEY, value=landmark.isoformat()))
+        db.flush()
+    elif rate * _seconds(now, landmark) > MAX_EXPONENT:
+        db.execute(update(TrendingScore).values(score=TrendingScore.score * math.exp(-rate * _seconds(now, landmark))))
+        db.execute(update(SystemState).where(SystemState.key == LANDMARK_KEY).values(value=now.isoformat()))
+        landmark = now
+
+    shift = math.exp(rate * _seconds(local_landmark, landmark))
+    rows = [
+        {"initiative_id": initiative_id, "score": score * shift, "updated_at": now}
+        for initiative_id, score in deltas.items()
+    ]
+    insert = upsert_insert(db)
+    if insert is None:
+        existing = dict(db.execute(
+            select(TrendingScore.initiative_id, TrendingScore.score).where(TrendingScore.initiative_id.in_(deltas))
+        ).all())
+        for row in rows:
+            if row["initiative_id"] in existing:
+                db.execute(update(TrendingScore).where(TrendingScore.initiative_id == row["initiative_id"])
+                           .values(score=TrendingScore.score + row["score"], updated_at=now))
+            else:
+                db.add(TrendingScore(**row))
+    else:
+        stmt = insert(TrendingScore)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TrendingScore.initiative_id],
+            set_={"score": TrendingScore.score + stmt.excluded.score, "updated_at": stmt.excluded.updated_at},
+        )
+        db.execute(stmt, rows)
+    prune(db)
+
+def prune(db: Session) -> None:
+    """Keep only the best ``TRENDING_MAX_ROWS`` scores once the table outgrows them by 20%"""
+    limit = settings.TRENDING_MAX_ROWS
+    if db.execute(select(func.count()).select_from(TrendingScore)).scalar() <= limit * 1.2:
+        return
+    cutoff = db.execute(
+        select(TrendingScore.score).order_by(TrendingScore.score.desc()).offset(limit - 1).limit(1)
+    ).scalar()
+    if cutoff is not None:
+        db.execute(delete(TrendingScore).where(TrendingScore.score < cutoff))
+
+def backfill(db: Session, days: float) -> dict:
+    """Recompute scores from raw view/save/application rows of the last ``days`` days"""
+    now = datetime.utcnow()
+    since = now - timedelta(days=days)
+    rate = decay_rate()
+    scores: Dict[int, float] = {}
+    counts = {}
+    sources = [
+        ("view", InitiativeView.initiative_id, InitiativeView.viewed_at),
+        ("save", SavedInitiative.initiative_id, SavedInitiative.saved_at),
+        ("apply", InitiativeApplication.initiative_id, InitiativeApplication.applied_at),
+    ]
+    for event, id_column, time_column in sources:
+        counts[event] = 0
+        query = select(id_column, time_column).where(time_column >= since).execution_options(yield_per=10000)
+        for initiative_id, when in db.execute(query):
+            scores[initiative_id] = scores.get(initiative_id, 0.0) + \
+                EVENT_WEIGHTS[event] * math.exp(-rate * _seconds(now, when))
+            counts[event] += 1
+
+    db.execute(delete(TrendingScore))
+    db.execute(delete(SystemState).where(SystemState.key == LANDMARK_KEY))
+    db.flush()
+    apply_deltas(db, scores, now)
+    db.commit()
+    return {"events": counts, "initiatives": len(scores)}
+
+tracker = TrendingTracker()
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Rebuild trending scores from raw engagement rows")
+    parser.add_argument("--backfill", action="store_true", required=True)
+    parser.add_argument("--days", type=float, default=14.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        print(json.dumps(backfill(session, args.days), indent=2))
+    finally:
+        session.close()
@@ -0,0 +1,133 @@
+"""
+Attribute bitmaps for filtered semantic search
+
+Every filterable value - a status, a practice area, a time commitment, one
+skill or one industry - has a bitset over the rows of the embedding store,
+with bit ``i`` set when row ``i`` holds the live vector of an initiative
+carrying that value. A filter is the AND of its values' bitsets, so the
+vector index can restrict scoring to matching rows without a database
+round trip.
+
+Attributes change without re-embedding (status moves to FULL, practice
+edits), so they are synced on their own ``updated_at`` high-water mark.
+"""
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.initiative import Initiative
+from app.schemas.base import get_list_from_json
+
+Key = Tuple[str, str]
+
+def _value(value) -> Optional[str]:
+    return getattr(value, "value", value)
+
+def criteria(status=None, practice_area: Optional[str] = None, time_commitment: Optional[str] = None,
+             skills: Optional[Sequence[str]] = None, industries: Optional[Sequence[str]] = None) -> List[Key]:
+    """(field, value) keys a result must all carry; skills and industries must all be present"""
+    keys = [(field, _value(value)) for field, value in
+            (("status", status), ("practice_area", practice_area), ("time_commitment", time_commitment))
+            if value]
+    keys += [("skills_needed", skill) for skill in skills or ()]
+    keys += [("industries", industry) for industry in industries or ()]
+    return keys
+
+def _keys(record) -> FrozenSet[Key]:
+    keys = {(field, _value(getattr(record, field)))
+            for field in ("status", "practice_area", "time_commitment") if getattr(record, field)}
+    for field in ("skills_needed", "industries"):
+        keys.update((field, value) for value in get_list_from_json(getattr(record, field)) if isinstance(value, str))
+    return frozenset(keys)
+
+class AttributeBitmaps:
+    """Per-value bitsets over embedding store rows (numbered like the vector index's nodes)"""
+
+    def __init__(self):
+        self.attributes: Dict[int, FrozenSet[Key]] = {}  # initiative -> keys
+        self.watermark: Optional[datetime] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the row numbering (store compacted); attributes are kept"""
+        self.count = 0
+        self.bits: Dict[Key, bytearray] = {}
+        self.rows: Dict[int, int] = {}  # initiative -> row holding its bits
+
+    def _flip(self, row: int, keys, on: bool) -> None:
+        byte, bit = row >> 3, 0x80 >> (row & 7)
+        for key in keys:
+            bits = self.bits.get(key)
+            if bits is None:
+                if not on:
+                    continue
+                bits = self.bits[key] = bytearray((self.count + 7) >> 3)
+            if on:
+                bits[byte] |= bit
+            else:
+                bits[byte] &= ~bit & 0xFF
+
+    def _load(self, db: Session) -> Dict[int, FrozenSet[Key]]:
+        """Apply attribute changes since the watermark; returns the previous keys of changed initiatives"""
+        query = select(
+            Initiative.id, Initiative.status, Initiative.practice_area, Initiative.time_commitment,
+            Initiative.skills_needed, Initiative.industries, Initiative.updated_at,
+        )
+        if self.watermark is not None:
+            query = query.where(Initiative.updated_at >= self.watermark)
+        previous = {}
+        for record in db.execute(query).all():
+            keys = _keys(record)
+            old = self.attributes.get(record.id, frozenset())
+            if keys != old:
+                previous[record.id] = old
+                self.attributes[record.id] = keys
+            if record.updated_at is not None and (self.watermark is None or record.updated_at > self.watermark):
+                self.watermark = record.updated_at
+        return previous
+
+    def sync(self, db: Session, labels: Sequence[int], deleted: bytes) -> None:
+        """Refresh attributes and cover the rows added since the last sync"""
+        previous = self._load(db)
+        start, count = self.count, len(labels)
+        size = (count + 7) >> 3
+        for bits in self.bits.values():
+            if len(bits) < size:
+                bits.extend(bytes(size - len(bits)))
+        self.count = count
+
+        for initiative_id, old in previous.items():
+            row = self.rows.get(initiative_id)
+            if row is not None:
+                self._flip(row, old - self.attributes[initiative_id], False)
+                self._flip(row, self.attributes[initiative_id] - old, True)
+        for row in range(start, count):
+            if deleted[row]:
+                continue
+            initiative_id = labels[row]
+            keys = self.attributes.get(initiative_id, frozenset())
+            old_row = self.rows.get(initiative_id)
+            if old_row is not None:
+                self._flip(old_row, keys, False)
+            self.rows[initiative_id] = row
+            self._flip(row, keys, True)
+
+    def mask(self, keys: Sequence[Key], count: int) -> np.ndarray:
+        """Rows (of the first ``count``) whose initiative carries every key"""
+        combined = None
+        for key in keys:
+            bits = self.bits.get(key)
+            if bits is None:
+                return np.zeros(count, dtype=bool)
+            array = np.frombuffer(bytes(bits), dtype=np.uint8)
+            combined = array if combined is None else combined & array
+        if combined is None:
+            return np.ones(count, dtype=bool)
+        mask = np.zeros(count, dtype=bool)
+        unpacked = np.unpackbits(combined, count=min(count, 8 * len(combined))).astype(bool)
+        mask[:len(unpacked)] = unpacked
+        return mask
+
+    def stats(self) -> dict:
+        return {"rows": self.count, "bitmaps": len(self.bits), "initiatives": len(self.attributes)}
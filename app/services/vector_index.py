@@ -0,0 +1,674 @@
+"""
+In-process approximate nearest-neighbor index (HNSW) for semantic search
+
+Semantic search compares a query embedding with the stored initiative
+embeddings. Scanning every vector is exact but linear in the catalog size
+(archived initiatives included); a Hierarchical Navigable Small World graph
+answers the same query by a greedy walk that touches a few hundred vectors.
+
+* Every node is linked to at most ``M`` neighbors per layer (``2 * M`` on
+  the base layer), chosen with the diversity heuristic of the HNSW paper;
+  node levels are drawn geometrically, so upper layers are sparse express
+  lanes into the dense base layer.
+* ``ef_construction`` and ``ef_search`` size the candidate lists while
+  inserting and while searching: larger is slower and more accurate.
+* Inserts are incremental. Deletes leave a tombstone - the node keeps
+  routing but is never returned.
+
+The graph is laid over the shared, memory-mapped embedding store
+(``app.services.embedding_store``): node ``i`` is store row ``i``, so the
+vectors themselves are never copied into a worker. A background thread per
+worker, started with the application, syncs the store from the database
+every ``VECTOR_INDEX_SYNC_INTERVAL`` seconds and links the rows appended
+since, a chunk at a time; searches walk the linked graph and scan the rows
+not linked yet exactly, so they never wait for inserts or touch the
+database. The periodic ``save_vector_index`` job writes the graph
+atomically to ``VECTOR_INDEX_PATH`` (loaded on first use or before forking, so restarts
+only link recent rows); once tombstones exceed
+``VECTOR_INDEX_MAX_DELETED_RATIO`` it compacts the store and rebuilds the
+graph for the new generation before swapping both in.
+
+Searches can be restricted by initiative attributes through per-value
+bitmaps over the same rows (``app.services.vector_filters``).
+
+    python -m app.services.embeddings     # embed existing initiatives first
+    python -m app.services.vector_index   # build from the database and save
+"""
+import heapq
+import json
+import logging
+import math
+import os
+import random
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.jobs import job_handler
+from app.core.warmup import register_preloader, register_warmer
+from app.services import embedding_store
+from app.services.embedding_store import EmbeddingStore
+from app.services.embeddings import embed_matrix
+from app.services.quantization import QuantizedVectors, ScalarQuantizer, rerank
+from app.services.vector_filters import AttributeBitmaps
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Rows sampled to fit an int8 codebook
+QUANTIZATION_SAMPLE = 65536
+
+# Nodes linked per hold of the graph lock, so searches interleave with inserts
+LINK_CHUNK = 64
+
+def _normalize(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class HNSWIndex:
+    """HNSW graph over labeled, L2-normalized float32 vectors (cosine similarity)"""
+
+    def __init__(self, dim: int, m: Optional[int] = None, ef_construction: Optional[int] = None,
+                 ef_search: Optional[int] = None, seed: int = 0):
+        self.dim = dim
+        self.m = m or settings.HNSW_M
+        self.m0 = 2 * self.m
+        self.ef_construction = ef_construction or settings.HNSW_EF_CONSTRUCTION
+        self.ef_search = ef_search or settings.HNSW_EF_SEARCH
+        self.level_mult = 1.0 / math.log(max(self.m, 2))
+        self.rng = random.Random(seed)
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.count = 0
+        self.labels: List[int] = []  # node -> label
+        self.nodes: Dict[int, int] = {}  # label -> live node
+        self.deleted = bytearray()  # node -> tombstone flag
+        self.links: List[List[List[int]]] = []  # node -> layer -> neighbor nodes
+        self.entry = -1
+        self.max_level = -1
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, label: int) -> bool:
+        return label in self.nodes
+
+    @property
+    def tombstones(self) -> int:
+        return self.count - len(self.nodes)
+
+    # -- graph primitives ------------------------------------------------
+
+    def _search_layer(self, query: np.ndarray, entries: Sequence[int], ef: int, level: int,
+                      allowed: Optional[bytes] = None) -> List[Tuple[float, int]]:
+        """
+        ``ef`` nearest (distance, node) pairs on one layer, closest first.
+        With ``allowed`` (one flag byte per node) other nodes still route
+        the walk but are never collected.
+        """
+        similarity = self._scorer(query)
+        visited = set(entries)
+        distances = (1.0 - similarity(list(entries))).tolist()
+        candidates = list(zip(distances, entries))
+        heapq.heapify(candidates)
+        results = [(-d, n) for d, n in candidates if allowed is None or allowed[n]]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if len(results) >= ef and distance > -results[0][0]:
+                break
+            neighbors = [n for n in self.links[node][level] if n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+            worst = -results[0][0] if results else math.inf
+            for d, n in zip((1.0 - similarity(neighbors)).tolist(), neighbors):
+                if len(results) < ef or d < worst:
+                    heapq.heappush(candidates, (d, n))
+                    if allowed is not None and not allowed[n]:
+                        continue
+                    heapq.heappush(results, (-d, n))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+                    worst = -results[0][0]
+        return sorted((-d, n) for d, n in results)
+
+    def _scorer(self, query: np.ndarray):
+        """Similarities of a list of nodes with ``query``; quantized vectors are scored as codes"""
+        vectors = self.vectors
+        if isinstance(vectors, QuantizedVectors):
+            return vectors.scorer(query)
+        return lambda nodes: vectors[nodes] @ query
+
+    def _select(self, candidates: List[Tuple[float, int]], m: int) -> List[int]:
+        """
+        Diversity heuristic: keep a candidate only if it is closer to the base
+        point than to every neighbor kept so far, then top up with the
+        nearest pruned ones so nodes keep their degree.
+        """
+        if len(candidates) <= m:
+            return [n for _, n in candidates]
+        nodes = [n for _, n in candidates]
+        vectors = self.vectors[nodes]
+        gram = (vectors @ vectors.T).tolist()
+        # Highest similarity of each candidate to any neighbor kept so far
+        closeness = [-2.0] * len(nodes)
+        selected: List[int] = []
+        pruned: List[int] = []
+        for position, (distance, node) in enumerate(candidates):
+            if len(selected) >= m:
+                break
+            if 1.0 - closeness[position] < distance:
+                pruned.append(node)
+                continue
+            selected.append(node)
+            row = gram[position]
+            closeness = [c if c > r else r for c, r in zip(closeness, row)]
+        return selected + pruned[:m - len(selected)]
+
+    def _descend(self, query: np.ndarray, down_to: int) -> List[int]:
+        """Greedy walk from the entry point through the layers above ``down_to``"""
+        entry = [self.entry]
+        for level in range(self.max_level, down_to, -1):
+            entry = [self._search_layer(query, entry, 1, level)[0][1]]
+        return entry
+
+    def _grow(self) -> None:
+        if self.count == len(self.vectors):
+            grown = np.empty((max(16, 2 * len(self.vectors)), self.dim), dtype=np.float32)
+            grown[:self.count] = self.vectors[:self.count]
+            self.vectors = grown
+
+    # -- updates ---------------------------------------------------------
+
+    def add(self, label: int, vector) -> None:
+        """Insert or replace the vector of ``label`` (vectors owned by the index)"""
+        vector = _normalize(vector)
+        with self.lock:
+            node = self.nodes.get(label)
+            if node is not None:
+                if np.array_equal(self.vectors[node], vector):
+                    return
+                self.remove(label)
+
+            self._grow()
+            self.vectors[self.count] = vector
+            self._insert(label)
+
+    def append(self, label: int, deleted: bool = False) -> None:
+        """
+        Link the next node, whose vector is already in the attached matrix
+        (row ``count`` of a shared embedding store); ``deleted`` rows only
+        keep the numbering aligned.
+        """
+        with self.lock:
+            if deleted:
+                self.links.append([[]])
+                self.labels.append(label)
+                self.deleted.append(1)
+                self.count += 1
+                return
+            previous = self.nodes.get(label)
+            if previous is not None:
+                self.remove(label)
+            self._insert(label)
+
+    def attach(self, vectors: np.ndarray) -> None:
+        """Read vectors from an external (count, dim) matrix, node ``i`` being row ``i``"""
+        with self.lock:
+            self.vectors = vectors
+
+    def _insert(self, label: int) -> None:
+        node = self.count
+        vector = np.asarray(self.vectors[node], dtype=np.float32)
+        level = int(-math.log(1.0 - self.rng.random()) * self.level_mult)
+        self.links.append([[] for _ in range(level + 1)])
+        self.labels.append(label)
+        self.deleted.append(0)
+        self.nodes[label] = node
+        self.count += 1
+
+        if self.entry < 0:
+            self.entry, self.max_level = node, level
+            return
+
+        entry = self._descend(vector, level)
+        for layer in range(min(level, self.max_level), -1, -1):
+            found = self._search_layer(vector, entry, self.ef_construction, layer)
+            neighbors = self._select(found, self.m)
+            self.links[node][layer] = neighbors
+            cap = self.m0 if layer == 0 else self.m
+            for neighbor in neighbors:
+                links = self.links[neighbor][layer]
+                links.append(node)
+                if len(links) > cap:
+                    distances = (1.0 - self.vectors[links] @ self.vectors[neighbor]).tolist()
+                    self.links[neighbor][layer] = self._select(sorted(zip(distances, links)), cap)
+            entry = [n for _, n in found]
+        if level > self.max_level:
+            self.entry, self.max_level = node, level
+
+    def remove(self, label: int) -> bool:
+        """Tombstone ``label``; returns False when it is not indexed"""
+        with self.lock:
+            node = self.nodes.pop(label, None)
+            if node is None:
+                return False
+            self.deleted[node] = 1
+            return True
+
+    def apply_deleted(self, deleted: np.ndarray) -> int:
+        """Tombstone the nodes flagged in ``deleted`` (one flag per node); returns how many were new"""
+        with self.lock:
+            current = np.frombuffer(bytes(self.deleted[:len(deleted)]), dtype=np.uint8).astype(bool)
+            fresh = np.flatnonzero(deleted[:len(current)] & ~current).tolist()
+            for node in fresh:
+                self.deleted[node] = 1
+                label = self.labels[node]
+                if self.nodes.get(label) == node:
+                    del self.nodes[label]
+            return len(fresh)
+
+    # -- queries ---------------------------------------------------------
+
+    def candidates(self, query: np.ndarray, k: int, ef: Optional[int] = None,
+                   allowed: Optional[bytes] = None) -> List[Tuple[int, float]]:
+        """Approximate ``k`` most similar live (node, cosine) pairs for a normalized query"""
+        with self.lock:
+            if self.entry < 0 or not self.nodes:
+                return []
+            if allowed is None and self.tombstones:
+                # Tombstones route the walk but must not take up its ``ef`` result slots
+                allowed = (np.frombuffer(bytes(self.deleted), dtype=np.uint8) ^ 1).tobytes()
+            found = self._search_layer(query, self._descend(query, 0), max(ef or self.ef_search, k), 0, allowed)
+            return [(n, 1.0 - d) for d, n in found if not self.deleted[n]][:k]
+
+    def search(self, query, k: int, ef: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Approximate ``k`` most similar (label, cosine) pairs, best first"""
+        hits = self.candidates(_normalize(query), k, ef)
+        return [(self.labels[n], similarity) for n, similarity in hits]
+
+    def exact_search(self, query, k: int) -> List[Tuple[int, float]]:
+        """Brute-force ``k`` most similar (label, cosine) pairs over the live vectors"""
+        query = _normalize(query)
+        with self.lock:
+            if not self.nodes:
+                return []
+            scores = self.vectors[:self.count] @ query
+            scores[np.frombuffer(bytes(self.deleted), dtype=np.uint8).astype(bool)] = -np.inf
+            k = min(k, len(self.nodes))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(self.labels[n], float(scores[n])) for n in top.tolist()]
+
+    # -- persistence -----------------------------------------------------
+
+    def save(self, path: str, meta: Optional[dict] = None, include_vectors: bool = True) -> None:
+        """
+        Write the index to ``path`` atomically (temporary file + rename);
+        without ``include_vectors`` only the graph is written (store-backed).
+        """
+        with self.lock:
+            levels = np.fromiter((len(node) - 1 for node in self.links), dtype=np.int32, count=self.count)
+            sizes = [len(links) for node in self.links for links in node]
+            offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+            np.cumsum(sizes, out=offsets[1:])
+            targets = np.fromiter(
+                (n for node in self.links for links in node for n in links), dtype=np.int32, count=int(offsets[-1])
+            )
+            header = {
+                "version": FORMAT_VERSION, "dim": self.dim, "m": self.m,
+                "ef_construction": self.ef_construction, "ef_search": self.ef_search,
+                "entry": self.entry, "max_level": self.max_level, **(meta or {}),
+            }
+            arrays = dict(
+                header=np.array(json.dumps(header)),
+                vectors=self.vectors[:self.count] if include_vectors else np.empty((0, self.dim), dtype=np.float32),
+                labels=np.asarray(self.labels, dtype=np.int64),
+                deleted=np.frombuffer(bytes(self.deleted), dtype=np.uint8),
+                levels=levels, offsets=offsets, targets=targets,
+            )
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as handle:
+            np.savez(handle, **arrays)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["HNSWIndex", dict]:
+        """Read an index written by ``save``; returns it with its header"""
+        with np.load(path) as data:
+            header = json.loads(str(data["header"]))
+            if header.get("version") != FORMAT_VERSION:
+                raise ValueError(f"unsupported vector index version {header.get('version')}")
+            index = cls(header["dim"], header["m"], header["ef_construction"], header["ef_search"])
+            index.vectors = np.array(data["vectors"], dtype=np.float32)
+            index.labels = data["labels"].tolist()
+            index.count = len(index.labels)
+            index.deleted = bytearray(data["deleted"].tobytes())
+            offsets, targets = data["offsets"].tolist(), data["targets"].tolist()
+            position = 0
+            for level in data["levels"].tolist():
+                index.links.append([targets[offsets[i]:offsets[i + 1]] for i in range(position, position + level + 1)])
+                position += level + 1
+        index.nodes = {label: node for node, label in enumerate(index.labels) if not index.deleted[node]}
+        index.entry, index.max_level = header["entry"], header["max_level"]
+        return index, header
+
+class SemanticIndex:
+    """
+    The worker's HNSW graph over the shared embedding store: node ``i`` is
+    store row ``i``, so the graph holds no vectors of its own. With
+    ``VECTOR_QUANTIZATION`` the graph walks (and exact scans score) a
+    quantized copy of the rows instead, and the best candidates are
+    re-ranked against the full-precision store.
+    """
+
+    def __init__(self):
+        self.index: Optional[HNSWIndex] = None
+        self.generation: Optional[int] = None
+        self.quantized: Optional[QuantizedVectors] = None
+        self.full: Optional[np.ndarray] = None  # full-precision rows published to searches
+        self.deleted: Optional[np.ndarray] = None  # tombstone flags of those rows
+        self.labels: List[int] = []  # initiative id of each of those rows
+        self._fitted_rows = 0
+        self.filters = AttributeBitmaps()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        """Live rows searchable, linked or not"""
+        deleted = self.deleted
+        return 0 if deleted is None else len(deleted) - int(deleted.sum())
+
+    def _open(self, store: EmbeddingStore) -> HNSWIndex:
+        """Graph snapshot matching the store's generation, or an empty graph"""
+        path = settings.VECTOR_INDEX_PATH
+        if os.path.exists(path):
+            try:
+                index, header = HNSWIndex.load(path)
+                if header.get("model") == store.model and header.get("generation") == store.generation \
+                        and index.count <= store.count:
+                    return index
+                logger.info("vector index at %s does not match the embedding store; rebuilding", path)
+            except (OSError, ValueError, KeyError):
+                logger.exception("could not load vector index from %s; rebuilding", path)
+        return HNSWIndex(store.dim)
+
+    @staticmethod
+    def _quantize(store: EmbeddingStore, count: int, quantized: Optional[QuantizedVectors],
+                  fitted_rows: int) -> Tuple[Optional[QuantizedVectors], int]:
+        """
+        Quantized copy of the first ``count`` store rows, extending
+        ``quantized`` when it can; the codebook is refitted whenever the
+        store has doubled since it was fitted.
+        """
+        kind = settings.VECTOR_QUANTIZATION
+        if kind == "none":
+            return None, 0
+        if quantized is None or count >= 2 * max(fitted_rows, 1):
+            step = max(1, count // QUANTIZATION_SAMPLE)
+            quantized = QuantizedVectors(ScalarQuantizer.fit(kind, store.matrix[:count:step], store.dim), store.dim)
+            fitted_rows = count
+        quantized.extend(store.matrix[quantized.count:count])
+        return quantized, fitted_rows
+
+    @staticmethod
+    def _catch_up(index: HNSWIndex, store: EmbeddingStore, count: int, vectors=None) -> None:
+        """Link rows appended to the store and tombstone rows deleted from it"""
+        index.attach(store.matrix if vectors is None else vectors)
+        deleted = store.deleted(count)
+        ids = store.ids.tolist()
+        for node in range(index.count, count):
+            index.append(ids[node], bool(deleted[node]))
+        index.apply_deleted(deleted)
+
+    def refresh(self, db: Session) -> Optional[HNSWIndex]:
+        """
+        Sync the store from the database and publish its rows to searches.
+        The graph's tombstones are brought up to date; rows it has not
+        linked yet are left to ``link``.
+        """
+        store = embedding_store.sync(db)
+        with self._lock:
+            if store.mapping is None:
+                return None
+            if self.index is None or self.generation != store.generation:
+                self.index, self.generation = self._open(store), store.generation
+                self.quantized, self._fitted_rows = None, 0
+                self.filters.reset()
+            count = store.count
+            deleted = store.deleted(count)
+            labels = store.ids.tolist()
+            with self.index.lock:
+                self.quantized, self._fitted_rows = self._quantize(store, count, self.quantized, self._fitted_rows)
+                self.index.attach(store.matrix if self.quantized is None else self.quantized)
+                self.index.apply_deleted(deleted[:self.index.count])
+            self.filters.sync(db, labels, deleted)
+            self.full, self.deleted, self.labels = store.matrix, deleted, labels
+            return self.index
+
+    def link(self) -> None:
+        """Link the published rows into the graph, ``LINK_CHUNK`` nodes per hold of its lock"""
+        with self._lock:
+            index, deleted, labels = self.index, self.deleted, self.labels
+        if index is None:
+            return
+        while True:
+            with index.lock:
+                if index is not self.index or index.count >= len(deleted):
+                    return
+                for node in range(index.count, min(index.count + LINK_CHUNK, len(deleted))):
+                    index.append(labels[node], bool(deleted[node]))
+
+    def sync(self, db: Session) -> Optional[HNSWIndex]:
+        """Bring the store up to date with the database and the graph up to date with the store"""
+        index = self.refresh(db)
+        self.link()
+        return index
+
+    @property
+    def running(self) -> bool:
+        """Whether this worker's background sync thread is alive (threads do not survive a fork)"""
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def start(self) -> None:
+        """Keep this worker's store view and graph synced from a background thread"""
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="vector-index-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            db = SessionLocal()
+            try:
+                self.sync(db)
+            except Exception:
+                logger.exception("vector index sync failed")
+            finally:
+                db.close()
+            self._stop.wait(settings.VECTOR_INDEX_SYNC_INTERVAL)
+
+    def remove(self, initiative_id: int) -> None:
+        """Drop an initiative right away (delete write paths); other workers catch up on sync"""
+        with self._lock:
+            row = self.filters.rows.get(initiative_id)
+            if self.deleted is not None and row is not None and row < len(self.deleted):
+                self.deleted[row] = True
+        if self.index is not None:
+            self.index.remove(initiative_id)
+
+    @staticmethod
+    def _scan(index: HNSWIndex, quantized: Optional[QuantizedVectors], full: np.ndarray, query: np.ndarray,
+              allowed: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """Exact ``k`` best (node, similarity) pairs among the nodes flagged in ``allowed``"""
+        rows = np.flatnonzero(allowed)
+        k = min(k, len(rows))
+        if not k:
+            return []
+        if 4 * len(rows) < len(allowed):
+            # Selective filter: score only the matching rows
+            scores = quantized.scorer(query)(rows) if quantized is not None else full[rows] @ query
+        else:
+            scores = quantized.scores(query)[:len(allowed)] if quantized is not None else full[:len(allowed)] @ query
+            scores = np.where(allowed, scores, -np.inf)
+            rows = np.arange(len(allowed))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(rows[i]), float(scores[i])) for i in top]
+
+    def search(self, vector, limit: int, exact: bool = False,
+               criteria: Optional[Sequence[Tuple[str, str]]] = None) -> List[Tuple[int, float]]:
+        """
+        (initiative_id, similarity) pairs for an embedding, best first,
+        restricted to initiatives matching every ``criteria`` key. A graph
+        walk slows down as a filter gets more selective while a scan of the
+        matching rows speeds up, so filters matching at most
+        ``VECTOR_FILTER_EXACT_ROWS`` rows (or ``VECTOR_FILTER_EXACT_RATIO``
+        of the live ones) are answered by an exact scan. Rows published but
+        not linked into the graph yet are always scanned.
+        """
+        with self._lock:
+            index, quantized, full = self.index, self.quantized, self.full
+            deleted, labels = self.deleted, self.labels
+            if index is None or deleted is None:
+                return []
+            allowed = self.filters.mask(criteria, len(deleted)) if criteria else None
+        query = _normalize(vector)
+        shortlist = limit if quantized is None else limit * settings.VECTOR_RERANK_FACTOR
+        with index.lock:
+            linked = min(index.count, len(deleted))
+            live = ~deleted
+            live[:linked] &= ~np.frombuffer(bytes(index.deleted[:linked]), dtype=np.uint8).astype(bool)
+            wanted = live
+            if allowed is not None:
+                wanted = allowed & live
+                matches = int(wanted.sum())
+                if not matches:
+                    return []
+                exact = exact or matches <= max(settings.VECTOR_FILTER_EXACT_ROWS,
+                                                settings.VECTOR_FILTER_EXACT_RATIO * int(live.sum()))
+            if exact or not linked:
+                hits = self._scan(index, quantized, full, query, wanted, shortlist)
+            else:
+                flags = None if allowed is None and live[:linked].all() else wanted[:linked].tobytes()
+                hits = index.candidates(query, shortlist, max(index.ef_search, shortlist), flags)
+                if linked < len(wanted):
+                    tail = wanted.copy()
+                    tail[:linked] = False
+                    hits += self._scan(index, quantized, full, query, tail, shortlist)
+            if quantized is not None:
+                hits = rerank(full, [row for row, _ in hits], query, limit)
+            else:
+                hits.sort(key=lambda hit: -hit[1])
+            return [(labels[row], score) for row, score in hits[:limit]]
+
+    def _meta(self, store: EmbeddingStore) -> dict:
+        return {"model": store.model, "generation": store.generation}
+
+    def _report(self) -> dict:
+        full, quantized = self.full, self.quantized
+        return {"quantization": settings.VECTOR_QUANTIZATION, "full_bytes": full.nbytes if full is not None else 0,
+                "filters": self.filters.stats(),
+                "quantized_bytes": quantized.nbytes if quantized is not None else 0}
+
+    def save(self, db: Session, path: Optional[str] = None) -> dict:
+        """
+        Sync and write the graph snapshot. Past
+        ``VECTOR_INDEX_MAX_DELETED_RATIO`` tombstones the store is compacted
+        first and the graph rebuilt for the new generation before it is
+        swapped in, so workers switch to both together.
+        """
+        path = path or settings.VECTOR_INDEX_PATH
+        index = self.sync(db)
+        store = embedding_store.store
+        if index is None:
+            return {"indexed": 0, "path": path}
+        if store.count and (store.count - store.live()) / store.count > settings.VECTOR_INDEX_MAX_DELETED_RATIO:
+            rebuilt = {}
+
+            def build_graph(temporary: str) -> None:
+                compacted = EmbeddingStore(temporary).refresh()
+                count = compacted.count
+                quantized, fitted_rows = self._quantize(compacted, count, None, 0)
+                graph = HNSWIndex(compacted.dim, index.m, index.ef_construction, index.ef_search)
+                self._catch_up(graph, compacted, count, quantized)
+                graph.save(path, self._meta(compacted), include_vectors=False)
+                rebuilt.update(graph=graph, quantized=quantized, fitted_rows=fitted_rows, full=compacted.matrix)
+
+            with store.writing():
+                report = store.compact(before_swap=build_graph)
+            with self._lock:
+                # The temporary file was renamed into place, so its mapping stays valid
+                self.index, self.generation = rebuilt["graph"], report["generation"]
+                self.quantized, self._fitted_rows = rebuilt["quantized"], rebuilt["fitted_rows"]
+                self.full = rebuilt["full"]
+                self.labels = list(self.index.labels)
+                self.deleted = np.frombuffer(bytes(self.index.deleted), dtype=np.uint8).astype(bool)
+                self.filters.reset()
+                self.filters.sync(db, self.labels, self.deleted)
+            return {"indexed": len(self.index), "compacted": report, "path": path, **self._report()}
+        with self._lock:
+            meta = self._meta(store)
+        index.save(path, meta, include_vectors=False)
+        return {"indexed": len(index), "tombstones": index.tombstones, "path": path, **self._report()}
+
+semantic = SemanticIndex()
+
+def search(db: Session, query: str, limit: int,
+           criteria: Optional[Sequence[Tuple[str, str]]] = None) -> Optional[List[Tuple[int, float]]]:
+    """
+    (initiative_id, similarity) for a text query, or None when nothing is
+    indexed; ``criteria`` from ``vector_filters.criteria`` restrict the results.
+    """
+    if settings.VECTOR_INDEX_SYNC_INTERVAL <= 0:
+        semantic.sync(db)
+    elif not semantic.running:
+        # No sync thread in this worker yet: publish the store now, leave linking to the background
+        semantic.refresh(db)
+        semantic.start()
+    if not len(semantic):
+        return None
+    vector = embed_matrix([query])[0]
+    return semantic.search(vector, limit, settings.VECTOR_INDEX_BACKEND == "exact", criteria)
+
+@register_preloader
+@register_warmer
+def _load() -> None:
+    db = SessionLocal()
+    try:
+        semantic.sync(db)
+    finally:
+        db.close()
+
+@job_handler("save_vector_index", every=settings.VECTOR_INDEX_SAVE_INTERVAL)
+def save_vector_index(db: Session, entity_id: int, payload: dict) -> None:
+    """Periodic snapshot of the vector index so restarts only replay recent rows"""
+    logger.debug("vector index saved: %s", semantic.save(db))
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        print(json.dumps(semantic.save(session), indent=2))
+    finally:
+        session.close()
@@ -0,0 +1,5 @@
+"""
+Performance benchmark suite
+
+Run everything with ``python -m benchmarks.run_all`` from the repository root.
+"""
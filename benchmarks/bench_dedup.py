@@ -0,0 +1,45 @@
+"""
+Near-duplicate lookup benchmark: MinHash signature and LSH probe latency
+
+The index is filled with random signatures for catalogs of increasing size;
+lookup latency should stay flat as the catalog grows.
+"""
+import time
+import numpy as np
+from benchmarks.common import summarize
+
+NAME = "dedup"
+
+TITLE = "AI Healthcare Research Pod"
+DESCRIPTION = (
+    "Join our research team exploring AI applications in healthcare. We're investigating how "
+    "machine learning can improve patient outcomes and reduce costs. Looking for analysts with "
+    "data science skills and healthcare knowledge."
+)
+
+def _timed(func, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def run(sizes=(1_000, 100_000), repeat: int = 2000) -> dict:
+    from app.core.config import settings
+    from app.services.dedup import MinHashLSH, shingles, signature
+
+    results = {"signature": summarize(_timed(lambda: signature(shingles(TITLE, DESCRIPTION)), repeat // 10))}
+    sig = signature(shingles(TITLE, DESCRIPTION))
+    rng = np.random.RandomState(0)
+    for size in sizes:
+        index = MinHashLSH(settings.DEDUP_NUM_PERM, settings.DEDUP_BANDS)
+        for i in range(size):
+            index.add(i, rng.randint(0, 1 << 32, size=settings.DEDUP_NUM_PERM, dtype=np.uint64).astype(np.uint32))
+        index.add(size, sig)
+        results[f"query_{size}"] = summarize(_timed(lambda: index.query(sig, settings.DEDUP_THRESHOLD), repeat))
+    return results
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,89 @@
+"""
+Sparse fieldset benchmark: payload size and latency of 100-row list pages
+
+Lists initiatives (long descriptions), search results and users (long
+bios) from a seeded SQLite database through the ASGI app, with every field
+and with a card-view ``fields=`` projection. The application cache is off,
+so each request runs its queries and serialization.
+"""
+import json
+import subprocess
+import time
+from benchmarks.common import REPO_ROOT, python, subprocess_env, summarize, temp_database_url
+
+NAME = "fields"
+
+PAGE = 100
+
+CASES = {
+    "initiatives": ("/api/v1/initiatives/", {"limit": PAGE}, "id,title,status,practice_area,save_count"),
+    "search": ("/api/v1/search/", {"q": "initiative", "limit": PAGE}, "id,title,status,practice_area,save_count"),
+    "users": ("/api/v1/users/", {"limit": PAGE}, "id,full_name,practice,role"),
+}
+
+def _paragraphs(seed: int, words: int) -> str:
+    vocabulary = ("initiative research client data model strategy cloud team analysis "
+                  "healthcare finance delivery insight platform pilot roadmap").split()
+    return " ".join(vocabulary[(seed * 7 + i * 13) % len(vocabulary)] for i in range(words))
+
+def seed(initiatives: int, users: int) -> None:
+    """Fill the configured database with initiatives and users carrying long text"""
+    from app.core.init_db import init_db, seed_sample_data
+    from app.core.database import SessionLocal
+    from app.core.security import get_password_hash
+    from app.models.initiative import Initiative
+    from app.models.user import User
+
+    init_db()
+    seed_sample_data()
+    db = SessionLocal()
+    password = get_password_hash("password123")
+    db.bulk_insert_mappings(User, [
+        dict(email=f"user{i}@example.com", password_hash=password, full_name=f"User {i}",
+             practice="Technology", bio=_paragraphs(i, 300))
+        for i in range(users)
+    ])
+    db.bulk_insert_mappings(Initiative, [
+        dict(title=f"Benchmark initiative {i}", description=_paragraphs(i, 400),
+             practice_area="Technology", owner_id=2, tags=json.dumps(["Cloud", "Data"]))
+        for i in range(initiatives)
+    ])
+    db.commit()
+    db.close()
+
+def measure(runs: int) -> dict:
+    """Run inside a child interpreter pointed at a seeded database"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    token = client.post("/api/v1/auth/login", json={"email": "analyst@deloitte.com", "password": "password123"})
+    headers = {"Authorization": "Bearer " + token.json()["access_token"]}
+    results = {}
+    for name, (path, params, fields) in CASES.items():
+        for variant, extra in (("all_fields", {}), ("projected", {"fields": fields})):
+            samples, size = [], 0
+            for _ in range(runs):
+                started = time.perf_counter()
+                response = client.get(path, params={**params, **extra}, headers=headers)
+                samples.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.text
+                size = len(response.content)
+            results[f"{name}_{variant}"] = {"payload_bytes": size, **summarize(samples)}
+    return results
+
+def run(runs: int = 30, initiatives: int = 2_000, users: int = 500) -> dict:
+    env = subprocess_env(DATABASE_URL=temp_database_url(), JOB_WORKERS="0", CACHE_ENABLED="false")
+    subprocess.run(
+        [python(), "-c", f"from benchmarks.bench_fields import seed; seed({initiatives}, {users})"],
+        env=env, cwd=REPO_ROOT, check=True, capture_output=True,
+    )
+    child = subprocess.run(
+        [python(), "-c", f"import json; from benchmarks.bench_fields import measure; print(json.dumps(measure({runs})))"],
+        env=env, cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+    )
+    results = json.loads(child.stdout.strip().splitlines()[-1])
+    return {"page_size": PAGE, **results}
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
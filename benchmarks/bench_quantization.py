@@ -0,0 +1,96 @@
+"""
+Quantization benchmark: memory, scan throughput and recall of float16/int8
+
+Scores generated clustered embeddings (see ``bench_vector_index``) with a
+brute-force scan in each precision, re-ranks ``k * VECTOR_RERANK_FACTOR``
+candidates against the float32 vectors, and reports recall@10 against the
+float32 scan, with and without the re-rank step. A smaller HNSW graph is
+also built and walked over each precision.
+"""
+import time
+import numpy as np
+from benchmarks.bench_vector_index import dataset
+from benchmarks.common import summarize
+
+NAME = "quantization"
+
+K = 10
+
+def _top(scores: np.ndarray, k: int) -> np.ndarray:
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+def _graph(kind: str, vectors: np.ndarray, probes: np.ndarray, truth: list) -> dict:
+    from app.core.config import settings
+    from app.services.quantization import QuantizedVectors, ScalarQuantizer, rerank
+    from app.services.vector_index import HNSWIndex
+
+    index = HNSWIndex(vectors.shape[1])
+    if kind == "float32":
+        index.attach(vectors)
+    else:
+        quantized = QuantizedVectors(ScalarQuantizer.fit(kind, vectors, vectors.shape[1]), vectors.shape[1])
+        quantized.extend(vectors)
+        index.attach(quantized)
+    started = time.perf_counter()
+    for label in range(len(vectors)):
+        index.append(label)
+    build_s = time.perf_counter() - started
+
+    shortlist = K * settings.VECTOR_RERANK_FACTOR
+    samples, found = [], 0
+    for probe, expected in zip(probes, truth):
+        started = time.perf_counter()
+        rows = [node for node, _ in index.candidates(probe, shortlist, max(index.ef_search, shortlist))]
+        hits = rerank(vectors, rows, probe, K)
+        samples.append((time.perf_counter() - started) * 1000)
+        found += len(expected & {row for row, _ in hits})
+    return {"build_s": round(build_s, 2), "recall_at_10": round(found / (K * len(probes)), 4), **summarize(samples)}
+
+def run(size: int = 100_000, queries: int = 200, graph_size: int = 3_000) -> dict:
+    from app.core.config import settings
+    from app.services.quantization import QuantizedVectors, ScalarQuantizer, rerank
+
+    vectors, probes = dataset(size, queries, settings.EMBEDDING_DIM)
+    truth = [set(_top(vectors @ probe, K).tolist()) for probe in probes]
+
+    samples = []
+    for probe in probes:
+        started = time.perf_counter()
+        _top(vectors @ probe, K)
+        samples.append((time.perf_counter() - started) * 1000)
+    results = {
+        "vectors": size, "dim": vectors.shape[1], "rerank_factor": settings.VECTOR_RERANK_FACTOR,
+        "float32": {"bytes": vectors.nbytes, "qps": round(1000 / np.mean(samples), 1), **summarize(samples)},
+    }
+
+    shortlist = K * settings.VECTOR_RERANK_FACTOR
+    for kind in ("float16", "int8"):
+        quantized = QuantizedVectors(ScalarQuantizer.fit(kind, vectors, vectors.shape[1]), vectors.shape[1])
+        quantized.extend(vectors)
+        samples, raw, reranked = [], 0, 0
+        for probe, expected in zip(probes, truth):
+            started = time.perf_counter()
+            scores = quantized.scores(probe)
+            candidates = np.argpartition(-scores, shortlist - 1)[:shortlist]
+            hits = rerank(vectors, candidates, probe, K)
+            samples.append((time.perf_counter() - started) * 1000)
+            raw += len(expected & set(_top(scores, K).tolist()))
+            reranked += len(expected & {row for row, _ in hits})
+        results[kind] = {
+            "bytes": quantized.nbytes,
+            "recall_at_10_raw": round(raw / (K * queries), 4),
+            "recall_at_10": round(reranked / (K * queries), 4),
+            "qps": round(1000 / np.mean(samples), 1),
+            **summarize(samples),
+        }
+
+    graph_vectors = vectors[:graph_size]
+    graph_truth = [set(_top(graph_vectors @ probe, K).tolist()) for probe in probes]
+    for kind in ("float32", "float16", "int8"):
+        results[f"hnsw_{kind}"] = {"vectors": graph_size, **_graph(kind, graph_vectors, probes, graph_truth)}
+    return results
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(run(), indent=2))
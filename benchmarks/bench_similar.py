@@ -0,0 +1,50 @@
+"""
+Similar-initiatives benchmark: neighbor computation for a full rebuild and
+for one incremental refresh, on random feature rows
+"""
+import time
+import numpy as np
+from benchmarks.common import summarize
+
+NAME = "similar"
+
+def _features(size: int):
+    from app.core.config import settings
+    from app.services.similar import FeatureMatrix
+
+    rng = np.random.RandomState(0)
+    matrix = rng.standard_normal((size, settings.EMBEDDING_DIM + settings.SIMILAR_ATTR_DIM)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    features = FeatureMatrix()
+    features.ids = np.arange(size, dtype=np.int64)
+    features.matrix = matrix
+    features.rows = {i: i for i in range(size)}
+    return features
+
+def run(size: int = 20_000, runs: int = 3) -> dict:
+    from app.core.config import settings
+
+    features = _features(size)
+    block = settings.SIMILAR_BLOCK_SIZE
+
+    def full():
+        started = time.perf_counter()
+        for start in range(0, size, block):
+            features.top_k(range(start, min(start + block, size)), settings.SIMILAR_TOP_K)
+        return (time.perf_counter() - started) * 1000
+
+    def incremental():
+        started = time.perf_counter()
+        nearest = features.top_k([0], settings.SIMILAR_REVERSE_FANOUT)[0]
+        features.top_k([0] + [n for n, _ in nearest], settings.SIMILAR_TOP_K)
+        return (time.perf_counter() - started) * 1000
+
+    return {
+        "initiatives": size,
+        "full_rebuild": summarize([full() for _ in range(runs)]),
+        "incremental_refresh": summarize([incremental() for _ in range(runs * 10)]),
+    }
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(run(), indent=2))
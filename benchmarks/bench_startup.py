@@ -0,0 +1,75 @@
+"""
+Start-up benchmark: time from process spawn to the first successful /health
+
+The server is launched in production mode through the application factory
+(no DDL, no seeding), exactly as a production deployment would run it.
+"""
+import http.client
+import subprocess
+import time
+from benchmarks.common import REPO_ROOT, free_port, python, subprocess_env, summarize, temp_database_url
+
+NAME = "startup"
+
+def _wait_for_health(port: int, timeout: float = 30.0) -> float:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return time.perf_counter()
+        except OSError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(f"/health not ready on port {port} after {timeout}s")
+
+def measure_import(env: dict) -> float:
+    """Milliseconds to import app.main in a fresh interpreter"""
+    started = time.perf_counter()
+    subprocess.run([python(), "-c", "import app.main"], env=env, cwd=REPO_ROOT, check=True)
+    return (time.perf_counter() - started) * 1000
+
+def heavy_modules_loaded(env: dict) -> list:
+    """Heavy optional dependencies imported as a side effect of app start-up"""
+    script = (
+        "import sys, app.main\n"
+        "from app.core.lazy import HEAVY_MODULES\n"
+        "print(','.join(m for m in HEAVY_MODULES if m in sys.modules))"
+    )
+    out = subprocess.run([python(), "-c", script], env=env, cwd=REPO_ROOT, check=True, capture_output=True, text=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+def measure_startup(env: dict) -> float:
+    """Milliseconds from spawning uvicorn to a 200 from /health"""
+    port = free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [python(), "-m", "uvicorn", "--factory", "app.main:create_app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env, cwd=REPO_ROOT
+    )
+    try:
+        ready = _wait_for_health(port)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return (ready - started) * 1000
+
+def run(runs: int = 5) -> dict:
+    env = subprocess_env(DATABASE_URL=temp_database_url(), PRODUCTION="true")
+    # Production mode does not create tables, so prepare the schema up front
+    subprocess.run([python(), "-c", "from app.core.init_db import init_db; init_db()"],
+                   env=env, cwd=REPO_ROOT, check=True, capture_output=True)
+
+    startup = summarize([measure_startup(env) for _ in range(runs)])
+    imports = summarize([measure_import(env) for _ in range(runs)])
+    return {
+        "time_to_first_health": startup,
+        "import_app_main": imports,
+        "heavy_modules_at_startup": heavy_modules_loaded(env),
+    }
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(run(), indent=2))
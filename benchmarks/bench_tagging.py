@@ -0,0 +1,86 @@
+"""
+Auto-tagging benchmark: keyphrase counting and corpus-wide TF-IDF scoring
+
+Runs the full-mode pipeline of ``app.services.tagging`` (minus database
+I/O) over a synthetic corpus of 100k descriptions built from the seed
+vocabulary, and a full run against a 5k-initiative SQLite database.
+"""
+import random
+import subprocess
+import time
+from benchmarks.common import REPO_ROOT, python, subprocess_env, summarize, temp_database_url
+
+NAME = "tagging"
+
+VOCABULARY = [
+    "Python", "Data Analysis", "PowerBI", "Financial Modeling", "AI/ML", "Cloud Computing",
+    "Team Leadership", "Machine Learning", "Healthcare Knowledge", "GenAI", "Prototyping",
+    "Research", "Financial Services", "Writing", "Client Engagement", "Strategy",
+    "Sustainability", "Project Management", "AI", "Healthcare", "Innovation",
+    "Digital Transformation", "Volunteering", "Pro Bono", "Climate",
+]
+
+FILLER = (
+    "we are looking for analysts to join a team working with clients on new approaches "
+    "the project will involve weekly meetings and research into emerging areas across sectors"
+).split()
+
+def synthetic_corpus(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(size):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(60, 160))]
+        for _ in range(rng.randint(2, 8)):
+            words.insert(rng.randrange(len(words)), rng.choice(VOCABULARY))
+        title = " ".join(rng.sample(FILLER, 3) + [rng.choice(VOCABULARY)])
+        docs.append((title, " ".join(words) + "."))
+    return docs
+
+def measure_pipeline(docs) -> dict:
+    from app.services.tagging import (
+        TagVocabulary, document_frequencies, normalize_term, term_frequencies, top_terms
+    )
+
+    terms = sorted({normalize_term(v) for v in VOCABULARY})
+    vocabulary = TagVocabulary(terms, terms)
+    started = time.perf_counter()
+    counts = [vocabulary.count(title, description) for title, description in docs]
+    counted = time.perf_counter()
+    docs_idx, term_ids, tf = term_frequencies(counts)
+    doc_freq = document_frequencies(term_ids, len(vocabulary))
+    top_terms(docs_idx, term_ids, tf, len(docs), doc_freq, len(docs), 5, 0.2)
+    scored = time.perf_counter()
+    return {"count_ms": (counted - started) * 1000, "score_ms": (scored - counted) * 1000}
+
+def measure_full_run(size: int) -> float:
+    """Milliseconds for ``python -m app.services.tagging`` over ``size`` initiatives"""
+    env = subprocess_env(DATABASE_URL=temp_database_url(), JOB_WORKERS="0")
+    setup = (
+        "import json\n"
+        "from app.core.init_db import init_db, seed_sample_data\n"
+        "from app.core.database import SessionLocal\n"
+        "from app.models.initiative import Initiative\n"
+        "from benchmarks.bench_tagging import synthetic_corpus\n"
+        "init_db(); seed_sample_data()\n"
+        "db = SessionLocal()\n"
+        f"db.bulk_insert_mappings(Initiative, [dict(title=t, description=d, owner_id=2) for t, d in synthetic_corpus({size})])\n"
+        "db.commit()\n"
+    )
+    subprocess.run([python(), "-c", setup], env=env, cwd=REPO_ROOT, check=True, capture_output=True)
+    started = time.perf_counter()
+    subprocess.run([python(), "-m", "app.services.tagging"], env=env, cwd=REPO_ROOT, check=True, capture_output=True)
+    return (time.perf_counter() - started) * 1000
+
+def run(runs: int = 3, documents: int = 100_000, database_rows: int = 5_000) -> dict:
+    docs = synthetic_corpus(documents)
+    samples = [measure_pipeline(docs) for _ in range(runs)]
+    return {
+        "documents": documents,
+        "count_100k": summarize([s["count_ms"] for s in samples]),
+        "score_100k": summarize([s["score_ms"] for s in samples]),
+        "full_run_5k_sqlite": summarize([measure_full_run(database_rows) for _ in range(runs)]),
+    }
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(run(), indent=2))
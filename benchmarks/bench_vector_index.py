@@ -0,0 +1,68 @@
+"""
+Vector index benchmark: HNSW recall@10 and latency against exact search
+
+Builds the in-process HNSW index over generated clustered embeddings (unit
+vectors around topic centers, like text embeddings) and compares queries
+at several ``ef_search`` values with a brute-force scan of the same vectors.
+"""
+import os
+import tempfile
+import time
+import numpy as np
+from benchmarks.common import summarize
+
+NAME = "vector_index"
+
+K = 10
+
+def dataset(size: int, queries: int, dim: int, topics: int = 100, seed: int = 0):
+    """Clustered unit vectors and queries drawn from the same topics"""
+    rng = np.random.RandomState(seed)
+    centers = rng.standard_normal((topics, dim))
+    def draw(count):
+        points = centers[rng.randint(0, topics, count)] + 0.9 * rng.standard_normal((count, dim))
+        return (points / np.linalg.norm(points, axis=1, keepdims=True)).astype(np.float32)
+    return draw(size), draw(queries)
+
+def run(size: int = 10_000, queries: int = 200) -> dict:
+    from app.core.config import settings
+    from app.services.vector_index import HNSWIndex
+
+    vectors, probes = dataset(size, queries, settings.EMBEDDING_DIM)
+    index = HNSWIndex(vectors.shape[1])
+    started = time.perf_counter()
+    for label, vector in enumerate(vectors):
+        index.add(label, vector)
+    build_s = time.perf_counter() - started
+
+    exact, exact_ms = [], []
+    for probe in probes:
+        started = time.perf_counter()
+        exact.append({label for label, _ in index.exact_search(probe, K)})
+        exact_ms.append((time.perf_counter() - started) * 1000)
+
+    results = {
+        "vectors": size, "dim": vectors.shape[1], "m": index.m, "ef_construction": index.ef_construction,
+        "build_s": round(build_s, 2), "exact": summarize(exact_ms),
+    }
+    for ef in (16, 32, 64, 128):
+        samples, found = [], 0
+        for probe, truth in zip(probes, exact):
+            started = time.perf_counter()
+            hits = index.search(probe, K, ef=ef)
+            samples.append((time.perf_counter() - started) * 1000)
+            found += len(truth & {label for label, _ in hits})
+        results[f"hnsw_ef{ef}"] = {"recall_at_10": round(found / (K * queries), 4), **summarize(samples)}
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "index.npz")
+    started = time.perf_counter()
+    index.save(path)
+    saved = time.perf_counter()
+    HNSWIndex.load(path)
+    results["save_ms"] = round((saved - started) * 1000, 1)
+    results["load_ms"] = round((time.perf_counter() - saved) * 1000, 1)
+    return results
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,44 @@
+"""
+Shared helpers for benchmarks
+"""
+import os
+import socket
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+def free_port() -> int:
+    """Ask the OS for an unused TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def temp_database_url() -> str:
+    """SQLite URL in a fresh temporary directory"""
+    directory = tempfile.mkdtemp(prefix="bench-")
+    return f"sqlite:///{os.path.join(directory, 'bench.db')}"
+
+def subprocess_env(**overrides) -> dict:
+    """Environment for child interpreters running the app from the repo root"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(REPO_ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    env.update({k: str(v) for k, v in overrides.items()})
+    return env
+
+def summarize(samples_ms) -> dict:
+    """Median / min / max / p95 of a list of millisecond samples"""
+    ordered = sorted(samples_ms)
+    p95_index = max(0, int(round(0.95 * len(ordered))) - 1)
+    return {
+        "median_ms": round(statistics.median(ordered), 2),
+        "min_ms": round(ordered[0], 2),
+        "p95_ms": round(ordered[p95_index], 2),
+        "max_ms": round(ordered[-1], 2),
+        "runs": len(ordered),
+    }
+
+def python() -> str:
+    return sys.executable
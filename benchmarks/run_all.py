@@ -0,0 +1,74 @@
+"""
+Run the benchmark suite and compare against the tracked baseline
+
+    python -m benchmarks.run_all                 # run and print results
+    python -m benchmarks.run_all --only startup  # run a single benchmark
+    python -m benchmarks.run_all --check         # fail on regressions vs baseline.json
+    python -m benchmarks.run_all --save          # record results as the new baseline
+
+Tracked metrics are every ``median_ms`` value; a regression is a median
+that grew by more than ``--tolerance`` (default 25%) over the baseline.
+"""
+import argparse
+import importlib
+import json
+import sys
+from pathlib import Path
+
+BENCHMARKS = [
+    "benchmarks.bench_startup",
+    "benchmarks.bench_tagging",
+    "benchmarks.bench_dedup",
+    "benchmarks.bench_similar",
+    "benchmarks.bench_fields",
+    "benchmarks.bench_vector_index",
+    "benchmarks.bench_quantization",
+    "benchmarks.bench_filtered_search",
+]
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+def _tracked(results: dict, prefix: str = ""):
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from _tracked(value, path)
+        elif key == "median_ms":
+            yield path, value
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", help="benchmark NAME to run (repeatable)")
+    parser.add_argument("--check", action="store_true", help="compare medians with baseline.json")
+    parser.add_argument("--save", action="store_true", help="write results to baseline.json")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for module_name in BENCHMARKS:
+        module = importlib.import_module(module_name)
+        if args.only and module.NAME not in args.only:
+            continue
+        print(f"running {module.NAME}...", file=sys.stderr)
+        results[module.NAME] = module.run()
+
+    print(json.dumps(results, indent=2))
+
+    status = 0
+    if args.check and BASELINE_PATH.exists():
+        baseline = dict(_tracked(json.loads(BASELINE_PATH.read_text())))
+        for path, value in _tracked(results):
+            reference = baseline.get(path)
+            if reference and value > reference * (1 + args.tolerance):
+                print(f"REGRESSION {path}: {value}ms vs baseline {reference}ms", file=sys.stderr)
+                status = 1
+
+    if args.save:
+        merged = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        merged.update(results)
+        BASELINE_PATH.write_text(json.dumps(merged, indent=2) + "\n")
+
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Production server launcher (pre-fork, multi-worker)
+
+    python serve.py --workers 16 --port 8000
+
+The master process builds the application once in production mode, runs
+the registered preloaders (vocabularies, vector matrices, ...) and then
+forks the workers, so read-only data is shared copy-on-write. Every worker
+runs its own uvicorn server on the shared listening socket.
+
+Signals (sent to the master):
+    SIGHUP          rolling restart: replace workers one at a time
+    SIGTERM/SIGINT  graceful shutdown: workers finish in-flight requests
+    SIGTTIN/SIGTTOU add / remove one worker
+
+Workers that exit unexpectedly (or after --max-requests) are respawned.
+In-process caches are kept coherent through ``app.core.invalidation``,
+which is enabled automatically when more than one worker runs with the
+memory cache backend.
+
+Preloaded code is inherited from the master, so deploying new code needs
+a master restart (SIGHUP only recycles workers).
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+logger = logging.getLogger("serve")
+
+class Master:
+    """Supervises a pool of forked uvicorn workers sharing one socket"""
+
+    def __init__(self, options):
+        self.options = options
+        self.workers = {}  # pid -> spawn time
+        self.target = options.workers
+        self.application = None
+        self.sock = None
+        self._signals = []
+
+    # -- setup -----------------------------------------------------------
+
+    def _prepare(self) -> None:
+        from app.core.config import settings
+
+        if self.target > 1 and settings.CACHE_BACKEND == "memory" \
+                and "CACHE_SYNC_ENABLED" not in settings.model_fields_set:
+            settings.CACHE_SYNC_ENABLED = True
+
+        if not self.options.preload:
+            return
+
+        from app.main import create_app
+        from app.core.database import engine
+        from app.core.jobs import load_handlers
+        from app.core.warmup import run_preloaders, run_warmers
+
+        self.application = create_app(production=True)
+        # Service modules register their preloaders on import
+        load_handlers()
+        run_preloaders()
+        if settings.WARM_CACHES_ON_STARTUP:
+            run_warmers()
+            # Already warm; workers inherit the populated caches
+            settings.WARM_CACHES_ON_STARTUP = False
+
+        # Never carry pooled connections across fork
+        engine.dispose()
+        # Move everything allocated so far out of the collector's reach so
+        # GC passes in the workers don't dirty the shared pages
+        gc.collect()
+        gc.freeze()
+
+    def _bind(self) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.options.host, self.options.port))
+        sock.listen(self.options.backlog)
+        sock.set_inheritable(True)
+        self.sock = sock
+
+    # -- workers ---------------------------------------------------------
+
+    def _spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._worker_main()
+            except BaseException:
+                logger.exception("worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = time.monotonic()
+        logger.info("spawned worker %s", pid)
+        return pid
+
+    def _worker_main(self) -> None:
+        for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGTTIN, signal.SIGTTOU, signal.SIGCHLD):
+            signal.signal(sig, signal.SIG_DFL)
+
+        import uvicorn
+        from app.core.cache import cache
+        from app.core.database import engine
+
+        # Inherited pool entries belong to the parent; don't close them here
+        engine.dispose(close=False)
+        cache.backend.reset_after_fork()
+
+        application = self.application
+        if application is None:
+            from app.main import create_app
+            application = create_app(production=True)
+
+        config = uvicorn.Config(
+            application,
+            log_level=self.options.log_level,
+            timeout_graceful_shutdown=self.options.graceful_timeout,
+            limit_max_requests=self.options.max_requests or None,
+            proxy_headers=True,
+        )
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def _reap(self) -> list:
+        exited = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if self.workers.pop(pid, None) is not None:
+                exited.append((pid, status))
+        return exited
+
+    def _stop_worker(self, pid: int, sig=signal.SIGTERM) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            self.workers.pop(pid, None)
+
+    def _wait_for(self, pids, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and any(pid in self.workers for pid in pids):
+            self._reap()
+            time.sleep(0.05)
+        for pid in pids:
+            if pid in self.workers:
+                logger.warning("worker %s did not stop in time, killing", pid)
+                self._stop_worker(pid, signal.SIGKILL)
+        self._reap()
+
+    def _rolling_restart(self) -> None:
+        logger.info("rolling restart of %d workers", len(self.workers))
+        for pid in list(self.workers):
+            self._spawn()
+            # Give the replacement a moment to start accepting before retiring
+            time.sleep(self.options.restart_delay)
+            self._stop_worker(pid)
+            self._wait_for([pid], self.options.graceful_timeout + 5)
+
+    def _shutdown(self) -> None:
+        logger.info("shutting down %d workers", len(self.workers))
+        pids = list(self.workers)
+        for pid in pids:
+            self._stop_worker(pid)
+        self._wait_for(pids, self.options.graceful_timeout + 5)
+
+    # -- main loop -------------------------------------------------------
+
+    def _on_signal(self, signum, frame) -> None:
+        self._signals.append(signum)
+
+    def run(self) -> int:
+        self._prepare()
+        self._bind()
+        for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(sig, self._on_signal)
+
+        logger.info("master %s listening on %s:%s with %d workers (preload=%s)",
+                    os.getpid(), self.options.host, self.options.port, self.target, self.options.preload)
+        for _ in range(self.target):
+            self._spawn()
+
+        while True:
+            while self._signals:
+                signum = self._signals.pop(0)
+                if signum in (signal.SIGTERM, signal.SIGINT):
+                    self._shutdown()
+                    return 0
+                if signum == signal.SIGHUP:
+                    self._rolling_restart()
+                elif signum == signal.SIGTTIN:
+                    self.target += 1
+                elif signum == signal.SIGTTOU and self.target > 1:
+                    self.target -= 1
+                    self._stop_worker(max(self.workers, key=self.workers.get))
+
+            for pid, status in self._reap():
+                logger.warning("worker %s exited (status %s)", pid, status)
+
+            while len(self.workers) < self.target:
+                self._spawn()
+                # Avoid a tight respawn loop if workers die on start-up
+                time.sleep(0.1)
+
+            time.sleep(0.2)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the API with multiple pre-forked uvicorn workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        help="build the app inside each worker instead of once in the master")
+    parser.add_argument("--graceful-timeout", type=int, default=30,
+                        help="seconds a worker gets to finish in-flight requests")
+    parser.add_argument("--max-requests", type=int, default=0,
+                        help="recycle a worker after this many requests (0 = never)")
+    parser.add_argument("--restart-delay", type=float, default=1.0,
+                        help="seconds between spawning a replacement and stopping the old worker")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    if not hasattr(os, "fork"):
+        sys.exit("serve.py requires a POSIX platform (os.fork); use run.py elsewhere")
+    options = parse_args()
+    logging.basicConfig(level=options.log_level.upper(), format="%(asctime)s %(name)s[%(process)d] %(message)s")
+    sys.exit(Master(options).run())
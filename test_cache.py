@@ -0,0 +1,154 @@
+"""
+Test the Redis cache backend against a minimal in-process RESP server
+"""
+import socketserver
+import threading
+import time
+from app.core.cache import MISSING, Cache, CacheError, RedisBackend, cache, cached
+
+class FakeRedis(socketserver.ThreadingTCPServer):
+    """Speaks just enough RESP2 for RedisBackend: GET SET MGET INCR DEL SCAN"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _FakeRedisHandler)
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return "redis://127.0.0.1:%d/0" % self.server_address[1]
+
+    def value(self, key: bytes):
+        deadline = self.expires.get(key)
+        if deadline is not None and time.monotonic() >= deadline:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    def _command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    @staticmethod
+    def _bulk(value) -> bytes:
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        server = self.server
+        while True:
+            args = self._command()
+            if args is None:
+                return
+            name, keys = args[0].upper(), args[1:]
+            with server.lock:
+                if name == b"GET":
+                    reply = self._bulk(server.value(keys[0]))
+                elif name == b"SET":
+                    options = [option.upper() for option in keys[2:]]
+                    if b"NX" in options and server.value(keys[0]) is not None:
+                        reply = b"$-1\r\n"
+                    else:
+                        server.data[keys[0]] = keys[1]
+                        server.expires.pop(keys[0], None)
+                        if b"PX" in options:
+                            milliseconds = int(keys[2 + options.index(b"PX") + 1])
+                            server.expires[keys[0]] = time.monotonic() + milliseconds / 1000
+                        reply = b"+OK\r\n"
+                elif name == b"MGET":
+                    reply = b"*%d\r\n" % len(keys) + b"".join(self._bulk(server.value(k)) for k in keys)
+                elif name == b"INCR":
+                    value = int(server.value(keys[0]) or 0) + 1
+                    server.data[keys[0]] = b"%d" % value
+                    reply = b":%d\r\n" % value
+                elif name == b"DEL":
+                    removed = sum(server.data.pop(k, None) is not None for k in keys)
+                    reply = b":%d\r\n" % removed
+                elif name == b"SCAN":
+                    prefix = keys[2].rstrip(b"*")
+                    matched = [k for k in list(server.data) if k.startswith(prefix) and server.value(k) is not None]
+                    reply = b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(matched) + b"".join(self._bulk(k) for k in matched)
+                else:
+                    reply = b"-ERR unknown command '%s'\r\n" % name
+            self.wfile.write(reply)
+
+def _backend():
+    server = FakeRedis()
+    return server, RedisBackend(server.url, prefix="test:")
+
+def test_redis_backend_values_and_counters():
+    server, backend = _backend()
+    try:
+        assert backend.get("missing") is MISSING
+        backend.set("a", {"x": [1, 2]})
+        assert backend.get("a") == {"x": [1, 2]}
+        backend.set("short", 1, ttl=0.05)
+        time.sleep(0.1)
+        assert backend.get("short") is MISSING
+
+        backend.init_counter("t", 5)
+        backend.init_counter("t", 9)
+        assert backend.get_counters(["t", "u"]) == [5, None]
+        assert backend.incr_counter("t") == 6
+
+        backend.delete("a")
+        assert backend.get("a") is MISSING
+        backend.set("b", 1)
+        backend.clear()
+        assert not server.data
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_redis_backend_tag_invalidation():
+    server, backend = _backend()
+    try:
+        cache = Cache(backend, default_ttl=60)
+        cache.set("initiatives", "page", [1, 2], tags=["initiatives", "initiative:1"])
+        assert cache.get("initiatives", "page") == [1, 2]
+        cache.invalidate_tags("initiative:1", propagate=False)
+        assert cache.get("initiatives", "page") is MISSING
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_redis_backend_reconnects_and_reports_errors():
+    server, backend = _backend()
+    backend.set("a", 1)
+    backend._sock.close()
+    assert backend.get("a") == 1
+
+    server.shutdown()
+    server.server_close()
+    backend._disconnect()
+    try:
+        backend.get("a")
+    except CacheError:
+        pass
+    else:
+        raise AssertionError("an unreachable server must raise CacheError")
+
+def test_invalidation_during_computation_is_not_cached_over():
+    calls = []
+
+    @cached("test_race", tags=["race"])
+    def compute(x: int) -> int:
+        calls.append(x)
+        if len(calls) == 1:
+            # A write commits while the first result is being computed
+            cache.invalidate_tags("race", propagate=False)
+        return len(calls)
+
+    assert compute(1) == 1
+    assert compute(1) == 2
+    assert compute(1) == 2
@@ -0,0 +1,70 @@
+"""
+Test the job queue's coalescing and reaping against an in-memory database
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.core.jobs import JobRunner, enqueue
+from app.models.job import Job, JobStatus
+
+def _session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Job.__table__.create(engine)
+    return sessionmaker(bind=engine)()
+
+def test_stale_job_with_pending_duplicate_is_superseded():
+    db = _session()
+    long_ago = datetime.utcnow() - timedelta(seconds=settings.JOB_LOCK_TIMEOUT + 60)
+    # A worker died while running (t, 7); an edit then queued a new (t, 7)
+    db.add(Job(job_type="t", entity_id=7, status=JobStatus.RUNNING, locked_by="dead", locked_at=long_ago,
+               started_at=long_ago, created_at=long_ago))
+    db.add(Job(job_type="t", entity_id=8, status=JobStatus.RUNNING, locked_by="dead", locked_at=long_ago,
+               started_at=long_ago, created_at=long_ago))
+    db.commit()
+    enqueue(db, "t", 7, delay=0)
+    db.commit()
+
+    runner = JobRunner(0, 0.05)
+    runner._reap(db)
+    statuses = sorted((job.entity_id, job.status.name) for job in db.query(Job).all())
+    assert statuses == [(7, "FAILED"), (7, "PENDING"), (8, "PENDING")]
+
+    claimed = {runner._claim(db, "w").entity_id, runner._claim(db, "w").entity_id}
+    assert claimed == {7, 8}
+
+def test_finished_jobs_are_deleted_after_retention():
+    db = _session()
+    now = datetime.utcnow()
+    expired = now - timedelta(seconds=settings.JOB_RETENTION + 60)
+    db.add_all([
+        Job(job_type="t", entity_id=1, status=JobStatus.SUCCEEDED, finished_at=expired),
+        Job(job_type="t", entity_id=2, status=JobStatus.FAILED, finished_at=expired),
+        Job(job_type="t", entity_id=3, status=JobStatus.SUCCEEDED, finished_at=now),
+        Job(job_type="t", entity_id=4, status=JobStatus.PENDING, run_at=expired),
+    ])
+    db.commit()
+    JobRunner(0, 0.05)._reap(db)
+    assert sorted(job.entity_id for job in db.query(Job).all()) == [3, 4]
+
+def test_coalescing_stops_delaying_after_max_wait():
+    db = _session()
+    enqueue(db, "t", 1)
+    db.commit()
+    job = db.query(Job).one()
+    first_run = job.run_at
+
+    enqueue(db, "t", 1)
+    db.commit()
+    db.refresh(job)
+    assert job.run_at >= first_run and job.coalesced == 1
+
+    # Edited continuously since long ago: further enqueues no longer push it back
+    job.created_at = datetime.utcnow() - timedelta(seconds=settings.JOB_COALESCE_MAX_WAIT + 60)
+    db.commit()
+    pushed = job.run_at
+    enqueue(db, "t", 1)
+    db.commit()
+    db.refresh(job)
+    assert job.run_at == pushed and job.coalesced == 2
@@ -0,0 +1,178 @@
+"""
+Test the vector search building blocks: HNSW graph, embedding store,
+scalar quantization and attribute bitmaps
+"""
+import json
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models import Initiative
+from app.services.embedding_store import EmbeddingStore
+from app.services.quantization import QuantizedVectors, ScalarQuantizer, rerank
+from app.services.vector_filters import AttributeBitmaps, criteria
+from app.services.vector_index import HNSWIndex
+
+DIM = 32
+
+def _vectors(count: int, seed: int = 0) -> np.ndarray:
+    vectors = np.random.RandomState(seed).standard_normal((count, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def _recall(index: HNSWIndex, queries: np.ndarray, k: int) -> float:
+    found = 0
+    for query in queries:
+        truth = {label for label, _ in index.exact_search(query, k)}
+        found += len(truth & {label for label, _ in index.search(query, k)})
+    return found / (k * len(queries))
+
+def test_hnsw_recall_against_exact_search():
+    index = HNSWIndex(DIM, m=8, ef_construction=64, ef_search=32)
+    for label, vector in enumerate(_vectors(1000)):
+        index.add(label, vector)
+    assert len(index) == 1000
+    assert _recall(index, _vectors(50, seed=1), 10) >= 0.9
+
+def test_hnsw_tombstones_are_never_returned():
+    index = HNSWIndex(DIM, m=8, ef_construction=64, ef_search=16)
+    for label, vector in enumerate(_vectors(500)):
+        index.add(label, vector)
+    for label in range(0, 500, 2):
+        assert index.remove(label)
+    assert not index.remove(0)
+    assert len(index) == 250 and index.tombstones == 250
+
+    for query in _vectors(20, seed=2):
+        hits = index.search(query, 10)
+        assert len(hits) == 10
+        assert all(label % 2 for label, _ in hits)
+    assert _recall(index, _vectors(50, seed=3), 10) >= 0.9
+
+def test_hnsw_filtered_walk_returns_only_allowed_nodes():
+    index = HNSWIndex(DIM, m=8, ef_construction=64, ef_search=32)
+    for label, vector in enumerate(_vectors(500)):
+        index.add(label, vector)
+    allowed = np.zeros(500, dtype=np.uint8)
+    allowed[::5] = 1
+    for query in _vectors(20, seed=4):
+        hits = index.candidates(query, 10, None, allowed.tobytes())
+        assert hits and all(allowed[node] for node, _ in hits)
+
+def test_hnsw_save_and_load_round_trip(tmp_path):
+    index = HNSWIndex(DIM, m=8, ef_construction=64, ef_search=32)
+    for label, vector in enumerate(_vectors(200)):
+        index.add(label + 100, vector)
+    index.remove(150)
+    path = str(tmp_path / "index.npz")
+    index.save(path, {"model": "test"})
+    loaded, header = HNSWIndex.load(path)
+    assert header["model"] == "test" and len(loaded) == len(index) and 150 not in loaded
+    query = _vectors(1, seed=5)[0]
+    assert loaded.search(query, 10) == index.search(query, 10)
+
+def test_embedding_store_append_tombstone_compact(tmp_path):
+    path = str(tmp_path / "embeddings.store")
+    vectors = _vectors(1500)
+    writer = EmbeddingStore(path)
+    with writer.writing():
+        writer.reset("test-model", DIM, "float32")
+        for initiative_id, vector in enumerate(vectors, start=1):
+            writer.append(initiative_id, vector)  # grows past the initial capacity
+        assert writer.delete(5)
+        assert not writer.delete(99999)
+        replacement = _vectors(1, seed=6)[0]
+        writer.append(7, replacement)
+
+    # Another worker maps the same file
+    reader = EmbeddingStore(path).refresh()
+    assert reader.count == 1501 and reader.live() == 1499
+    assert reader.get(5) is None
+    np.testing.assert_array_equal(reader.get(7), replacement)
+    np.testing.assert_array_equal(reader.get(8), vectors[7])
+
+    with writer.writing():
+        report = writer.compact()
+    assert report == {"rows_before": 1501, "rows_after": 1499, "generation": 1}
+    reader.refresh()
+    assert reader.generation == 1 and reader.count == reader.live() == 1499
+    assert sorted(reader.ids.tolist()) == [i for i in range(1, 1501) if i != 5]
+    assert reader.get(5) is None
+    np.testing.assert_array_equal(reader.get(7), replacement)
+
+def test_int8_quantization_error_is_bounded():
+    vectors = _vectors(1000)
+    quantizer = ScalarQuantizer.fit("int8", vectors, DIM)
+    decoded = quantizer.decode(quantizer.encode(vectors))
+    assert np.all(np.abs(decoded - vectors) <= quantizer.scale / 2 + 1e-6)
+
+    quantized = QuantizedVectors(quantizer, DIM)
+    quantized.extend(vectors[:600])
+    quantized.extend(vectors[600:])
+    assert len(quantized) == 1000 and quantized.nbytes == 1000 * DIM
+    query = _vectors(1, seed=7)[0]
+    exact = vectors @ query
+    bound = float(np.abs(query) @ quantizer.scale) / 2 + 1e-5
+    assert np.max(np.abs(quantized.scores(query) - exact)) <= bound
+    rows = [3, 17, 400]
+    np.testing.assert_allclose(quantized.scorer(query)(rows), quantized.scores(query)[rows], atol=1e-5)
+
+def test_float16_quantization_and_rerank():
+    vectors = _vectors(300)
+    quantizer = ScalarQuantizer.fit("float16", vectors, DIM)
+    decoded = quantizer.decode(quantizer.encode(vectors))
+    assert np.max(np.abs(decoded - vectors)) <= 1e-3
+
+    query = _vectors(1, seed=8)[0]
+    exact = vectors @ query
+    best = np.argsort(-exact)[:5].tolist()
+    reranked = rerank(vectors, list(reversed(best)) + [int(np.argmin(exact))], query, 5)
+    assert [row for row, _ in reranked] == best
+    assert reranked[0][1] == float(exact[best[0]])
+
+def _initiatives():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    rows = [
+        ("Technology", ["Python", "SQL"], ["Health"]),
+        ("Technology", ["Python"], ["Energy"]),
+        ("Strategy", ["SQL"], ["Health"]),
+        ("Strategy", ["Python"], ["Health"]),
+    ]
+    for number, (practice_area, skills, industries) in enumerate(rows, start=1):
+        db.add(Initiative(id=number, title=f"Initiative {number}", description="-", owner_id=1,
+                          practice_area=practice_area, skills_needed=json.dumps(skills),
+                          industries=json.dumps(industries), time_commitment="5 hours/week"))
+    db.commit()
+    return db
+
+def test_attribute_bitmaps_filter_rows():
+    db = _initiatives()
+    bitmaps = AttributeBitmaps()
+    # Store rows: initiative 2 was re-embedded (row 1 tombstoned, row 4 live)
+    labels = [1, 2, 3, 4, 2]
+    deleted = np.array([False, True, False, False, False])
+    bitmaps.sync(db, labels, deleted)
+
+    def matching(**filters):
+        mask = bitmaps.mask(criteria(**filters), len(labels))
+        return sorted(labels[row] for row in np.flatnonzero(mask & ~deleted))
+
+    assert matching(practice_area="Technology") == [1, 2]
+    assert matching(skills=["Python"]) == [1, 2, 4]
+    assert matching(skills=["Python", "SQL"]) == [1]
+    assert matching(practice_area="Strategy", industries=["Health"]) == [3, 4]
+    assert matching(practice_area="Legal") == []
+    assert matching() == [1, 2, 3, 4]
+    assert not bitmaps.mask(criteria(practice_area="Technology"), len(labels))[1]
+
+    # Attribute edits apply without re-embedding
+    initiative = db.get(Initiative, 3)
+    initiative.practice_area = "Technology"
+    initiative.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db.commit()
+    bitmaps.sync(db, labels, deleted)
+    assert matching(practice_area="Technology") == [1, 2, 3]
+    assert matching(practice_area="Strategy") == [4]